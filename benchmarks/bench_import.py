@@ -0,0 +1,29 @@
+"""Cold start cost of `import vimeo`, on top of importing Requests."""
+
+import subprocess
+import sys
+
+# Seconds `import vimeo` may add to `import requests` in a fresh process.
+IMPORT_BUDGET = 0.05
+
+
+def import_time(module):
+    """Get the cumulative import time of `module` in a fresh interpreter."""
+    output = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import ' + module],
+        stderr=subprocess.PIPE, check=True, universal_newlines=True
+    ).stderr
+    for line in reversed(output.splitlines()):
+        fields = [field.strip() for field in line.split('|')]
+        if len(fields) == 3 and fields[2] == module:
+            return int(fields[1]) / 1e6
+    raise AssertionError('%s was not imported' % module)
+
+
+def bench_import_vimeo(benchmark):
+    benchmark.pedantic(import_time, args=('vimeo',), rounds=5)
+
+    own = min(import_time('vimeo') - import_time('requests')
+              for _ in range(5))
+    assert own < IMPORT_BUDGET, \
+        '`import vimeo` takes %.0f ms on top of Requests' % (own * 1000)
@@ -0,0 +1,16 @@
+"""Time to walk a 2000 video collection."""
+
+import pytest
+
+
+@pytest.mark.parametrize('options', [
+    {},
+    {'prefetch': True},
+    {'workers': 4},
+], ids=['serial', 'prefetch', 'concurrent'])
+def bench_walk_collection(benchmark, client, options):
+    def walk():
+        return sum(1 for _ in client.iter_items(
+            '/me/videos', per_page=100, **options))
+
+    assert benchmark(walk) == 2000
@@ -0,0 +1,21 @@
+"""Requests per second for small API calls."""
+
+from concurrent.futures import ThreadPoolExecutor
+
+
+def bench_small_get(benchmark, client):
+    def run():
+        for _ in range(100):
+            client.get('/videos/1', params={'fields': 'uri'})
+
+    benchmark(run)
+
+
+def bench_small_get_threaded(benchmark, client):
+    def run():
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(
+                lambda _: client.get('/videos/1', params={'fields': 'uri'}),
+                range(100)))
+
+    benchmark(run)
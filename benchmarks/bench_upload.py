@@ -0,0 +1,22 @@
+"""Upload throughput across chunk sizes."""
+
+import pytest
+
+MB = 1024 * 1024
+
+
+@pytest.mark.parametrize('chunk_size', [1 * MB, 8 * MB, 64 * MB])
+def bench_upload(benchmark, client, video_file, chunk_size):
+    benchmark.extra_info['megabytes'] = 64
+    benchmark.pedantic(
+        client.upload, args=(video_file,),
+        kwargs={'data': {'chunk_size': chunk_size}},
+        rounds=3)
+
+
+def bench_upload_read_ahead(benchmark, client, video_file):
+    """Fault the pages of the next chunks in from read ahead workers."""
+    benchmark.pedantic(
+        client.upload, args=(video_file,),
+        kwargs={'data': {'chunk_size': 8 * MB}, 'workers': 4},
+        rounds=3)
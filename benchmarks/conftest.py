@@ -0,0 +1,28 @@
+import os
+import tempfile
+import pytest
+from vimeo import VimeoClient
+from vimeo.tests.fake_api import FakeVimeoAPI
+
+
+@pytest.fixture
+def fake_api():
+    with FakeVimeoAPI(videos=2000) as api:
+        yield api
+
+
+@pytest.fixture
+def client(fake_api):
+    with VimeoClient(token='token') as client:
+        client.API_ROOT = fake_api.url
+        yield client
+
+
+@pytest.fixture(scope='session')
+def video_file():
+    """A 64 MB file to upload."""
+    with tempfile.NamedTemporaryFile(suffix='.mp4', delete=False) as f:
+        for _ in range(64):
+            f.write(os.urandom(1024 * 1024))
+    yield f.name
+    os.unlink(f.name)
@@ -10,7 +10,8 @@ setup(name='PyVimeo',
     author='Vimeo',
     author_email='support@vimeo.com',
     packages=['vimeo', 'vimeo/auth'],
-    install_requires=['requests>=2.4.0', 'tuspy>=0.2.4'],
+    install_requires=['requests>=2.4.0'],
+    extras_require={'async': ['aiohttp>=3.0'], 'speedups': ['orjson>=3.0']},
       python_requires='>=3.5',
       classifiers=[
         'Development Status :: 5 - Production/Stable',
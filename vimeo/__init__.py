@@ -3,5 +3,18 @@
 
 version = (0, 3, 10)
 
+import sys
 from .client import VimeoClient
 from . import exceptions
+
+# Upload, asyncio and aiohttp machinery is only imported once used, so
+# short lived processes doing a few calls start fast.
+if sys.version_info >= (3, 7):
+    def __getattr__(name):
+        if name == 'AsyncVimeoClient':
+            from .async_client import AsyncVimeoClient
+            return AsyncVimeoClient
+        raise AttributeError(
+            'module %r has no attribute %r' % (__name__, name))
+else:  # pragma: no cover, modules can't load attributes lazily.
+    from .async_client import AsyncVimeoClient
@@ -0,0 +1,208 @@
+#! /usr/bin/env python
+# encoding: utf-8
+
+import asyncio
+import json
+from .async_upload import AsyncUploadMixin
+from .client import VimeoClient
+from .codec import get_codec
+from .exceptions import APIRateLimitExceededFailure
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover
+    aiohttp = None
+
+
+class AsyncVimeoClient(AsyncUploadMixin):
+    """Asyncio client handle for the Vimeo API.
+
+    Offers the same verbs as `VimeoClient`, as coroutines:
+
+        async with AsyncVimeoClient(token=token) as client:
+            response = await client.get('/me/videos')
+    """
+
+    API_ROOT = VimeoClient.API_ROOT
+    HTTP_METHODS = VimeoClient.HTTP_METHODS
+    ACCEPT_HEADER = VimeoClient.ACCEPT_HEADER
+    USER_AGENT = VimeoClient.USER_AGENT
+
+    DEFAULT_POOL_MAXSIZE = 100
+    DEFAULT_MAX_CONCURRENCY = 100
+
+    def __init__(self, token=None, key=None, secret=None, *args,
+                 pool_maxsize=DEFAULT_POOL_MAXSIZE,
+                 max_concurrency=DEFAULT_MAX_CONCURRENCY, session=None,
+                 codec=None, timeout=VimeoClient.DEFAULT_TIMEOUT,
+                 upload_state_store=None, **kwargs):
+        """Prep the handle with the authentication information.
+
+        Args:
+            token (string): OAuth2 access token.
+            key (string): Client identifier of your app.
+            secret (string): Client secret of your app.
+            pool_maxsize (int): Maximum number of connections kept alive.
+            max_concurrency (int): Maximum number of requests in flight at
+                once. Further calls wait for a free slot.
+            session (aiohttp.ClientSession): Use this session instead of
+                building a pooled one. The client will not close a session
+                it was handed.
+            codec: JSON codec of request and response bodies, or its name,
+                see `vimeo.codec`.
+            timeout: Default timeout of calls, in seconds, or a (connect,
+                read) tuple.
+            upload_state_store (UploadStateStore): Store used by `upload`
+                and `replace` to resume interrupted uploads, see
+                `vimeo.upload_state`.
+        """
+        if aiohttp is None:
+            raise ImportError(
+                'AsyncVimeoClient requires aiohttp, install PyVimeo[async].'
+            )
+
+        self.token = token
+        self.app_info = (key, secret)
+        self._requests_methods = dict()
+        self._pool_maxsize = pool_maxsize
+        self._max_concurrency = max_concurrency
+        self._semaphore = None
+        self._session = session
+        self._owns_session = session is None
+        self.codec = get_codec(codec)
+        self.timeout = timeout
+        self.upload_state_store = upload_state_store
+
+        # Make sure we have enough info to be useful.
+        assert token is not None or (key is not None and secret is not None)
+
+    @property
+    def session(self):
+        """Get the pooled aiohttp session shared by every call.
+
+        The session is built on first use, from within the running loop.
+        """
+        if self._session is None:
+            connector = aiohttp.TCPConnector(limit=self._pool_maxsize)
+            self._session = aiohttp.ClientSession(connector=connector)
+        return self._session
+
+    async def close(self):
+        """Close the pooled connections held by this client."""
+        if self._session is not None and self._owns_session:
+            await self._session.close()
+            self._session = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    def __getattr__(self, name):
+        """
+        Method used to get the coroutine for the verb that was just requested.
+
+        From here we can apply the authentication information we have.
+        """
+        if name not in self.HTTP_METHODS:
+            raise AttributeError("%r is not an HTTP method" % name)
+
+        caller = self._requests_methods.get(name)
+        if caller is None:
+            caller = self._requests_methods[name] = self._build_caller(name)
+        return caller
+
+    def _build_caller(self, name):
+        """Build the coroutine function handling calls for a single verb."""
+
+        async def caller(url, jsonify=True, **kwargs):
+            """Hand off the call to aiohttp."""
+            headers = kwargs.get('headers', dict())
+            headers['Accept'] = self.ACCEPT_HEADER
+            headers['User-Agent'] = self.USER_AGENT
+
+            if jsonify \
+                    and 'data' in kwargs \
+                    and isinstance(kwargs['data'], (dict, list)):
+                kwargs['data'] = self.codec.dumps(kwargs['data'])
+                headers['Content-Type'] = 'application/json'
+
+            kwargs['timeout'] = kwargs.get('timeout', self.timeout)
+            auth = kwargs.pop('auth', None)
+            if isinstance(auth, tuple):
+                kwargs['auth'] = aiohttp.BasicAuth(*auth)
+            elif auth is None and self.token:
+                headers['Authorization'] = 'Bearer ' + self.token
+            kwargs['headers'] = headers
+            if not url[:4] == "http":
+                url = self.API_ROOT + url
+
+            response = await self._send(name, url, **kwargs)
+            if response.status_code == 429:
+                raise APIRateLimitExceededFailure(
+                    response, 'Too many API requests'
+                )
+            return response
+        caller.__name__ = name
+        return caller
+
+    async def _send(self, method, url, timeout=None, **kwargs):
+        """Send a request within the concurrency limit and buffer the body."""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self._max_concurrency)
+
+        async with self._semaphore:
+            async with self.session.request(
+                    method.upper(), url, timeout=_client_timeout(timeout),
+                    **kwargs) as response:
+                content = await response.read()
+                return AsyncResponse(
+                    response.status,
+                    response.headers,
+                    content,
+                    str(response.url),
+                    response.reason,
+                    response.charset,
+                    self.codec
+                )
+
+
+class AsyncResponse:
+    """A buffered response with the `requests.Response` surface we rely on."""
+
+    def __init__(self, status_code, headers, content, url, reason=None,
+                 encoding=None, codec=None):
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.url = url
+        self.reason = reason
+        self.encoding = encoding
+        self.codec = codec
+
+    @property
+    def ok(self):
+        return self.status_code < 400
+
+    @property
+    def text(self):
+        return self.content.decode(self.encoding or 'utf-8', 'replace')
+
+    def json(self, **kwargs):
+        if kwargs or self.codec is None:
+            return json.loads(self.text, **kwargs)
+        return self.codec.loads(self.content)
+
+    def __repr__(self):
+        return '<AsyncResponse [%s]>' % self.status_code
+
+
+def _client_timeout(timeout):
+    """Translate a Requests style timeout into an aiohttp one."""
+    if timeout is None:
+        return aiohttp.ClientTimeout()
+    if isinstance(timeout, tuple):
+        connect, read = timeout
+        return aiohttp.ClientTimeout(sock_connect=connect, sock_read=read)
+    return aiohttp.ClientTimeout(total=timeout)
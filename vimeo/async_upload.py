@@ -0,0 +1,226 @@
+#! /usr/bin/env python
+# encoding: utf-8
+
+import asyncio
+import functools
+import io
+from . import exceptions
+from .sources import open_upload_source
+from .tus import AsyncTusUploader
+from .upload import (
+    BaseUploadVideoMixin, UploadPictureMixin, UploadTexttrackMixin)
+
+
+class AsyncUploadVideoMixin(BaseUploadVideoMixin):
+    """Handle uploading a new video to the Vimeo API from asyncio."""
+
+    async def upload(self, filename, **kwargs):
+        """Upload a file.
+
+        Coroutine version of `UploadVideoMixin.upload`, see it for the
+        arguments and errors. Keyword arguments other than those of
+        `upload` are handed to `vimeo.tus.AsyncTusUploader`.
+
+        Returns:
+            string: The Vimeo Video URI of your uploaded video.
+        """
+        on_attempt = kwargs.pop('on_attempt', None)
+        source = await self.__open_source(filename, kwargs)
+        with source:
+            plan = self._plan_upload(filename, source, kwargs)
+            return await self.__upload_source(
+                plan, source, on_attempt, kwargs)
+
+    async def replace(self, video_uri, filename, **kwargs):
+        """Replace the source of a single Vimeo video.
+
+        Coroutine version of `UploadVideoMixin.replace`, see it for the
+        arguments.
+
+        Returns:
+            string: The Vimeo Video URI of your replaced video.
+        """
+        on_attempt = kwargs.pop('on_attempt', None)
+        kwargs.setdefault('priority', 'high')
+        source = await self.__open_source(filename, kwargs)
+        with source:
+            plan = self._plan_upload(
+                filename, source, kwargs, video_uri=video_uri)
+            return await self.__upload_source(
+                plan, source, on_attempt, kwargs)
+
+    async def __upload_source(self, plan, source, on_attempt, kwargs):
+        """Create or resume the upload attempt of a source, then send it."""
+        attempt, offset = await self.__load_upload_state(plan, source.size)
+        if attempt is None:
+            attempt = self._read_attempt(plan, await self.post(
+                plan.endpoint, data=plan.data, params={'fields': plan.fields}))
+
+        if on_attempt is not None:
+            on_attempt(attempt.get('uri'))
+        return await self.__perform_tus_upload(
+            source.stream, attempt, source.size, plan, offset=offset,
+            **kwargs)
+
+    async def __perform_tus_upload(self, stream, attempt, filesize, plan,
+                                   offset=0, **kwargs):
+        """Take an upload attempt and perform the actual upload via tus.
+
+        Returns:
+            string: The Vimeo Video URI of your uploaded video.
+
+        Raises:
+            VideoUploadFailure: If unknown errors occured when uploading your
+                video.
+        """
+        options = self._tus_options(plan, attempt, filesize, offset, **kwargs)
+        try:
+            uploader = AsyncTusUploader(
+                self._send,
+                stream,
+                attempt.get('upload').get('upload_link'),
+                filesize,
+                plan.chunk_size,
+                **options)
+            await uploader.upload()
+        except exceptions.VideoUploadFailure:
+            raise
+        except Exception as e:
+            raise exceptions.VideoUploadFailure(
+                e,
+                'Unexpected error when uploading through tus.'
+            )
+
+        return self._finish_upload(plan, attempt, uploader)
+
+    async def __load_upload_state(self, plan, filesize):
+        """Find an interrupted upload attempt for the file.
+
+        Coroutine version of `UploadVideoMixin.__load_upload_state`.
+        """
+        state = self._saved_upload(plan)
+        if state is None:
+            return None, 0
+
+        try:
+            offset = await AsyncTusUploader(
+                self._send, None, state['upload_link'], filesize, 1,
+                timeout=self.timeout
+            ).get_offset()
+        except Exception:
+            offset = None
+        return self._resume_attempt(plan, state, offset, filesize)
+
+    @staticmethod
+    async def __open_source(filename, kwargs):
+        """Open the source of an upload without blocking the event loop."""
+        return await asyncio.get_event_loop().run_in_executor(
+            None, functools.partial(
+                open_upload_source,
+                filename,
+                max_spool_size=kwargs.pop('max_spool_size', None),
+                spool_dir=kwargs.pop('spool_dir', None)))
+
+
+class AsyncUploadPictureMixin:
+    """Functionality for uploading a picture to Vimeo from asyncio."""
+
+    BASE_FIELDS = UploadPictureMixin.BASE_FIELDS
+
+    async def upload_picture(self, obj, filename, activate=False, fields=None):
+        """
+        Upload a picture for the object.
+
+        Coroutine version of `UploadPictureMixin.upload_picture`.
+        """
+        if isinstance(obj, str):
+            obj = await self.get(
+                obj, params={'fields': 'metadata.connections.pictures.uri'})
+
+            if obj.status_code != 200:
+                raise exceptions.ObjectLoadFailure(
+                    "Failed to load the target object")
+            obj = obj.json()
+
+        if isinstance(fields, str):
+            fields = {field.strip() for field in fields.split(',')}
+
+        fields = self.BASE_FIELDS.union(fields) if fields else self.BASE_FIELDS
+
+        # Get the picture object.
+        picture = await self.post(
+            obj['metadata']['connections']['pictures']['uri'],
+            params={'fields': ','.join(fields)}
+        )
+
+        if picture.status_code != 201:
+            raise exceptions.PictureCreationFailure(
+                picture, "Failed to create a new picture with Vimeo.")
+
+        picture = picture.json()
+
+        with io.open(filename, 'rb') as f:
+            upload_resp = await self.put(
+                picture['link'],
+                data=f,
+                params={'fields': 'error'})
+        if upload_resp.status_code != 200:
+            raise exceptions.PictureUploadFailure(
+                upload_resp, "Failed uploading picture")
+
+        if activate:
+            active = await self.patch(
+                picture['uri'],
+                data={"active": "true"},
+                params={'fields': 'error'})
+            if active.status_code != 200:
+                raise exceptions.PictureActivationFailure(
+                    active, "Failed activating picture")
+            picture['active'] = True
+
+        return picture
+
+
+class AsyncUploadTexttrackMixin:
+    """Functionality for uploading a texttrack to Vimeo from asyncio."""
+
+    TEXTTRACK_ENDPOINT = UploadTexttrackMixin.TEXTTRACK_ENDPOINT
+    BASE_FIELDS = UploadTexttrackMixin.BASE_FIELDS
+
+    async def upload_texttrack(self, video_uri, track_type, language, filename,
+                               fields=None):
+        """Upload the texttrack at the given uri with the named source file."""
+        uri = self.TEXTTRACK_ENDPOINT.format(video_uri=video_uri)
+        name = filename.split('/')[-1]
+
+        if isinstance(fields, str):
+            fields = {field.strip() for field in fields.split(',')}
+
+        fields = self.BASE_FIELDS.union(fields) if fields else self.BASE_FIELDS
+
+        texttrack = await self.post(uri,
+                                    data={'type': track_type,
+                                          'language': language,
+                                          'name': name},
+                                    params={'fields': ','.join(fields)})
+
+        if texttrack.status_code != 201:
+            raise exceptions.TexttrackCreationFailure(
+                texttrack, "Failed to create a new texttrack with Vimeo")
+
+        texttrack = texttrack.json()
+
+        with io.open(filename, 'rb') as f:
+            upload_resp = await self.put(texttrack['link'], data=f)
+        if upload_resp.status_code != 200:
+            raise exceptions.TexttrackUploadFailure(
+                upload_resp, "Failed uploading texttrack")
+
+        return texttrack
+
+
+class AsyncUploadMixin(AsyncUploadVideoMixin, AsyncUploadPictureMixin,
+                       AsyncUploadTexttrackMixin):
+    """Handle uploading to the Vimeo API from asyncio."""
+
+    pass
@@ -0,0 +1,225 @@
+#! /usr/bin/env python
+# encoding: utf-8
+"""Share client credentials tokens between clients and processes.
+
+A `TokenProvider` hands out the token of an app and scope from a
+`TokenCache`, so a fresh client, or a fresh process using a file cache,
+makes no grant call once a token exists. Only one grant call is made at a
+time for a token, and tokens that expire are refreshed ahead of time.
+"""
+
+import contextlib
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from . import GrantFailed
+from ..singleflight import SingleFlight
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover, not available on Windows.
+    fcntl = None
+
+
+class TokenCache:
+    """Interface for caches of tokens.
+
+    A token is a dictionary holding the `access_token`, its `scope` and the
+    `expires_at` timestamp, None for tokens that don't expire.
+    """
+
+    def get(self, key):
+        """Get the token saved under `key`, or None."""
+        raise NotImplementedError
+
+    def set(self, key, token):
+        """Save `token` under `key`."""
+        raise NotImplementedError
+
+    def delete(self, key):
+        """Forget the token saved under `key`, if any."""
+        raise NotImplementedError
+
+    def lock(self, key):
+        """Get a context manager held while the token of `key` is granted.
+
+        Caches shared between processes lock across them, so only one of
+        them calls the grant endpoint.
+        """
+        return contextlib.suppress()
+
+
+class MemoryTokenCache(TokenCache):
+    """Keep tokens in memory, shared by the clients of a process."""
+
+    def __init__(self):
+        self._tokens = {}
+        self._lock = threading.Lock()
+        self._grant_lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            return self._tokens.get(key)
+
+    def set(self, key, token):
+        with self._lock:
+            self._tokens[key] = token
+
+    def delete(self, key):
+        with self._lock:
+            self._tokens.pop(key, None)
+
+    def lock(self, key):
+        return self._grant_lock
+
+
+class FileTokenCache(TokenCache):
+    """Keep tokens in a directory, shared by the processes of a host.
+
+    Each token is a JSON file only readable by its owner, replaced
+    atomically. Grants are serialized with an `fcntl` lock where available.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+
+    def get(self, key):
+        try:
+            with open(self.__path(key)) as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def set(self, key, token):
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        with os.fdopen(fd, 'w') as f:
+            json.dump(token, f)
+        os.replace(tmp, self.__path(key))
+
+    def delete(self, key):
+        try:
+            os.unlink(self.__path(key))
+        except FileNotFoundError:
+            pass
+
+    @contextlib.contextmanager
+    def lock(self, key):
+        with open(self.__path(key) + '.lock', 'a') as f:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+    def __path(self, key):
+        digest = hashlib.sha256(key.encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, digest + '.json')
+
+
+class TokenProvider:
+    """Hand out client credentials tokens from a shared cache.
+
+    Hook it to a client with `VimeoClient(key=..., secret=...,
+    token_provider=...)`; the client then asks it for a token on each
+    request. A missing token is granted with one call however many threads
+    want it. A token within `refresh_margin` seconds of its expiry is
+    refreshed in the background while it is still being used.
+    """
+
+    GRANT_ENDPOINT = '/oauth/authorize/client'
+
+    def __init__(self, scope=None, cache=None, refresh_margin=300):
+        """Prep the provider.
+
+        Args:
+            scope (list): Scopes of the token.
+            cache (TokenCache): Where tokens are kept. Defaults to a
+                `MemoryTokenCache`.
+            refresh_margin (int): Seconds before expiry a token is renewed.
+        """
+        if isinstance(scope, str):
+            scope = scope.split(' ')
+        self.scope = sorted(scope or ())
+        self.cache = cache if cache is not None else MemoryTokenCache()
+        self.refresh_margin = refresh_margin
+        self._flight = SingleFlight()
+
+    def cache_key(self, client):
+        """Get the key of the token of the app of `client`."""
+        return 'client_credentials:{}:{}'.format(
+            client.app_info[0], ' '.join(self.scope))
+
+    def get_token(self, client):
+        """Get a valid access token for the app of `client`.
+
+        Raises:
+            GrantFailed: If a token had to be granted and the grant failed.
+        """
+        key = self.cache_key(client)
+        token = self.cache.get(key)
+        if token is None or self.is_expired(token):
+            token = self._flight.do(key, lambda: self.__refresh(client, key))
+        elif self.is_expiring(token) and not self._flight.in_flight(key):
+            threading.Thread(
+                target=self.__refresh_in_background, args=(client, key),
+                daemon=True
+            ).start()
+        return token['access_token']
+
+    def invalidate(self, client):
+        """Forget the token of `client`, after the API refused it."""
+        self.cache.delete(self.cache_key(client))
+
+    @staticmethod
+    def is_expired(token):
+        expires_at = token.get('expires_at')
+        return expires_at is not None and expires_at <= time.time()
+
+    def is_expiring(self, token):
+        expires_at = token.get('expires_at')
+        return expires_at is not None and \
+            expires_at - self.refresh_margin <= time.time()
+
+    def grant(self, client):
+        """Call the client credentials grant.
+
+        Returns:
+            dict: The new token.
+        """
+        params = {"grant_type": "client_credentials"}
+        if self.scope:
+            params['scope'] = ' '.join(self.scope)
+
+        code, headers, resp = client.call_grant(self.GRANT_ENDPOINT, params)
+        if not code == 200:
+            raise GrantFailed()
+
+        expires_in = resp.get('expires_in')
+        return {
+            'access_token': resp['access_token'],
+            'scope': resp.get('scope'),
+            'expires_at': time.time() + expires_in if expires_in else None,
+        }
+
+    def __refresh(self, client, key):
+        with self.cache.lock(key):
+            # Another process may have granted a token while we waited.
+            token = self.cache.get(key)
+            if token is not None and not self.is_expiring(token):
+                return token
+            token = self.grant(client)
+            self.cache.set(key, token)
+            return token
+
+    def __refresh_in_background(self, client, key):
+        try:
+            self._flight.do(key, lambda: self.__refresh(client, key))
+        except Exception:
+            # The current token is still valid, the next call tries again.
+            pass
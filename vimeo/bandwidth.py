@@ -0,0 +1,214 @@
+#! /usr/bin/env python
+# encoding: utf-8
+"""Bandwidth limits for uploads."""
+
+import threading
+import time
+
+
+# Priority classes of `PriorityBandwidthLimiter`, most urgent first.
+PRIORITIES = ('high', 'normal', 'low')
+DEFAULT_PRIORITY = 'normal'
+
+
+class BandwidthLimiter:
+    """Token bucket capping the bytes per second sent by the uploads using it.
+
+    A single limiter can be shared by every upload of a process, from any
+    thread. Senders reserve bytes as they go and sleep off any deficit, so
+    the average rate never goes above `rate` while bursts up to `burst` bytes
+    go through right away. The rate can be changed while uploads run with
+    `set_rate`.
+    """
+
+    def __init__(self, rate, burst=None):
+        """Prep the limiter.
+
+        Args:
+            rate (int): bytes per second allowed through.
+            burst (int): bytes that may go through at once after an idle
+                period. Defaults to one second worth of `rate`.
+        """
+        self.rate = rate
+        self.burst = burst or rate
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def consume(self, nbytes):
+        """Wait until `nbytes` may be sent."""
+        with self._lock:
+            self._refill()
+            self._tokens -= nbytes
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0
+
+        if wait > 0:
+            time.sleep(wait)
+
+    def set_rate(self, rate, burst=None):
+        """Change the bytes per second allowed through, effective right away.
+
+        Args:
+            rate (int): New bytes per second allowed through.
+            burst (int): New burst size, defaults to one second of `rate`.
+        """
+        with self._lock:
+            self._refill()
+            self.rate = rate
+            self.burst = burst or rate
+            self._tokens = min(self._tokens, self.burst)
+
+    def _refill(self):
+        """Add the tokens earned since the last refill, lock held."""
+        now = time.monotonic()
+        self._tokens = min(
+            self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+
+class PriorityBandwidthLimiter(BandwidthLimiter):
+    """A `BandwidthLimiter` serving its senders by priority class.
+
+    Bytes go to the most urgent class waiting for them first: `normal`
+    uploads only send while no `high` upload is waiting, and `low` ones
+    while no `high` or `normal` upload is. Senders of the same class share
+    what is left. Uploads pick their class with the `priority` argument of
+    `upload` and `replace`, or through `for_priority`.
+    """
+
+    def __init__(self, rate, burst=None):
+        super().__init__(rate, burst)
+        self._ready = threading.Condition(self._lock)
+        self._waiting = [0] * len(PRIORITIES)
+
+    def consume(self, nbytes, priority=DEFAULT_PRIORITY):
+        """Wait until `nbytes` may be sent by an upload of `priority`."""
+        level = PRIORITIES.index(priority)
+        with self._ready:
+            self._waiting[level] += 1
+            try:
+                while True:
+                    self._refill()
+                    missing = min(nbytes, self.burst) - self._tokens
+                    ahead = any(self._waiting[:level])
+                    if missing <= 0 and not ahead:
+                        break
+                    # Senders ahead wake us up when they are done.
+                    self._ready.wait(None if ahead else missing / self.rate)
+                self._tokens -= nbytes
+            finally:
+                self._waiting[level] -= 1
+                self._ready.notify_all()
+
+    def set_rate(self, rate, burst=None):
+        super().set_rate(rate, burst)
+        with self._ready:
+            self._ready.notify_all()
+
+    def for_priority(self, priority):
+        """Get a limiter sending through this one as `priority`."""
+        if priority not in PRIORITIES:
+            raise ValueError('Unknown priority %r, expected one of %s' % (
+                priority, ', '.join(PRIORITIES)))
+        return _PriorityClass(self, priority)
+
+
+class _PriorityClass:
+    """Limiter view consuming from a `PriorityBandwidthLimiter` as a class."""
+
+    def __init__(self, limiter, priority):
+        self.limiter = limiter
+        self.priority = priority
+
+    def consume(self, nbytes):
+        self.limiter.consume(nbytes, self.priority)
+
+
+class _ChainedLimiter:
+    """Limiter waiting on each of several limiters in turn."""
+
+    def __init__(self, *limiters):
+        self.limiters = limiters
+
+    def consume(self, nbytes):
+        for limiter in self.limiters:
+            limiter.consume(nbytes)
+
+
+def upload_limiter(limiter=None, bandwidth=None, priority=None):
+    """Build the limiter pacing a single upload.
+
+    Args:
+        limiter (BandwidthLimiter): Limiter shared with other uploads.
+        bandwidth: Bytes per second of this upload alone, or a
+            `BandwidthLimiter` of its own. Applies on top of `limiter`.
+        priority (string): Class of the upload in a shared
+            `PriorityBandwidthLimiter`, one of `PRIORITIES`.
+
+    Returns:
+        The limiter to hand to `vimeo.tus.TusUploader`, or None.
+    """
+    if isinstance(limiter, PriorityBandwidthLimiter):
+        limiter = limiter.for_priority(priority or DEFAULT_PRIORITY)
+    if isinstance(bandwidth, (int, float)):
+        bandwidth = BandwidthLimiter(bandwidth)
+    if bandwidth is None:
+        return limiter
+    if limiter is None:
+        return bandwidth
+    return _ChainedLimiter(bandwidth, limiter)
+
+
+class SharedBandwidthLimiter(BandwidthLimiter):
+    """A `BandwidthLimiter` shared by several processes.
+
+    Its state lives in shared memory, so hand it to worker processes when
+    they are started to cap the bytes per second of the whole host. A new
+    rate set from any process applies to all of them.
+    """
+
+    def __init__(self, rate, burst=None):
+        import multiprocessing
+        # Tokens, the time they were last refilled at, rate and burst.
+        self._state = multiprocessing.RawArray('d', 4)
+        super().__init__(rate, burst)
+        self._state[0], self._state[1] = self.burst, self._updated
+        self._lock = multiprocessing.Lock()
+
+    @property
+    def rate(self):
+        return self._state[2]
+
+    @rate.setter
+    def rate(self, value):
+        self._state[2] = value
+
+    @property
+    def burst(self):
+        return self._state[3]
+
+    @burst.setter
+    def burst(self, value):
+        self._state[3] = value
+
+    def consume(self, nbytes):
+        with self._lock:
+            now = time.monotonic()
+            tokens, updated, rate, burst = self._state
+            tokens = min(burst, tokens + (now - updated) * rate)
+            tokens -= nbytes
+            self._state[0], self._state[1] = tokens, now
+            wait = -tokens / rate if tokens < 0 else 0
+
+        if wait > 0:
+            time.sleep(wait)
+
+    def set_rate(self, rate, burst=None):
+        with self._lock:
+            now = time.monotonic()
+            tokens, updated, old_rate, old_burst = self._state
+            tokens = min(old_burst, tokens + (now - updated) * old_rate)
+            self.rate = rate
+            self.burst = burst or rate
+            self._state[0] = min(tokens, self.burst)
+            self._state[1] = now
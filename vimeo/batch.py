@@ -0,0 +1,98 @@
+#! /usr/bin/env python
+# encoding: utf-8
+
+import collections
+from . import exceptions
+
+
+class BatchResult:
+    """Outcome of a single operation of a batch.
+
+    `response` holds the response of an operation that went through, `error`
+    a `BaseVimeoException` for one that did not.
+    """
+
+    def __init__(self, index, operation, response=None, error=None):
+        self.index = index
+        self.operation = operation
+        self.response = response
+        self.error = error
+
+    @property
+    def ok(self):
+        return self.error is None
+
+    def __repr__(self):
+        return '<BatchResult %d %s>' % (
+            self.index, 'ok' if self.ok else repr(self.error))
+
+
+class BatchMixin:
+    """Run many API calls concurrently."""
+
+    def batch(self, operations, concurrency=8, stream=False):
+        """Run API calls concurrently over the pooled session.
+
+        Keep `concurrency` at or under the `pool_maxsize` of the client, or
+        the extra connections are opened and thrown away for each call.
+
+        Args:
+            operations: Iterable of `(method, uri)` or `(method, uri, data)`
+                tuples, or of dictionaries with `method`, `uri` and
+                optionally `data` and `params` keys.
+            concurrency (int): Number of calls in flight at once.
+            stream (bool): Return a generator yielding results as the
+                operations are consumed, instead of a list. Only a bounded
+                number of operations is read ahead, so very large jobs can be
+                fed from a generator.
+
+        Returns:
+            list: The `BatchResult` of each operation, in order. A
+                non-2xx response counts as a failure.
+        """
+        results = self.__iter_batch(operations, concurrency)
+        return results if stream else list(results)
+
+    def __iter_batch(self, operations, concurrency):
+        """Yield the results of the operations in order."""
+        from concurrent.futures import ThreadPoolExecutor
+
+        pending = collections.deque()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            try:
+                for index, operation in enumerate(operations):
+                    pending.append(executor.submit(
+                        self.__run_operation, index, operation))
+                    if len(pending) >= 2 * concurrency:
+                        yield pending.popleft().result()
+                while pending:
+                    yield pending.popleft().result()
+            finally:
+                for future in pending:
+                    future.cancel()
+
+    def __run_operation(self, index, operation):
+        """Run one operation, capturing its failure."""
+        if isinstance(operation, dict):
+            method = operation['method']
+            uri = operation['uri']
+            kwargs = {key: operation[key] for key in ('data', 'params')
+                      if key in operation}
+        else:
+            method, uri = operation[:2]
+            kwargs = {'data': operation[2]} if len(operation) > 2 else {}
+
+        try:
+            response = getattr(self, method.lower())(uri, **kwargs)
+        except exceptions.BaseVimeoException as e:
+            return BatchResult(index, operation, error=e)
+        except Exception as e:
+            return BatchResult(index, operation, error=exceptions.BatchOperationFailure(
+                e, 'Unexpected error when running the operation.'))
+
+        if not 200 <= response.status_code < 300:
+            return BatchResult(
+                index, operation, response,
+                exceptions.BatchOperationFailure(
+                    response, 'The operation failed.'))
+        return BatchResult(index, operation, response)
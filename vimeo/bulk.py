@@ -0,0 +1,194 @@
+#! /usr/bin/env python
+# encoding: utf-8
+"""Upload many files at once."""
+
+import json
+import os
+import time
+import requests
+from . import exceptions
+from .bandwidth import BandwidthLimiter
+
+
+class BulkUploadJob:
+    """A file to upload, with the `data` to set on its video."""
+
+    def __init__(self, path, data=None):
+        self.path = path
+        self.data = data or {}
+        self.size = os.path.getsize(path)
+
+    def __repr__(self):
+        return '<BulkUploadJob %s>' % self.path
+
+
+class BulkUploadResult:
+    """Outcome of a `BulkUploadJob`.
+
+    `uri` holds the Vimeo Video URI of an upload that went through, `error`
+    the exception of the last attempt of one that did not.
+    """
+
+    def __init__(self, job, uri=None, error=None, attempts=0, elapsed=0.0):
+        self.job = job
+        self.uri = uri
+        self.error = error
+        self.attempts = attempts
+        self.elapsed = elapsed
+
+    @property
+    def ok(self):
+        return self.error is None
+
+    def __repr__(self):
+        return '<BulkUploadResult %s %s>' % (
+            self.job.path, self.uri if self.ok else repr(self.error))
+
+
+def load_jobs(source, data=None):
+    """Build the upload jobs for a source.
+
+    Args:
+        source: A directory, whose files are all uploaded, a glob pattern, a
+            CSV or JSONL manifest, or an iterable of paths or jobs. CSV
+            manifests need a `path` column, the other columns are used as the
+            video `data`. JSONL manifests hold one `{"path": ..., "data":
+            {...}}` object per line.
+        data (dict): Data set on every video, under the data of each job.
+
+    Returns:
+        list: The `BulkUploadJob` objects.
+    """
+    if isinstance(source, str):
+        entries = _load_entries(source)
+    else:
+        entries = source
+
+    jobs = []
+    for entry in entries:
+        if isinstance(entry, BulkUploadJob):
+            job = entry
+        elif isinstance(entry, str):
+            job = BulkUploadJob(entry)
+        else:
+            job = BulkUploadJob(entry['path'], entry.get('data'))
+
+        if data:
+            job.data = dict(data, **job.data)
+        jobs.append(job)
+    return jobs
+
+
+def _load_entries(source):
+    """Read the paths or manifest entries a string source points at."""
+    if os.path.isdir(source):
+        return sorted(
+            os.path.join(root, name)
+            for root, _, names in os.walk(source)
+            for name in names
+        )
+
+    if os.path.isfile(source):
+        import csv
+
+        extension = os.path.splitext(source)[1].lower()
+        with open(source, newline='') as f:
+            if extension == '.csv':
+                return [
+                    {'path': row.pop('path'), 'data': row}
+                    for row in csv.DictReader(f)
+                ]
+            if extension in ('.jsonl', '.ndjson'):
+                return [json.loads(line) for line in f if line.strip()]
+
+    import glob
+
+    return sorted(glob.glob(source, recursive=True))
+
+
+def interleave_by_size(jobs):
+    """Order jobs alternating between the largest and the smallest files.
+
+    With a pool of workers, this keeps small files flowing while the large
+    ones transfer instead of queueing them all behind the large ones.
+    """
+    jobs = sorted(jobs, key=lambda job: job.size, reverse=True)
+    ordered = []
+    while jobs:
+        ordered.append(jobs.pop(0))
+        if jobs:
+            ordered.append(jobs.pop())
+    return ordered
+
+
+class BulkUploadMixin:
+    """Handle uploading many files to the Vimeo API."""
+
+    BULK_RETRY_DELAY = 5
+
+    def bulk_upload(self, source, concurrency=4, retries=2, bandwidth=None,
+                    data=None, **kwargs):
+        """Upload many files, yielding results as each one finishes.
+
+        Args:
+            source: The files to upload, see `vimeo.bulk.load_jobs`.
+            concurrency (int): Number of files uploaded at once.
+            retries (int): Number of times a failed file is uploaded again.
+                With an upload state store on the client, retries resume
+                where the failed attempt stopped.
+            bandwidth: Bytes per second shared by all the uploads, or a
+                `BandwidthLimiter`. Unlimited by default.
+            data (dict): Data set on every video, see `load_jobs`.
+            **kwargs: Handed to `upload` for each file.
+
+        Yields:
+            BulkUploadResult: The result of each file, in completion order.
+        """
+        jobs = interleave_by_size(load_jobs(source, data))
+        if isinstance(bandwidth, (int, float)):
+            bandwidth = BandwidthLimiter(bandwidth)
+        if bandwidth is not None:
+            kwargs['limiter'] = bandwidth
+
+        from concurrent.futures import ThreadPoolExecutor, as_completed
+
+        executor = ThreadPoolExecutor(max_workers=concurrency)
+        futures = [
+            executor.submit(self.__upload_job, job, retries, kwargs)
+            for job in jobs
+        ]
+        try:
+            for future in as_completed(futures):
+                yield future.result()
+        finally:
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=True)
+
+    def __upload_job(self, job, retries, kwargs):
+        """Upload a single job, retrying failed attempts."""
+        started = time.monotonic()
+        attempts = 0
+        while True:
+            attempts += 1
+            try:
+                uri = self.upload(job.path, data=dict(job.data), **kwargs)
+            except FileNotFoundError as e:
+                return BulkUploadResult(
+                    job, error=e, attempts=attempts,
+                    elapsed=time.monotonic() - started)
+            except (exceptions.BaseVimeoException,
+                    requests.exceptions.RequestException, OSError) as e:
+                if attempts > retries:
+                    return BulkUploadResult(
+                        job, error=e, attempts=attempts,
+                        elapsed=time.monotonic() - started)
+                time.sleep(self.BULK_RETRY_DELAY * attempts)
+            except Exception as e:
+                return BulkUploadResult(
+                    job, error=e, attempts=attempts,
+                    elapsed=time.monotonic() - started)
+            else:
+                return BulkUploadResult(
+                    job, uri=uri, attempts=attempts,
+                    elapsed=time.monotonic() - started)
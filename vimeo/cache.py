@@ -0,0 +1,184 @@
+#! /usr/bin/env python
+# encoding: utf-8
+"""Caches for the responses of safe API calls."""
+
+import collections
+import hashlib
+import os
+import threading
+import time
+
+
+class CacheEntry:
+    """A cached response with what is needed to revalidate it."""
+
+    def __init__(self, response, path, stored_at=None):
+        self.response = response
+        self.path = path
+        self.etag = response.headers.get('ETag')
+        self.last_modified = response.headers.get('Last-Modified')
+        self.stored_at = time.time() if stored_at is None else stored_at
+
+    def is_fresh(self, ttl):
+        """Check whether the entry can be served without asking the API."""
+        return time.time() - self.stored_at < ttl
+
+    def can_revalidate(self):
+        return self.etag is not None or self.last_modified is not None
+
+    def conditional_headers(self):
+        """Get the headers asking the API whether the entry changed."""
+        headers = {}
+        if self.etag is not None:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified is not None:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """Interface for response caches.
+
+    Entries are served as is for `ttl` seconds. After that they are
+    revalidated with the API when they carry an `ETag` or `Last-Modified`
+    header, and fetched again otherwise.
+    """
+
+    def __init__(self, ttl=60):
+        self.ttl = ttl
+
+    def get(self, key):
+        """Get the `CacheEntry` stored under `key`, or None."""
+        raise NotImplementedError
+
+    def set(self, key, entry):
+        """Store `entry` under `key`."""
+        raise NotImplementedError
+
+    def invalidate(self, path):
+        """Drop every entry cached for the URI `path`."""
+        raise NotImplementedError
+
+
+class MemoryCache(ResponseCache):
+    """In-memory LRU cache of at most `maxsize` responses."""
+
+    def __init__(self, maxsize=1024, ttl=60):
+        super().__init__(ttl)
+        self.maxsize = maxsize
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if not entry.is_fresh(self.ttl) and not entry.can_revalidate():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key, entry):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, path):
+        with self._lock:
+            for key in [key for key, entry in self._entries.items()
+                        if entry.path == path]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class DiskCache(ResponseCache):
+    """Cache responses as pickles under `directory`.
+
+    Entries are grouped in a folder per URI so writes can drop them all.
+    Eviction only happens through the TTL, clear the folder to reclaim
+    space.
+    """
+
+    def __init__(self, directory, ttl=60):
+        super().__init__(ttl)
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def get(self, key):
+        import pickle
+
+        path = self.__entry_path(key)
+        if path is None:
+            return None
+        try:
+            with open(path, 'rb') as f:
+                stored_key, entry = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return None
+        if stored_key != key:
+            return None
+        if not entry.is_fresh(self.ttl) and not entry.can_revalidate():
+            self.__remove(path)
+            return None
+        return entry
+
+    def set(self, key, entry):
+        import pickle
+
+        folder = self.__folder(entry.path)
+        os.makedirs(folder, exist_ok=True)
+
+        # Index the entry by key, pointing at the folder of its URI.
+        path = os.path.join(folder, _digest(key))
+        tmp = path + '.%d.tmp' % threading.get_ident()
+        with open(tmp, 'wb') as f:
+            pickle.dump((key, entry), f, pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+        self.__write_link(key, path)
+
+    def invalidate(self, path):
+        folder = self.__folder(path)
+        try:
+            names = os.listdir(folder)
+        except OSError:
+            return
+        for name in names:
+            self.__remove(os.path.join(folder, name))
+
+    def __folder(self, path):
+        return os.path.join(self.directory, _digest(path))
+
+    def __entry_path(self, key):
+        try:
+            with open(self.__link_path(key)) as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def __write_link(self, key, path):
+        link = self.__link_path(key)
+        tmp = link + '.%d.tmp' % threading.get_ident()
+        with open(tmp, 'w') as f:
+            f.write(path)
+        os.replace(tmp, link)
+
+    def __link_path(self, key):
+        return os.path.join(self.directory, _digest(key) + '.link')
+
+    @staticmethod
+    def __remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def _digest(value):
+    return hashlib.sha256(value.encode('utf-8')).hexdigest()
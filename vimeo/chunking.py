@@ -0,0 +1,100 @@
+#! /usr/bin/env python
+# encoding: utf-8
+"""Policies deciding the size of each chunk of a tus upload."""
+
+# More chunks than this per upload makes tus server errors more likely.
+MAX_CHUNKS = 1024
+
+
+def min_chunk_size(remaining, chunks_left):
+    """Get the smallest chunk size keeping the upload within `MAX_CHUNKS`.
+
+    Args:
+        remaining (int): bytes left to send
+        chunks_left (int): chunks still allowed for the upload
+
+    Returns:
+        int: The chunk size, in bytes.
+    """
+    chunks_left = max(1, chunks_left)
+    return max(1, -(-remaining // chunks_left))
+
+
+class ChunkPolicy:
+    """Interface deciding the size of the next chunk of an upload.
+
+    Policies only look at what they are handed, so one instance can be shared
+    by concurrent uploads. Whatever they answer, the uploader never lets an
+    upload go over `MAX_CHUNKS` chunks.
+    """
+
+    def first_chunk_size(self, proposed_chunk_size, file_size):
+        """Get the size of the first chunk.
+
+        Args:
+            proposed_chunk_size (int): chunk size asked for by the caller,
+                already run through `apply_chunk_size_rules`
+            file_size (int): size of the upload, in bytes
+        """
+        return proposed_chunk_size
+
+    def next_chunk_size(self, chunk_size, elapsed, succeeded):
+        """Get the size of the next chunk from how the last one went.
+
+        Args:
+            chunk_size (int): size of the last chunk, in bytes
+            elapsed (float): seconds the last chunk took
+            succeeded (bool): whether the server accepted the last chunk
+        """
+        return chunk_size
+
+
+class FixedChunkPolicy(ChunkPolicy):
+    """Send every chunk at the proposed size. This is the default."""
+
+    pass
+
+
+class AIMDChunkPolicy(ChunkPolicy):
+    """Additive increase, multiplicative decrease of the chunk size.
+
+    Chunks grow by `increase` bytes while they complete faster than
+    `target_duration` seconds. A failed chunk, or one slower than twice the
+    target, multiplies the size by `decrease`. That keeps the bytes lost on
+    a retry small on flaky links, and cuts the per request overhead on fast
+    ones.
+    """
+
+    def __init__(self, initial=None, minimum=1024 * 1024,
+                 maximum=512 * 1024 * 1024, target_duration=10.0,
+                 increase=8 * 1024 * 1024, decrease=0.5):
+        """Prep the policy.
+
+        Args:
+            initial (int): size of the first chunk. Defaults to the proposed
+                chunk size of the upload.
+            minimum (int): smallest chunk size, in bytes.
+            maximum (int): largest chunk size, in bytes.
+            target_duration (float): seconds a chunk should take.
+            increase (int): bytes added after a fast chunk.
+            decrease (float): factor applied after a failed or slow chunk.
+        """
+        self.initial = initial
+        self.minimum = minimum
+        self.maximum = maximum
+        self.target_duration = target_duration
+        self.increase = increase
+        self.decrease = decrease
+
+    def first_chunk_size(self, proposed_chunk_size, file_size):
+        return self.__clamp(self.initial or proposed_chunk_size)
+
+    def next_chunk_size(self, chunk_size, elapsed, succeeded):
+        if not succeeded or elapsed > 2 * self.target_duration:
+            return self.__clamp(int(chunk_size * self.decrease))
+        if elapsed < self.target_duration:
+            return self.__clamp(chunk_size + self.increase)
+        return self.__clamp(chunk_size)
+
+    def __clamp(self, chunk_size):
+        return min(self.maximum, max(self.minimum, chunk_size))
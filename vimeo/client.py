@@ -1,16 +1,29 @@
 #! /usr/bin/env python
 # encoding: utf-8
 
-from functools import wraps
+from functools import partial, wraps
+import hashlib
 import json
+import threading
+import time
+from urllib.parse import parse_qsl, urlencode, urlsplit
 import requests
+from requests.adapters import HTTPAdapter
 from .auth.client_credentials import ClientCredentialsMixin
 from .auth.authorization_code import AuthorizationCodeMixin
 from .upload import UploadMixin
+from .bulk import BulkUploadMixin
+from .pagination import PaginationMixin
+from .batch import BatchMixin
+from .publish import PublishMixin
+from .cache import CacheEntry
+from .codec import JSONCodec, get_codec
 from .exceptions import APIRateLimitExceededFailure
+from .singleflight import SingleFlight
 
 
-class VimeoClient(ClientCredentialsMixin, AuthorizationCodeMixin, UploadMixin):
+class VimeoClient(ClientCredentialsMixin, AuthorizationCodeMixin, UploadMixin,
+                  BulkUploadMixin, PaginationMixin, BatchMixin, PublishMixin):
     """Client handle for the Vimeo API."""
 
     API_ROOT = "https://api.vimeo.com"
@@ -18,11 +31,84 @@ class VimeoClient(ClientCredentialsMixin, AuthorizationCodeMixin, UploadMixin):
     ACCEPT_HEADER = "application/vnd.vimeo.*;version=3.4"
     USER_AGENT = "pyvimeo 1.0.11; (http://developer.vimeo.com/api/docs)"
 
-    def __init__(self, token=None, key=None, secret=None, *args, **kwargs):
-        """Prep the handle with the authentication information."""
+    # Connection pool defaults, these mirror the Requests defaults.
+    DEFAULT_POOL_CONNECTIONS = 10
+    DEFAULT_POOL_MAXSIZE = 10
+
+    # Seconds to wait for a connection, and then for each read.
+    DEFAULT_TIMEOUT = (3.05, 30)
+
+    def __init__(self, token=None, key=None, secret=None, *args,
+                 pool_connections=DEFAULT_POOL_CONNECTIONS,
+                 pool_maxsize=DEFAULT_POOL_MAXSIZE, pool_block=False,
+                 session=None, upload_state_store=None,
+                 rate_limit_governor=None, cache=None, instrumentation=None,
+                 token_provider=None, field_selector=None, codec=None,
+                 retry_policy=None, timeout=DEFAULT_TIMEOUT, coalesce=False,
+                 **kwargs):
+        """Prep the handle with the authentication information.
+
+        Args:
+            token (string): OAuth2 access token.
+            key (string): Client identifier of your app.
+            secret (string): Client secret of your app.
+            pool_connections (int): Number of host pools to cache.
+            pool_maxsize (int): Maximum number of connections kept alive per
+                host. Raise this when sharing the client across many threads.
+            pool_block (bool): Block instead of opening throwaway connections
+                once `pool_maxsize` connections are in use.
+            session (requests.Session): Use this session instead of building
+                a pooled one. The client will not close a session it was
+                handed.
+            upload_state_store (UploadStateStore): Store used by `upload`
+                and `replace` to resume interrupted uploads, see
+                `vimeo.upload_state`.
+            rate_limit_governor (RateLimitGovernor): Paces requests to stay
+                within the API rate limit and waits out 429 responses instead
+                of raising right away, see `vimeo.ratelimit`.
+            cache (ResponseCache): Caches GET and HEAD responses, see
+                `vimeo.cache`. Writes to a URI drop its cached responses.
+            instrumentation (Instrumentation): Receives request, retry and
+                upload progress events, see `vimeo.instrumentation`.
+            token_provider (TokenProvider): Gets the token of the app from a
+                cache shared with other clients when no `token` is given,
+                see `vimeo.auth.token_provider`.
+            field_selector (FieldSelector): Adds the `fields` a program
+                reads to its GET calls, see `vimeo.fields`.
+            codec: JSON codec encoding request bodies and decoding
+                `response.json()`, or its name, like `orjson`. Defaults to
+                the standard library, see `vimeo.codec`.
+            retry_policy (RetryPolicy): Retries calls that failed on a
+                network error or a 5xx response, and the chunks of uploads,
+                see `vimeo.retry`. Calls are not retried without one.
+            timeout: Default timeout of calls, in seconds, or a (connect,
+                read) tuple.
+            coalesce (bool): Send a single request for identical GET and
+                HEAD calls made at the same time from several threads, and
+                hand its response to all of them.
+        """
         self.token = token
+        if token is None and token_provider is not None:
+            self._token = _ProvidedToken(token_provider, self)
         self.app_info = (key, secret)
         self._requests_methods = dict()
+        self._pool_options = {
+            'pool_connections': pool_connections,
+            'pool_maxsize': pool_maxsize,
+            'pool_block': pool_block,
+        }
+        self._session = session
+        self._owns_session = session is None
+        self._session_lock = threading.Lock()
+        self.upload_state_store = upload_state_store
+        self.rate_limit_governor = rate_limit_governor
+        self.cache = cache
+        self.instrumentation = instrumentation
+        self.field_selector = field_selector
+        self.codec = get_codec(codec)
+        self.retry_policy = retry_policy
+        self.timeout = timeout
+        self._single_flight = SingleFlight() if coalesce else None
 
         # Make sure we have enough info to be useful.
         assert token is not None or (key is not None and secret is not None)
@@ -37,6 +123,40 @@ class VimeoClient(ClientCredentialsMixin, AuthorizationCodeMixin, UploadMixin):
     def token(self, value):
         self._token = _BearerToken(value) if value else None
 
+    @property
+    def session(self):
+        """Get the pooled Requests session shared by every call.
+
+        The session is built on first use and keeps connections to the API
+        alive between calls. It is safe to share the client across threads.
+        """
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    self._session = self._build_session()
+        return self._session
+
+    def _build_session(self):
+        """Build a Requests session backed by a tuned connection pool."""
+        session = requests.Session()
+        adapter = HTTPAdapter(**self._pool_options)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+
+    def close(self):
+        """Close the pooled connections held by this client."""
+        with self._session_lock:
+            if self._session is not None and self._owns_session:
+                self._session.close()
+                self._session = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
     def __getattr__(self, name):
         """
         Method used to get the function for the verb that was just requested.
@@ -46,8 +166,15 @@ class VimeoClient(ClientCredentialsMixin, AuthorizationCodeMixin, UploadMixin):
         if name not in self.HTTP_METHODS:
             raise AttributeError("%r is not an HTTP method" % name)
 
+        caller = self._requests_methods.get(name)
+        if caller is None:
+            caller = self._requests_methods[name] = self._build_caller(name)
+        return caller
+
+    def _build_caller(self, name):
+        """Build the function handling calls for a single HTTP verb."""
         # Get the Requests based function to use to preserve their defaults.
-        request_func = getattr(requests, name, None)
+        request_func = getattr(requests.Session, name, None)
         if request_func is None:
             raise AttributeError(
                 "%r could not be found in the backing lib" % name
@@ -63,22 +190,192 @@ class VimeoClient(ClientCredentialsMixin, AuthorizationCodeMixin, UploadMixin):
             if jsonify \
                     and 'data' in kwargs \
                     and isinstance(kwargs['data'], (dict, list)):
-                kwargs['data'] = json.dumps(kwargs['data'])
+                kwargs['data'] = self.codec.dumps(kwargs['data'])
                 headers['Content-Type'] = 'application/json'
 
-            kwargs['timeout'] = kwargs.get('timeout', (1, 30))
+            kwargs['timeout'] = kwargs.get('timeout', self.timeout)
             kwargs['auth'] = kwargs.get('auth', self._token)
             kwargs['headers'] = headers
             if not url[:4] == "http":
                 url = self.API_ROOT + url
 
-            response = request_func(url, **kwargs)
+            def send():
+                return self._decode_with_codec(
+                    self._send(name, url, **kwargs))
+
+            if self.field_selector is not None:
+                send = partial(
+                    self.field_selector.observe, name, url, kwargs, send)
+            if self.instrumentation is not None:
+                send = partial(
+                    self.instrumentation.observe, name, url, kwargs, send)
+            return self._coalesce(name, url, kwargs, send)
+        return caller
+
+    def _decode_with_codec(self, response):
+        """Have `response.json()` decode with the codec of the client."""
+        if type(self.codec) is not JSONCodec \
+                and isinstance(response, requests.Response):
+            response.json = partial(_decode_json, self.codec, response)
+        return response
+
+    SAFE_METHODS = {'head', 'get', 'options'}
+    CACHEABLE_METHODS = {'head', 'get'}
+    COALESCED_METHODS = {'head', 'get'}
+
+    def _coalesce(self, method, url, kwargs, send):
+        """Run `send`, or share the response of an identical call in flight.
+
+        Only the call actually sent goes through the instrumentation, so a
+        coalesced request is counted once.
+        """
+        single_flight = self._single_flight
+        # Streamed bodies can only be read once, by a single caller.
+        if single_flight is None or method not in self.COALESCED_METHODS \
+                or kwargs.get('stream'):
+            return send()
+
+        key = '%s %r' % (self._request_key(method, url, kwargs),
+                         sorted(kwargs['headers'].items()))
+        return single_flight.do(key, send)
+
+    def _send(self, method, url, **kwargs):
+        """Send a prepared request, going through the cache if there is one."""
+        cache = self.cache
+        if cache is None:
+            return self._dispatch(method, url, **kwargs)
+
+        if method not in self.CACHEABLE_METHODS:
+            response = self._dispatch(method, url, **kwargs)
+            if method not in self.SAFE_METHODS:
+                cache.invalidate(urlsplit(url).path)
+            return response
+
+        key = self._request_key(method, url, kwargs)
+        entry = cache.get(key)
+        if entry is not None:
+            if entry.is_fresh(cache.ttl):
+                return entry.response
+            kwargs['headers'].update(entry.conditional_headers())
+
+        response = self._dispatch(method, url, **kwargs)
+        if response.status_code == 304 and entry is not None:
+            entry.stored_at = time.time()
+            cache.set(key, entry)
+            return entry.response
+        if response.status_code == 200:
+            cache.set(key, CacheEntry(response, urlsplit(url).path))
+        return response
+
+    def _request_key(self, method, url, kwargs):
+        """Get the key identifying a request for a token and its params."""
+        url = requests.Request(
+            method.upper(), url, params=kwargs.get('params')).prepare().url
+        parts = urlsplit(url)
+        query = urlencode(sorted(parse_qsl(parts.query, True)))
+        url = parts._replace(query=query).geturl()
+        token = self._hashed_auth_key(kwargs.get('auth'))
+        return ' '.join((method, url, token))
+
+    def _dispatch(self, method, url, retry=None, **kwargs):
+        """Send a prepared request through the session.
+
+        Args:
+            retry (bool): True to retry the call even if its verb is not
+                idempotent, False to never retry it. By default, only
+                idempotent calls are retried, when the client has a retry
+                policy.
+
+        Raises:
+            APIRateLimitExceededFailure: If the API answered with a 429 that
+                could not be waited out.
+        """
+        request_func = partial(self._transmit, method, url, retry)
+        governor = self.rate_limit_governor
+        if governor is None:
+            response = request_func(**kwargs)
             if response.status_code == 429:
                 raise APIRateLimitExceededFailure(
                     response, 'Too many API requests'
                 )
             return response
-        return caller
+
+        # Governors may keep their budgets on disk, never hand them a token.
+        key = self._hashed_auth_key(kwargs.get('auth'))
+        retries = 0
+        while True:
+            governor.acquire(key)
+            response = request_func(**kwargs)
+            governor.update(key, response)
+            if response.status_code != 429:
+                return response
+
+            # A body that was streamed from a file can't be sent again.
+            wait = None
+            if not hasattr(kwargs.get('data'), 'read'):
+                wait = governor.retry_after(key, response, retries)
+            if wait is None:
+                raise APIRateLimitExceededFailure(
+                    response, 'Too many API requests'
+                )
+            retries += 1
+            if self.instrumentation is not None:
+                self.instrumentation.retry(method, url, 'rate_limit', wait)
+            time.sleep(wait)
+
+    def _transmit(self, method, url, retry, **kwargs):
+        """Send a request, retrying the failures the retry policy allows."""
+        request_func = getattr(requests.Session, method)
+        policy = self.retry_policy
+        # A body that was streamed from a file can't be sent again.
+        if policy is None or retry is False \
+                or hasattr(kwargs.get('data'), 'read'):
+            return request_func(self.session, url, **kwargs)
+
+        policy.record_request()
+        attempt = 0
+        while True:
+            response = None
+            try:
+                response = request_func(self.session, url, **kwargs)
+            except requests.exceptions.RequestException as e:
+                if not (policy.is_retryable(method, error=e,
+                                            allow_unsafe=bool(retry))
+                        and policy.can_retry(attempt)):
+                    raise
+                reason = type(e).__name__
+            else:
+                if not (policy.is_retryable(method, response=response,
+                                            allow_unsafe=bool(retry))
+                        and policy.can_retry(attempt)):
+                    return response
+                reason = str(response.status_code)
+
+            wait = policy.wait(attempt, response)
+            attempt += 1
+            if self.instrumentation is not None:
+                self.instrumentation.retry(method, url, reason, wait)
+            time.sleep(wait)
+
+    def _auth_key(self, auth):
+        """Get the token, or app, a request is made on behalf of."""
+        if isinstance(auth, _BearerToken):
+            return auth.token
+        if isinstance(auth, tuple):
+            return auth[0]
+        return None
+
+    def _hashed_auth_key(self, auth):
+        """Get a digest of the token, or app, a request is made for."""
+        key = self._auth_key(auth) or ''
+        return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+
+def _decode_json(codec, response, **kwargs):
+    """Decode the body of a response with a codec."""
+    if kwargs:
+        return json.loads(response.text, **kwargs)
+    return codec.loads(response.content)
 
 
 class _BearerToken(requests.auth.AuthBase):
@@ -90,3 +387,15 @@ class _BearerToken(requests.auth.AuthBase):
     def __call__(self, request):
         request.headers['Authorization'] = 'Bearer ' + self.token
         return request
+
+
+class _ProvidedToken(_BearerToken):
+    """Bearer token looked up from a `TokenProvider` on each request."""
+
+    def __init__(self, provider, client):
+        self.provider = provider
+        self.client = client
+
+    @property
+    def token(self):
+        return self.provider.get_token(self.client)
@@ -0,0 +1,163 @@
+#! /usr/bin/env python
+# encoding: utf-8
+"""JSON codecs used to encode request bodies and decode responses.
+
+The standard library is used unless `orjson` or `ujson` is asked for by
+name, since they do not encode and decode exactly alike. `LazyJSON`
+decodes a large body one top level key at a time.
+"""
+
+from collections.abc import Mapping
+import json
+import re
+
+
+class JSONCodec:
+    """Encode and decode JSON with the standard library."""
+
+    name = 'json'
+
+    def dumps(self, obj):
+        """Encode `obj`, to `str` or UTF-8 `bytes`."""
+        return json.dumps(obj)
+
+    def loads(self, data):
+        """Decode a `str` or UTF-8 `bytes` document."""
+        if isinstance(data, (bytes, bytearray)):
+            data = data.decode('utf-8')
+        return json.loads(data)
+
+
+class OrjsonCodec(JSONCodec):
+    """Encode and decode JSON with `orjson`."""
+
+    name = 'orjson'
+
+    def __init__(self):
+        import orjson
+        self._orjson = orjson
+
+    def dumps(self, obj):
+        return self._orjson.dumps(obj)
+
+    def loads(self, data):
+        return self._orjson.loads(data)
+
+
+class UJSONCodec(JSONCodec):
+    """Encode and decode JSON with `ujson`."""
+
+    name = 'ujson'
+
+    def __init__(self):
+        import ujson
+        self._ujson = ujson
+
+    def dumps(self, obj):
+        return self._ujson.dumps(obj)
+
+    def loads(self, data):
+        return self._ujson.loads(data)
+
+
+CODECS = {
+    'orjson': OrjsonCodec,
+    'ujson': UJSONCodec,
+    'json': JSONCodec,
+}
+
+
+def get_codec(codec=None):
+    """Get a codec by name.
+
+    Args:
+        codec: A `JSONCodec`, the name of one, or None for the standard
+            library.
+
+    Returns:
+        JSONCodec: The codec.
+    """
+    if isinstance(codec, JSONCodec):
+        return codec
+    if codec is None:
+        return JSONCodec()
+    return CODECS[codec]()
+
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+
+
+class LazyJSON(Mapping):
+    """Read-only mapping over a JSON object, decoded as keys are read.
+
+    Top level values are decoded in document order up to the key asked for,
+    so reading `paging` or `total` from a collection page does not decode
+    the `data` that follows them. Iterating or taking the length decodes
+    everything.
+    """
+
+    def __init__(self, content, codec=None):
+        """Prep the mapping.
+
+        Args:
+            content (bytes): The JSON document, an object.
+            codec (JSONCodec): Decodes the whole document when needed.
+        """
+        if isinstance(content, (bytes, bytearray)):
+            content = content.decode('utf-8')
+        self._text = content
+        self._codec = codec or JSONCodec()
+        self._decoder = json.JSONDecoder()
+        self._values = {}
+        self._position = None
+        self._complete = False
+
+    @classmethod
+    def from_response(cls, response, codec=None):
+        """Wrap the body of a response."""
+        return cls(response.content, codec)
+
+    def __getitem__(self, key):
+        while key not in self._values and not self._complete:
+            self.__decode_next()
+        return self._values[key]
+
+    def __iter__(self):
+        self.__decode_all()
+        return iter(self._values)
+
+    def __len__(self):
+        self.__decode_all()
+        return len(self._values)
+
+    def __decode_all(self):
+        if not self._complete:
+            self._values = self._codec.loads(self._text)
+            self._complete = True
+
+    def __decode_next(self):
+        """Decode the next top level key and value."""
+        text = self._text
+        position = self._position
+        if position is None:
+            position = _WHITESPACE.match(text, 0).end()
+            if text[position:position + 1] != '{':
+                raise ValueError('A JSON object was expected.')
+            position += 1
+
+        position = _WHITESPACE.match(text, position).end()
+        if text[position:position + 1] in ('}', ''):
+            self._complete = True
+            return
+        if text[position] == ',':
+            position = _WHITESPACE.match(text, position + 1).end()
+
+        key, position = json.decoder.scanstring(text, position + 1)
+        position = _WHITESPACE.match(text, position).end()
+        if text[position:position + 1] != ':':
+            raise ValueError('Expected ":" at %d.' % position)
+        position = _WHITESPACE.match(text, position + 1).end()
+        value, position = self._decoder.raw_decode(text, position)
+
+        self._values[key] = value
+        self._position = position
@@ -63,6 +63,14 @@ class UploadQuotaExceeded(Exception):
         super().__init__(message)
 
 
+class UploadSourceTooLarge(Exception):
+    """Exception for an upload source going over the spool size limit."""
+
+    def __init__(self, message):
+        """Init method for this exception."""
+        super().__init__(message)
+
+
 class UploadAttemptCreationFailure(BaseVimeoException):
     """Exception for upload attempt creation failure."""
 
@@ -135,9 +143,36 @@ class TexttrackUploadFailure(BaseVimeoException):
         super().__init__(response, message)
 
 
+class PageLoadFailure(BaseVimeoException):
+    """Exception for failure on loading a page of a collection."""
+
+    def __init__(self, response, message):
+        """Init method for this subclass of BaseVimeoException."""
+        super().__init__(response, message)
+
+
+class BatchOperationFailure(BaseVimeoException):
+    """Exception for failure on a single operation of a batch."""
+
+    def __init__(self, response, message):
+        """Init method for this subclass of BaseVimeoException."""
+        super().__init__(response, message)
+        if isinstance(response, Exception):
+            # Not an API response, describe the error that was raised.
+            self.message = '{} {}'.format(
+                message, str(response) or repr(response))
+            self.args = (self.message,)
+
+
 class APIRateLimitExceededFailure(BaseVimeoException):
     """Exception used when the user has exceeded the API rate limit."""
 
+    def __init__(self, response, message):
+        """Init method for this subclass of BaseVimeoException."""
+        super().__init__(response, message)
+        # Kept for the `X-RateLimit-*` headers telling when to try again.
+        self.response = response
+
     def __get_message(self, response):
         guidelines = 'https://developer.vimeo.com/guidelines/rate-limiting'
         message = super().__get_message(response)
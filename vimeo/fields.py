@@ -0,0 +1,230 @@
+#! /usr/bin/env python
+# encoding: utf-8
+"""Ask the API only for the fields a program reads.
+
+A `FieldSelector` adds a `fields` parameter to the GET calls of endpoints it
+knows the fields of, which shrinks the responses and the time spent parsing
+them. Fields are declared per endpoint, or learned by recording which keys
+the program reads from full responses.
+"""
+
+import collections
+import threading
+from .instrumentation import path_template
+
+
+class FieldReport(collections.namedtuple(
+        'FieldReport', ['path', 'requests', 'projected', 'bytes_received',
+                        'bytes_saved'])):
+    """Traffic of one endpoint.
+
+    `projected` counts the calls sent with selected fields. `bytes_saved`
+    estimates the bytes those calls did not download, from the average size
+    of the full responses seen, and is None until one was seen.
+    """
+
+    __slots__ = ()
+
+
+class _Traffic:
+    """Response counts and sizes of an endpoint."""
+
+    def __init__(self):
+        self.full = 0
+        self.full_bytes = 0
+        self.projected = 0
+        self.projected_bytes = 0
+
+
+class FieldSelector:
+    """Add `fields` to the GET calls of endpoints with declared fields.
+
+    Endpoints are path templates like `/videos/{id}`, see
+    `vimeo.instrumentation.path_template`. Calls that already carry `fields`
+    are left alone.
+
+    In learning mode, `json()` on full responses returns dictionaries that
+    record the keys read, and `learned` gives the fields of each endpoint.
+    For collections, keys are recorded for the items of `data`.
+    """
+
+    def __init__(self, fields=None, learn=False):
+        """Prep the selector.
+
+        Args:
+            fields (dict): Fields to select, by path template. Each value is
+                a comma separated string or an iterable of dotted paths.
+            learn (bool): Record the keys read from full responses.
+        """
+        self.learn = learn
+        self._fields = {}
+        self._accessed = collections.defaultdict(set)
+        self._traffic = collections.defaultdict(_Traffic)
+        self._lock = threading.Lock()
+        for path, selected in (fields or {}).items():
+            self.declare(path, selected)
+
+    def declare(self, path, fields):
+        """Select `fields` for the endpoint `path`."""
+        if isinstance(fields, str):
+            fields = fields.split(',')
+        self._fields[path] = ','.join(
+            sorted({field.strip() for field in fields if field.strip()}))
+
+    def fields_for(self, path):
+        """Get the `fields` parameter of the endpoint `path`, or None."""
+        return self._fields.get(path)
+
+    def observe(self, method, url, kwargs, send):
+        """Send a call with the fields of its endpoint, and record it.
+
+        Args:
+            method (string): HTTP verb of the call.
+            url (string): Full URL of the call.
+            kwargs (dict): Keyword arguments handed to Requests, updated
+                with the `fields` parameter.
+            send (callable): Sends the call and returns the response.
+
+        Returns:
+            requests.Response: The response.
+        """
+        if method != 'get':
+            return send()
+
+        path = path_template(url)
+        params = kwargs.get('params')
+        if isinstance(params, str) or \
+                (params is not None and not hasattr(params, 'items')):
+            return send()
+        params = dict(params or {})
+
+        projected = False
+        if 'fields' not in params and path in self._fields:
+            params['fields'] = self._fields[path]
+            kwargs['params'] = params
+            projected = True
+
+        response = send()
+        self.__record(path, response, projected, 'fields' in params)
+        return response
+
+    def learned(self):
+        """Get the fields read from the responses of each endpoint.
+
+        Returns:
+            dict: Comma separated fields by path template.
+        """
+        with self._lock:
+            accessed = {path: set(keys) for path, keys in self._accessed.items()}
+        return {
+            path: ','.join(sorted(
+                key for key in keys
+                if not any(other.startswith(key + '.') for other in keys)
+            ))
+            for path, keys in accessed.items() if keys
+        }
+
+    def freeze(self):
+        """Declare the learned fields and stop learning."""
+        for path, fields in self.learned().items():
+            if path not in self._fields:
+                self.declare(path, fields)
+        self.learn = False
+
+    def report(self):
+        """Get the traffic of each endpoint, largest savings first.
+
+        Returns:
+            list: A `FieldReport` for each endpoint called.
+        """
+        reports = []
+        with self._lock:
+            for path, traffic in self._traffic.items():
+                saved = None
+                if traffic.full:
+                    average = traffic.full_bytes / traffic.full
+                    saved = max(0, int(
+                        average * traffic.projected - traffic.projected_bytes))
+                reports.append(FieldReport(
+                    path,
+                    traffic.full + traffic.projected,
+                    traffic.projected,
+                    traffic.full_bytes + traffic.projected_bytes,
+                    saved
+                ))
+        return sorted(reports, key=lambda report: -(report.bytes_saved or 0))
+
+    def __record(self, path, response, projected, has_fields):
+        if getattr(response, 'status_code', None) != 200:
+            return
+        size = len(getattr(response, 'content', b'') or b'')
+        with self._lock:
+            traffic = self._traffic[path]
+            if projected:
+                traffic.projected += 1
+                traffic.projected_bytes += size
+            elif not has_fields:
+                traffic.full += 1
+                traffic.full_bytes += size
+
+        if self.learn and not has_fields:
+            accessed = self._accessed[path]
+            decode = response.json
+
+            def json(**kwargs):
+                return _record(decode(**kwargs), accessed, self._lock)
+            response.json = json
+
+
+def _record(body, accessed, lock):
+    """Wrap a decoded body so the keys read from it are recorded."""
+    if isinstance(body, dict) and isinstance(body.get('data'), list) \
+            and 'paging' in body:
+        # Fields of a collection select the keys of its items.
+        body = dict(body)
+        body['data'] = [_wrap(item, '', accessed, lock)
+                        for item in body['data']]
+        return body
+    return _wrap(body, '', accessed, lock)
+
+
+def _wrap(value, prefix, accessed, lock):
+    if isinstance(value, dict):
+        return _RecordingDict(value, prefix, accessed, lock)
+    if isinstance(value, list):
+        # Fields of a list select the keys of its items.
+        return [_wrap(item, prefix, accessed, lock) for item in value]
+    return value
+
+
+class _RecordingDict(dict):
+    """Dictionary recording the dotted path of each key read from it."""
+
+    def __init__(self, data, prefix, accessed, lock):
+        super().__init__(data)
+        self._prefix = prefix
+        self._accessed = accessed
+        self._lock = lock
+
+    def __getitem__(self, key):
+        value = super().__getitem__(key)
+        return self.__read(key, value)
+
+    def get(self, key, default=None):
+        if key in self:
+            return self[key]
+        with self._lock:
+            self._accessed.add(self._prefix + key)
+        return default
+
+    def items(self):
+        return [(key, self[key]) for key in self]
+
+    def values(self):
+        return [self[key] for key in self]
+
+    def __read(self, key, value):
+        path = self._prefix + key
+        with self._lock:
+            self._accessed.add(path)
+        return _wrap(value, path + '.', self._accessed, self._lock)
@@ -0,0 +1,334 @@
+#! /usr/bin/env python
+# encoding: utf-8
+"""Hooks and metrics to see where time goes in the client.
+
+Nothing in here runs unless an `Instrumentation` is handed to the client:
+
+    metrics = MetricsAggregator()
+    instrumentation = Instrumentation()
+    instrumentation.add_listener(metrics)
+    client = VimeoClient(token=token, instrumentation=instrumentation)
+    ...
+    print(metrics.render_prometheus())
+"""
+
+import bisect
+import re
+import socket
+import threading
+import time
+from urllib.parse import urlsplit
+
+_ID_SEGMENT = re.compile(r'^(\d+|[0-9a-f]{32,})$')
+
+
+def path_template(url):
+    """Get the path of a URL with its identifiers templated out.
+
+    `https://api.vimeo.com/videos/1234/texttracks` becomes
+    `/videos/{id}/texttracks`, so calls can be grouped by endpoint.
+    """
+    path = urlsplit(url).path
+    return '/'.join(
+        '{id}' if _ID_SEGMENT.match(segment) else segment
+        for segment in path.split('/')
+    )
+
+
+class RequestEvent:
+    """What happened during a single API call.
+
+    `timings` holds the seconds taken until the first byte of the response
+    (`ttfb`) and until the whole response was read (`total`).
+    """
+
+    __slots__ = ('method', 'url', 'path', 'status', 'timings', 'bytes_sent',
+                 'bytes_received', 'rate_limit_remaining', 'error')
+
+    def __init__(self, method, url, status=None, timings=None, bytes_sent=0,
+                 bytes_received=0, rate_limit_remaining=None, error=None):
+        self.method = method
+        self.url = url
+        self.path = path_template(url)
+        self.status = status
+        self.timings = timings or {}
+        self.bytes_sent = bytes_sent
+        self.bytes_received = bytes_received
+        self.rate_limit_remaining = rate_limit_remaining
+        self.error = error
+
+
+class RetryEvent:
+    """A call that is about to be sent again."""
+
+    __slots__ = ('method', 'url', 'path', 'reason', 'wait')
+
+    def __init__(self, method, url, reason, wait):
+        self.method = method
+        self.url = url
+        self.path = path_template(url)
+        self.reason = reason
+        self.wait = wait
+
+
+class UploadEvent:
+    """Progress of a tus upload, sent after each confirmed chunk."""
+
+    __slots__ = ('uri', 'offset', 'size', 'sent', 'elapsed',
+                 'bytes_per_second')
+
+    def __init__(self, uri, progress):
+        self.uri = uri
+        self.offset = progress.offset
+        self.size = progress.size
+        self.sent = progress.sent
+        self.elapsed = progress.elapsed
+        self.bytes_per_second = progress.bytes_per_second
+
+
+class Instrumentation:
+    """Dispatch client events to listeners.
+
+    Listeners are callables taking a `RequestEvent`, `RetryEvent` or
+    `UploadEvent`. Hooks added with `add_before_request` are called with the
+    method, URL and keyword arguments of each call before it is sent, and
+    may change the keyword arguments.
+    """
+
+    def __init__(self):
+        self.listeners = []
+        self.before_request = []
+
+    def add_listener(self, listener):
+        self.listeners.append(listener)
+
+    def add_before_request(self, hook):
+        self.before_request.append(hook)
+
+    def emit(self, event):
+        for listener in self.listeners:
+            listener(event)
+
+    def observe(self, method, url, kwargs, send):
+        """Run `send` for a call, emitting a `RequestEvent` for it."""
+        for hook in self.before_request:
+            hook(method, url, kwargs)
+
+        started = time.monotonic()
+        try:
+            response = send()
+        except Exception as e:
+            self.emit(RequestEvent(
+                method, url,
+                timings={'total': time.monotonic() - started},
+                bytes_sent=_body_length(kwargs.get('data')),
+                error=e))
+            raise
+
+        total = time.monotonic() - started
+        elapsed = getattr(response, 'elapsed', None)
+        remaining = response.headers.get('X-RateLimit-Remaining')
+        self.emit(RequestEvent(
+            method, url,
+            status=response.status_code,
+            timings={
+                'ttfb': elapsed.total_seconds() if elapsed else None,
+                'total': total,
+            },
+            bytes_sent=_body_length(kwargs.get('data')),
+            bytes_received=_response_length(response, kwargs.get('stream')),
+            rate_limit_remaining=int(remaining) if remaining else None))
+        return response
+
+    def retry(self, method, url, reason, wait):
+        self.emit(RetryEvent(method, url, reason, wait))
+
+    def upload_progress(self, uri, progress=None):
+        """Build a tus progress callback emitting `UploadEvent`s."""
+        def track(snapshot):
+            self.emit(UploadEvent(uri, snapshot))
+            if progress is not None:
+                progress(snapshot)
+        return track
+
+
+def _body_length(data):
+    try:
+        return len(data)
+    except TypeError:
+        return 0
+
+
+def _response_length(response, stream=False):
+    """Get the size of a response body, without reading a streamed one."""
+    if stream or not hasattr(response, 'content'):
+        length = response.headers.get('Content-Length') or ''
+        return int(length) if length.isdigit() else 0
+    return len(response.content or b'')
+
+
+class _Histogram:
+    __slots__ = ('counts', 'sum', 'count')
+
+    def __init__(self, buckets):
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+
+class MetricsAggregator:
+    """In-process histograms and counters fed by `Instrumentation` events.
+
+    Request durations are bucketed per method, templated path and status.
+    Snapshots can be rendered in the Prometheus text format, or pushed to
+    StatsD with `StatsDExporter`.
+    """
+
+    BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = tuple(buckets)
+        self.durations = {}
+        self.retries = {}
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.upload_bytes = 0
+        self.upload_bytes_per_second = 0.0
+        self.rate_limit_remaining = None
+        self._uploaded = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, event):
+        with self._lock:
+            if isinstance(event, RequestEvent):
+                self.__record_request(event)
+            elif isinstance(event, RetryEvent):
+                key = (event.method, event.path, event.reason)
+                self.retries[key] = self.retries.get(key, 0) + 1
+            elif isinstance(event, UploadEvent):
+                sent = event.sent - self._uploaded.get(event.uri, 0)
+                self._uploaded[event.uri] = event.sent
+                if event.offset >= event.size:
+                    del self._uploaded[event.uri]
+                self.upload_bytes += max(sent, 0)
+                self.upload_bytes_per_second = event.bytes_per_second
+
+    def __record_request(self, event):
+        status = str(event.status) if event.status else 'error'
+        key = (event.method, event.path, status)
+        histogram = self.durations.get(key)
+        if histogram is None:
+            histogram = self.durations[key] = _Histogram(self.buckets)
+
+        total = event.timings.get('total', 0.0)
+        histogram.counts[bisect.bisect_left(self.buckets, total)] += 1
+        histogram.sum += total
+        histogram.count += 1
+        self.bytes_sent += event.bytes_sent
+        self.bytes_received += event.bytes_received
+        if event.rate_limit_remaining is not None:
+            self.rate_limit_remaining = event.rate_limit_remaining
+
+    def quantile(self, method, path, status, q):
+        """Estimate a quantile of the durations of an endpoint, in seconds.
+
+        Returns the upper bound of the bucket holding the quantile.
+        """
+        with self._lock:
+            histogram = self.durations.get((method, path, str(status)))
+            if histogram is None or not histogram.count:
+                return None
+            rank = q * histogram.count
+            seen = 0
+            for bound, count in zip(self.buckets + (float('inf'),),
+                                    histogram.counts):
+                seen += count
+                if seen >= rank:
+                    return bound
+
+    def render_prometheus(self, prefix='vimeo'):
+        """Render the metrics in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            name = prefix + '_request_duration_seconds'
+            lines.append('# TYPE %s histogram' % name)
+            for (method, path, status), histogram in sorted(
+                    self.durations.items()):
+                labels = 'method="%s",path="%s",status="%s"' % (
+                    method, path, status)
+                cumulative = 0
+                for bound, count in zip(self.buckets + ('+Inf',),
+                                        histogram.counts):
+                    cumulative += count
+                    lines.append('%s_bucket{%s,le="%s"} %d' % (
+                        name, labels, bound, cumulative))
+                lines.append('%s_sum{%s} %f' % (name, labels, histogram.sum))
+                lines.append('%s_count{%s} %d' % (
+                    name, labels, histogram.count))
+
+            name = prefix + '_request_retries_total'
+            lines.append('# TYPE %s counter' % name)
+            for (method, path, reason), count in sorted(self.retries.items()):
+                lines.append('%s{method="%s",path="%s",reason="%s"} %d' % (
+                    name, method, path, reason, count))
+
+            for name, value in (('bytes_sent_total', self.bytes_sent),
+                                ('bytes_received_total', self.bytes_received),
+                                ('upload_bytes_total', self.upload_bytes)):
+                lines.append('# TYPE %s_%s counter' % (prefix, name))
+                lines.append('%s_%s %d' % (prefix, name, value))
+
+            lines.append('# TYPE %s_upload_bytes_per_second gauge' % prefix)
+            lines.append('%s_upload_bytes_per_second %f' % (
+                prefix, self.upload_bytes_per_second))
+            if self.rate_limit_remaining is not None:
+                lines.append('# TYPE %s_rate_limit_remaining gauge' % prefix)
+                lines.append('%s_rate_limit_remaining %d' % (
+                    prefix, self.rate_limit_remaining))
+        return '\n'.join(lines) + '\n'
+
+
+class StatsDExporter:
+    """Listener sending events to a StatsD daemon over UDP.
+
+    Sends are fire and forget, a missing daemon never slows the client down.
+    """
+
+    def __init__(self, host='127.0.0.1', port=8125, prefix='vimeo'):
+        self.address = (host, port)
+        self.prefix = prefix
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._socket.setblocking(False)
+
+    def __call__(self, event):
+        if isinstance(event, RequestEvent):
+            name = '%s.request.%s.%s.%s' % (
+                self.prefix, event.method, _statsd_path(event.path),
+                event.status or 'error')
+            metrics = ['%s:%d|ms' % (
+                name, event.timings.get('total', 0.0) * 1000)]
+            if event.rate_limit_remaining is not None:
+                metrics.append('%s.rate_limit_remaining:%d|g' % (
+                    self.prefix, event.rate_limit_remaining))
+        elif isinstance(event, RetryEvent):
+            metrics = ['%s.retry.%s.%s.%s:1|c' % (
+                self.prefix, event.method, _statsd_path(event.path),
+                event.reason)]
+        elif isinstance(event, UploadEvent):
+            metrics = ['%s.upload.bytes_per_second:%d|g' % (
+                self.prefix, event.bytes_per_second)]
+        else:
+            return
+
+        try:
+            self._socket.sendto('\n'.join(metrics).encode('utf-8'),
+                                self.address)
+        except OSError:
+            pass
+
+    def close(self):
+        self._socket.close()
+
+
+def _statsd_path(path):
+    return path.strip('/').replace('/', '.').replace('{id}', 'id') or 'root'
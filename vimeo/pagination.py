@@ -0,0 +1,120 @@
+#! /usr/bin/env python
+# encoding: utf-8
+
+import collections
+from urllib.parse import parse_qsl, urlsplit
+from . import exceptions
+
+
+class PaginationMixin:
+    """Walk the pages of collection endpoints lazily."""
+
+    MAX_PER_PAGE = 100
+
+    def iter_pages(self, uri, params=None, per_page=None, prefetch=False,
+                   workers=1, **kwargs):
+        """Yield the pages of a collection one at a time.
+
+        Only the pages being consumed, and the ones fetched ahead, are held in
+        memory.
+
+        Args:
+            uri (string): Collection URI, like `/me/videos`.
+            params (dict): Query parameters, like `fields` or `sort`.
+            per_page (int): Page size, up to `MAX_PER_PAGE`.
+            prefetch (bool): Fetch the next page while the current one is
+                being consumed.
+            workers (int): With more than one, the page count is read from
+                the first page and the others are fetched concurrently, at
+                most `workers` ahead of the consumer. Pages are still yielded
+                in order.
+            **kwargs: Handed to `get` for every page.
+
+        Yields:
+            dict: The parsed JSON of each page.
+
+        Raises:
+            PageLoadFailure: If a page could not be loaded.
+        """
+        params = dict(params or {})
+        if per_page:
+            params['per_page'] = per_page
+
+        page = self.__get_page(uri, params, kwargs)
+        if workers > 1:
+            yield from self.__iter_pages_concurrently(
+                uri, params, page, workers, kwargs)
+            return
+
+        executor = None
+        if prefetch:
+            from concurrent.futures import ThreadPoolExecutor
+            executor = ThreadPoolExecutor(max_workers=1)
+        try:
+            while page is not None:
+                next_uri = (page.get('paging') or {}).get('next')
+                upcoming = None
+                if next_uri and executor is not None:
+                    upcoming = executor.submit(
+                        self.__get_next_page, next_uri, params, kwargs)
+
+                yield page
+
+                if not next_uri:
+                    page = None
+                elif upcoming is not None:
+                    page = upcoming.result()
+                else:
+                    page = self.__get_next_page(next_uri, params, kwargs)
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=True)
+
+    def iter_items(self, uri, **kwargs):
+        """Yield the items of a collection one at a time.
+
+        Takes the same arguments as `iter_pages`.
+
+        Yields:
+            dict: Each item of the `data` of every page.
+        """
+        for page in self.iter_pages(uri, **kwargs):
+            yield from page.get('data') or []
+
+    def __iter_pages_concurrently(self, uri, params, first, workers, kwargs):
+        """Yield the pages of a collection, fetching them concurrently."""
+        from concurrent.futures import ThreadPoolExecutor
+
+        yield first
+
+        total = first.get('total') or 0
+        per_page = first.get('per_page') or len(first.get('data') or []) or 1
+        last = -(-total // per_page)
+
+        pending = collections.deque()
+        numbers = iter(range(2, last + 1))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            try:
+                for number in numbers:
+                    pending.append(executor.submit(
+                        self.__get_page, uri, dict(params, page=number), kwargs))
+                    if len(pending) >= workers:
+                        yield pending.popleft().result()
+                while pending:
+                    yield pending.popleft().result()
+            finally:
+                for future in pending:
+                    future.cancel()
+
+    def __get_next_page(self, next_uri, params, kwargs):
+        """Follow a `paging.next` link, keeping the original parameters."""
+        parts = urlsplit(next_uri)
+        params = dict(params, **dict(parse_qsl(parts.query)))
+        return self.__get_page(parts.path, params, kwargs)
+
+    def __get_page(self, uri, params, kwargs):
+        response = self.get(uri, params=params, **kwargs)
+        if response.status_code != 200:
+            raise exceptions.PageLoadFailure(
+                response, 'Unable to load the page of {}.'.format(uri))
+        return response.json()
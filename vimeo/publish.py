@@ -0,0 +1,131 @@
+#! /usr/bin/env python
+# encoding: utf-8
+"""Publish a video along with its picture and texttracks in one call."""
+
+import time
+from . import exceptions
+
+
+class PublishResult:
+    """Outcome of `publish`.
+
+    `picture` and `texttracks` hold what `upload_picture` and
+    `upload_texttrack` returned, None for an asset that failed. `errors`
+    maps the failed assets, `picture` or `texttrack:<index>`, to the
+    exception of their last attempt.
+    """
+
+    def __init__(self, uri, checksums=None):
+        self.uri = uri
+        self.checksums = checksums
+        self.picture = None
+        self.texttracks = []
+        self.errors = {}
+
+    @property
+    def ok(self):
+        return not self.errors
+
+    def __repr__(self):
+        return '<PublishResult %s %s>' % (
+            self.uri, 'ok' if self.ok else sorted(self.errors))
+
+
+class PublishMixin:
+    """Publish a video and its assets concurrently."""
+
+    PICTURES_ENDPOINT = '{video_uri}/pictures'
+    PUBLISH_RETRY_DELAY = 2
+
+    def publish(self, filename, picture=None, texttracks=(), data=None,
+                activate_picture=True, retries=2, **kwargs):
+        """Upload a video, its picture and its texttracks.
+
+        The picture and the texttracks only need the video to exist, so they
+        are uploaded alongside the video as soon as its upload attempt is
+        created. Each asset is retried on its own.
+
+        Args:
+            filename (string): The video, anything `upload` accepts.
+            picture (string): Path on disk to the picture of the video.
+            texttracks (list): `(track_type, language, filename)` tuples, or
+                dictionaries with those keys.
+            data (dict): Data to set on the video, see `upload`.
+            activate_picture (bool): Make the picture the active one.
+            retries (int): Number of times a failed asset is uploaded again.
+            **kwargs: Handed to `upload`.
+
+        Returns:
+            PublishResult: The video URI and the created assets.
+
+        Raises:
+            UploadAttemptCreationFailure: If the video could not be created.
+            VideoUploadFailure: If the video could not be uploaded.
+        """
+        from concurrent.futures import ThreadPoolExecutor
+
+        tracks = [_texttrack_args(track) for track in texttracks]
+        assets = int(picture is not None) + len(tracks)
+        pending = []
+
+        with ThreadPoolExecutor(max_workers=max(1, assets)) as executor:
+            def start_assets(video_uri):
+                if picture is not None:
+                    pending.append(('picture', executor.submit(
+                        self.__with_retries, retries, self.__upload_picture,
+                        video_uri, picture, activate_picture)))
+                for index, track in enumerate(tracks):
+                    pending.append(('texttrack:%d' % index, executor.submit(
+                        self.__with_retries, retries, self.upload_texttrack,
+                        video_uri, *track)))
+
+            try:
+                uploaded = self.upload(filename, data=data or {},
+                                       on_attempt=start_assets, **kwargs)
+            except BaseException:
+                for _, future in pending:
+                    future.cancel()
+                raise
+
+            if isinstance(uploaded, tuple):
+                result = PublishResult(*uploaded)
+            else:
+                result = PublishResult(uploaded)
+            result.texttracks = [None] * len(tracks)
+            for name, future in pending:
+                try:
+                    asset = future.result()
+                except Exception as e:
+                    result.errors[name] = e
+                    continue
+                if name == 'picture':
+                    result.picture = asset
+                else:
+                    result.texttracks[int(name.split(':')[1])] = asset
+        return result
+
+    def __upload_picture(self, video_uri, filename, activate):
+        """Upload a picture without looking up the pictures endpoint."""
+        video = {'metadata': {'connections': {'pictures': {
+            'uri': self.PICTURES_ENDPOINT.format(video_uri=video_uri)
+        }}}}
+        return self.upload_picture(video, filename, activate=activate)
+
+    def __with_retries(self, retries, function, *args):
+        """Call `function`, again on API failures up to `retries` times."""
+        attempts = 0
+        while True:
+            attempts += 1
+            try:
+                return function(*args)
+            except exceptions.BaseVimeoException:
+                if attempts > retries:
+                    raise
+                time.sleep(self.PUBLISH_RETRY_DELAY * attempts)
+
+
+def _texttrack_args(track):
+    """Get the `upload_texttrack` arguments of a texttrack."""
+    if isinstance(track, dict):
+        return track['track_type'], track['language'], track['filename']
+    return tuple(track)
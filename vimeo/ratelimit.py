@@ -0,0 +1,238 @@
+#! /usr/bin/env python
+# encoding: utf-8
+"""Keep API calls within the rate limit instead of running into it.
+
+https://developer.vimeo.com/guidelines/rate-limiting
+"""
+
+import contextlib
+import datetime
+import threading
+import time
+
+
+def parse_reset(value):
+    """Parse an `X-RateLimit-Reset` header into a POSIX timestamp.
+
+    The API sends an ISO 8601 date, plain epoch seconds are accepted too.
+    """
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+
+    value = value.strip().replace('Z', '+00:00')
+    # Python < 3.7 does not accept a colon in the UTC offset.
+    if len(value) > 6 and value[-3] == ':' and value[-6] in '+-':
+        value = value[:-3] + value[-2:]
+    for layout in ('%Y-%m-%dT%H:%M:%S%z', '%Y-%m-%dT%H:%M:%S.%f%z'):
+        try:
+            return datetime.datetime.strptime(value, layout).timestamp()
+        except ValueError:
+            continue
+    return None
+
+
+class _Budget:
+    """What we know of the rate limit of a single token."""
+
+    __slots__ = ('limit', 'remaining', 'reset', 'next_slot')
+
+    def __init__(self, limit, remaining, reset):
+        self.limit = limit
+        self.remaining = remaining
+        self.reset = reset
+        self.next_slot = 0.0
+
+
+class RateLimitGovernor:
+    """Pace the requests of each token to stay within its rate limit.
+
+    The governor reads the `X-RateLimit-*` headers of every response. Once
+    less than `slowdown` of the limit remains, requests are spread evenly
+    until the limit resets. If the quota runs out anyway, the next requests
+    wait for the reset and a 429 is retried after it, up to `max_retries`
+    times. Waits longer than `max_wait` seconds are not taken and the
+    `APIRateLimitExceededFailure` goes up to the caller as before.
+
+    A governor is safe to share between threads and between clients using
+    the same tokens.
+    """
+
+    DEFAULT_RETRY_AFTER = 1.0
+
+    def __init__(self, slowdown=0.2, max_wait=60.0, max_retries=3):
+        """Prep the governor.
+
+        Args:
+            slowdown (float): Fraction of the limit under which requests
+                start being spread out.
+            max_wait (float): Longest wait, in seconds, before a request.
+            max_retries (int): Number of times a 429 is retried.
+        """
+        self.slowdown = slowdown
+        self.max_wait = max_wait
+        self.max_retries = max_retries
+        self._budgets = {}
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def _locked_budgets(self):
+        """Hold the budgets of every key while they are read and changed."""
+        with self._lock:
+            yield self._budgets
+
+    def acquire(self, key):
+        """Wait until a request for `key` fits in its budget."""
+        wait = self.reserve(key)
+        if wait > 0:
+            time.sleep(wait)
+
+    def reserve(self, key):
+        """Book a request for `key`.
+
+        Returns:
+            float: Seconds to wait before sending it.
+        """
+        with self._locked_budgets() as budgets:
+            budget = budgets.get(key)
+            if budget is None:
+                return 0.0
+
+            now = time.time()
+            if budget.reset is not None and now >= budget.reset:
+                budget.remaining = budget.limit
+                budget.reset = None
+
+            wait = 0.0
+            if budget.remaining <= 0 and budget.reset is not None:
+                wait = budget.reset - now
+            elif budget.reset is not None \
+                    and budget.remaining < budget.limit * self.slowdown:
+                interval = (budget.reset - now) / budget.remaining
+                start = max(now, budget.next_slot)
+                budget.next_slot = start + interval
+                wait = start - now
+
+            budget.remaining -= 1
+            return min(wait, self.max_wait)
+
+    def update(self, key, response):
+        """Record the rate limit headers of a response for `key`."""
+        headers = response.headers
+        try:
+            limit = int(headers['X-RateLimit-Limit'])
+            remaining = int(headers['X-RateLimit-Remaining'])
+        except (KeyError, TypeError, ValueError):
+            return
+        reset = parse_reset(headers.get('X-RateLimit-Reset'))
+
+        with self._locked_budgets() as budgets:
+            budget = budgets.get(key)
+            if budget is None or budget.reset != reset:
+                budgets[key] = _Budget(limit, remaining, reset)
+            else:
+                # Responses can come back out of order, trust the lowest.
+                budget.limit = limit
+                budget.remaining = min(budget.remaining, remaining)
+
+    def retry_after(self, key, response, retries):
+        """Get how long to wait before retrying a 429 for `key`.
+
+        Returns:
+            float: Seconds to wait, or None if the request should not be
+                retried.
+        """
+        if retries >= self.max_retries:
+            return None
+
+        with self._locked_budgets() as budgets:
+            budget = budgets.get(key)
+            if budget is not None:
+                budget.remaining = 0
+
+        # The reset is only precise to the second, and may already look
+        # past in its last one. Wait a little longer on each retry.
+        wait = self.DEFAULT_RETRY_AFTER * (retries + 1)
+        reset = parse_reset(response.headers.get('X-RateLimit-Reset'))
+        if reset:
+            wait = max(wait, reset - time.time())
+        return wait if wait <= self.max_wait else None
+
+
+class SQLiteRateLimitGovernor(RateLimitGovernor):
+    """A `RateLimitGovernor` whose budgets live in a SQLite database.
+
+    Every process pointing at the same database shares the budget of each
+    token, so a pool of worker processes paces itself as a whole.
+    """
+
+    def __init__(self, path, **kwargs):
+        """Prep the governor.
+
+        Args:
+            path (string): Path of the database, created if needed.
+            **kwargs: See `RateLimitGovernor`.
+        """
+        import sqlite3
+        super().__init__(**kwargs)
+        self.path = path
+        self._connection = sqlite3.connect(
+            path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._connection.execute('PRAGMA journal_mode=WAL')
+        self._connection.execute(
+            'CREATE TABLE IF NOT EXISTS rate_budget ('
+            'key TEXT PRIMARY KEY, rate_limit INTEGER NOT NULL, '
+            'remaining INTEGER NOT NULL, reset REAL, '
+            'next_slot REAL NOT NULL)'
+        )
+
+    @contextlib.contextmanager
+    def _locked_budgets(self):
+        with self._lock:
+            budgets = _SQLiteBudgets(self._connection)
+            self._connection.execute('BEGIN IMMEDIATE')
+            try:
+                yield budgets
+                budgets.flush()
+            except BaseException:
+                self._connection.execute('ROLLBACK')
+                raise
+            self._connection.execute('COMMIT')
+
+    def close(self):
+        self._connection.close()
+
+
+class _SQLiteBudgets:
+    """The budgets read and written during one transaction."""
+
+    def __init__(self, connection):
+        self._connection = connection
+        self._touched = {}
+
+    def get(self, key):
+        if key not in self._touched:
+            row = self._connection.execute(
+                'SELECT rate_limit, remaining, reset, next_slot '
+                'FROM rate_budget WHERE key = ?', (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            budget = _Budget(row[0], row[1], row[2])
+            budget.next_slot = row[3]
+            self._touched[key] = budget
+        return self._touched[key]
+
+    def __setitem__(self, key, budget):
+        self._touched[key] = budget
+
+    def flush(self):
+        for key, budget in self._touched.items():
+            self._connection.execute(
+                'INSERT OR REPLACE INTO rate_budget VALUES (?, ?, ?, ?, ?)',
+                (key, budget.limit, budget.remaining, budget.reset,
+                 budget.next_slot)
+            )
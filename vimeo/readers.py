@@ -0,0 +1,187 @@
+#! /usr/bin/env python
+# encoding: utf-8
+"""Serve the chunks of a file to the tus uploader without extra copies.
+
+Chunks are handed out as buffers that stay valid until they are given back
+with `release`, so the memory held by an upload does not depend on the
+chunk size.
+"""
+
+import mmap
+import os
+import threading
+
+
+class ChunkReader:
+    """Interface reading the chunks of an upload."""
+
+    def read(self, offset, length):
+        """Get a bytes-like object with `length` bytes from `offset`."""
+        raise NotImplementedError
+
+    def release(self, chunk):
+        """Give back a chunk once it has been sent."""
+        pass
+
+    def close(self):
+        pass
+
+
+class StreamChunkReader(ChunkReader):
+    """Read chunks from any seekable stream, into fresh bytes objects."""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self._lock = threading.Lock()
+
+    def read(self, offset, length):
+        with self._lock:
+            self.stream.seek(offset)
+            return self.stream.read(length)
+
+
+class BufferPoolChunkReader(ChunkReader):
+    """Read chunks into a pool of reusable buffers.
+
+    Buffers go back to the pool when released, so an upload allocates as
+    many buffers as it has chunks in flight, once. Buffer sizes are rounded
+    up to a power of two, so chunks growing or shrinking with the chunk
+    policy keep landing in the same buffers.
+    """
+
+    # Smallest buffer allocated, in bytes.
+    MIN_BUFFER_SIZE = 64 * 1024
+
+    def __init__(self, stream):
+        self.stream = stream
+        self._free = []
+        self._leased = {}
+        self._lock = threading.Lock()
+
+    def read(self, offset, length):
+        buffer = self.__acquire(length)
+        view = memoryview(buffer)[:length]
+        read = 0
+        if hasattr(os, 'preadv'):
+            fd = self.stream.fileno()
+            while read < length:
+                count = os.preadv(fd, [view[read:]], offset + read)
+                if not count:
+                    break
+                read += count
+        else:
+            with self._lock:
+                self.stream.seek(offset)
+                while read < length:
+                    count = self.stream.readinto(view[read:])
+                    if not count:
+                        break
+                    read += count
+        chunk = view[:read]
+        with self._lock:
+            self._leased[id(chunk)] = buffer
+        return chunk
+
+    def release(self, chunk):
+        with self._lock:
+            buffer = self._leased.pop(id(chunk), None)
+            if buffer is not None:
+                chunk.release()
+                self._free.append(buffer)
+
+    def __acquire(self, length):
+        with self._lock:
+            for index, buffer in enumerate(self._free):
+                if len(buffer) >= length:
+                    return self._free.pop(index)
+            # Grow the largest free buffer instead of keeping small ones.
+            if self._free:
+                self._free.sort(key=len)
+                self._free.pop()
+        size = self.MIN_BUFFER_SIZE
+        while size < length:
+            size *= 2
+        return bytearray(size)
+
+
+class MmapChunkReader(ChunkReader):
+    """Serve chunks as slices of a memory map of the file.
+
+    Nothing is copied in Python. Reading a chunk faults its pages in, so
+    the disk is read by the thread asking for the chunk, like the read
+    ahead workers of the uploader, and not while the chunk is sent. Pages
+    of a released chunk are dropped from the resident set when the platform
+    allows it, so memory stays flat on large files.
+    """
+
+    def __init__(self, stream):
+        self._map = mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._map)
+        self._leased = {}
+        self._lock = threading.Lock()
+
+    def read(self, offset, length):
+        chunk = self._view[offset:offset + length]
+        self.__prefault(offset, len(chunk))
+        with self._lock:
+            self._leased[id(chunk)] = offset
+        return chunk
+
+    def release(self, chunk):
+        with self._lock:
+            offset = self._leased.pop(id(chunk), None)
+        if offset is None:
+            return
+        length = len(chunk)
+        chunk.release()
+        if length and hasattr(self._map, 'madvise') \
+                and hasattr(mmap, 'MADV_DONTNEED'):
+            # madvise wants a page aligned start.
+            start = offset - offset % mmap.PAGESIZE
+            self._map.madvise(mmap.MADV_DONTNEED, start,
+                              length + offset - start)
+
+    def __prefault(self, offset, length):
+        """Bring the pages of a chunk into memory."""
+        if not length:
+            return
+        start = offset - offset % mmap.PAGESIZE
+        if hasattr(self._map, 'madvise') and hasattr(mmap, 'MADV_WILLNEED'):
+            self._map.madvise(
+                mmap.MADV_WILLNEED, start, length + offset - start)
+        # Touch a byte per page to wait for the pages here.
+        for position in range(start, offset + length, mmap.PAGESIZE):
+            self._map[position]
+
+    def close(self):
+        try:
+            self._view.release()
+            self._map.close()
+        except BufferError:
+            # A chunk is still referenced somewhere, let the GC unmap it.
+            pass
+
+
+def open_chunk_reader(stream, kind=None):
+    """Pick the reader for a stream.
+
+    Args:
+        stream (file): Binary stream to upload.
+        kind (string): `mmap`, `pool` or `stream`. Defaults to `mmap` for
+            regular files and `stream` for anything else.
+
+    Returns:
+        ChunkReader: The reader.
+    """
+    if kind is None:
+        try:
+            stream.fileno()
+            kind = 'mmap' if os.fstat(stream.fileno()).st_size else 'stream'
+        except (AttributeError, OSError):
+            kind = 'stream'
+
+    if kind == 'mmap':
+        return MmapChunkReader(stream)
+    if kind == 'pool':
+        return BufferPoolChunkReader(stream)
+    return StreamChunkReader(stream)
@@ -0,0 +1,133 @@
+#! /usr/bin/env python
+# encoding: utf-8
+"""Retry failed API calls and tus chunks with jittered backoff."""
+
+import random
+import threading
+import requests
+
+
+class RetryBudget:
+    """Cap retries to a share of the requests sent.
+
+    Each request deposits `ratio` of a token and each retry withdraws a
+    whole one, so when the API is struggling retries can't multiply the
+    load on it. `minimum` tokens are there from the start so a quiet
+    client can still retry.
+    """
+
+    def __init__(self, ratio=0.2, minimum=10):
+        self.ratio = ratio
+        self.maximum = max(minimum, 1)
+        self._tokens = float(minimum)
+        self._lock = threading.Lock()
+
+    def deposit(self):
+        """Record a request."""
+        with self._lock:
+            self._tokens = min(self.maximum, self._tokens + self.ratio)
+
+    def withdraw(self):
+        """Take a token for a retry.
+
+        Returns:
+            bool: False if the budget is spent and the call should fail.
+        """
+        with self._lock:
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+
+class RetryPolicy:
+    """Decide which failures to retry and how long to wait before each one.
+
+    Idempotent verbs are retried on connection errors, timeouts and the
+    `statuses` of a struggling server. POST and PATCH are only retried when
+    the caller allows it, with `retry=True` on the call, except after a
+    connection timeout: the request never reached the server then.
+
+    Waits grow exponentially from `backoff`, with full jitter so clients
+    that failed together don't retry together. A policy is safe to share
+    between threads, along with its `RetryBudget`.
+    """
+
+    IDEMPOTENT_METHODS = {'get', 'head', 'options', 'put', 'delete'}
+    RETRY_STATUSES = {500, 502, 503, 504}
+    RETRY_ERRORS = (requests.exceptions.ConnectionError,
+                    requests.exceptions.Timeout,
+                    requests.exceptions.ChunkedEncodingError)
+
+    def __init__(self, max_retries=3, backoff=0.5, multiplier=2.0,
+                 max_backoff=30.0, jitter=True, statuses=None, budget=None):
+        """Prep the policy.
+
+        Args:
+            max_retries (int): Most retries of a single call.
+            backoff (float): Seconds before the first retry.
+            multiplier (float): Factor the wait grows by on each retry.
+            max_backoff (float): Longest wait before a retry, in seconds.
+            jitter (bool): Wait a random time up to the backoff.
+            statuses (set): Response statuses worth retrying.
+            budget (RetryBudget): Shared cap on retries. Defaults to a new
+                one, pass False for none.
+        """
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.multiplier = multiplier
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.statuses = set(self.RETRY_STATUSES if statuses is None
+                            else statuses)
+        if budget is None:
+            budget = RetryBudget()
+        self.budget = budget or None
+
+    def is_retryable(self, method, error=None, response=None,
+                     allow_unsafe=False):
+        """Check if a failed call may be sent again.
+
+        Args:
+            method (string): HTTP verb of the call.
+            error (Exception): What the call raised.
+            response (requests.Response): What the call returned.
+            allow_unsafe (bool): Retry verbs that are not idempotent.
+        """
+        if isinstance(error, requests.exceptions.ConnectTimeout):
+            return True
+        if not (allow_unsafe or method.lower() in self.IDEMPOTENT_METHODS):
+            return False
+        if error is not None:
+            return isinstance(error, self.RETRY_ERRORS)
+        return response is not None and response.status_code in self.statuses
+
+    def can_retry(self, attempt):
+        """Check if a call that already failed `attempt + 1` times may be
+        sent again, taking a retry from the budget if so."""
+        if attempt >= self.max_retries:
+            return False
+        return self.budget is None or self.budget.withdraw()
+
+    def record_request(self):
+        """Record a new call in the retry budget."""
+        if self.budget is not None:
+            self.budget.deposit()
+
+    def wait(self, attempt, response=None):
+        """Get the seconds to wait before retry number `attempt + 1`.
+
+        A `Retry-After` header in seconds is honored, up to `max_backoff`.
+        """
+        wait = min(self.max_backoff, self.backoff * self.multiplier ** attempt)
+        if self.jitter:
+            wait = random.uniform(0, wait)
+
+        retry_after = None
+        if response is not None:
+            retry_after = response.headers.get('Retry-After')
+        try:
+            wait = max(wait, min(self.max_backoff, float(retry_after)))
+        except (TypeError, ValueError):
+            pass
+        return wait
@@ -0,0 +1,61 @@
+#! /usr/bin/env python
+# encoding: utf-8
+"""Collapse concurrent calls for the same key into one."""
+
+import threading
+
+
+class _Call:
+    """A call in flight and its outcome."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Run a function once for all the threads asking for the same key.
+
+    The first caller runs the function; callers arriving while it runs wait
+    for it and get the same result, or the same exception. A later call
+    runs the function again.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, function):
+        """Call `function`, or wait for the call already running for `key`.
+
+        Returns:
+            The result of the call.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = function()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    def in_flight(self, key):
+        """Check if a call is running for `key`."""
+        with self._lock:
+            return key in self._calls
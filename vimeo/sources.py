@@ -0,0 +1,122 @@
+#! /usr/bin/env python
+# encoding: utf-8
+"""Turn whatever is handed to `upload` into a stream of known size.
+
+Vimeo needs the size of a video when the upload attempt is created, and its
+tus server does not take `Upload-Defer-Length`. Sources that cannot tell
+their size, like generators, pipes and sockets, are therefore copied once to
+a temporary file in fixed size blocks before the attempt is created.
+"""
+
+import io
+import os
+import tempfile
+from . import exceptions
+
+# Bytes copied at a time when spooling a source to disk.
+SPOOL_BLOCK_SIZE = 1024 * 1024
+
+
+class UploadSource:
+    """A binary stream positioned at 0 with the size of the upload."""
+
+    def __init__(self, stream, size, name=None, owned=False):
+        self.stream = stream
+        self.size = size
+        self.name = name
+        self.owned = owned
+
+    def close(self):
+        if self.owned:
+            self.stream.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def open_upload_source(source, max_spool_size=None, spool_dir=None):
+    """Open something to upload.
+
+    Args:
+        source: A path, bytes, a binary file object, a socket or an iterable
+            of bytes. Non seekable sources are read once.
+        max_spool_size (int): Most bytes to copy to disk for a source of
+            unknown size. Unlimited by default.
+        spool_dir (string): Directory of the spool file. Defaults to the
+            system temporary directory.
+
+    Returns:
+        UploadSource: The source, to be closed once the upload is done.
+
+    Raises:
+        UploadSourceTooLarge: If the source goes over `max_spool_size`.
+    """
+    if isinstance(source, (str, getattr(os, 'PathLike', str))):
+        stream = io.open(source, 'rb')
+        return UploadSource(stream, os.fstat(stream.fileno()).st_size,
+                            os.path.basename(source), owned=True)
+
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return UploadSource(io.BytesIO(source), len(source))
+
+    name = getattr(source, 'name', None)
+    name = os.path.basename(name) if isinstance(name, str) else None
+    if hasattr(source, 'read') and _is_rewound(source):
+        size = source.seek(0, io.SEEK_END)
+        source.seek(0)
+        return UploadSource(source, size, name)
+
+    return _spool(source, name, max_spool_size, spool_dir)
+
+
+def _is_rewound(stream):
+    """Check if a stream can be read from offset 0 at will."""
+    try:
+        return stream.seekable() and stream.tell() == 0
+    except (AttributeError, OSError, ValueError):
+        return False
+
+
+def _spool(source, name, max_spool_size, spool_dir):
+    """Copy a source of unknown size to a temporary file."""
+    spool = tempfile.TemporaryFile(dir=spool_dir)
+    try:
+        size = 0
+        for block in _blocks(source):
+            size += len(block)
+            if max_spool_size is not None and size > max_spool_size:
+                raise exceptions.UploadSourceTooLarge(
+                    'The upload source is over {} bytes.'.format(
+                        max_spool_size))
+            spool.write(block)
+        spool.flush()
+        spool.seek(0)
+    except BaseException:
+        spool.close()
+        raise
+    return UploadSource(spool, size, name, owned=True)
+
+
+def _blocks(source):
+    """Iterate over the bytes of a source, reusing one buffer if possible."""
+    if hasattr(source, 'readinto') or hasattr(source, 'recv_into'):
+        fill = getattr(source, 'readinto', None) or source.recv_into
+        view = memoryview(bytearray(SPOOL_BLOCK_SIZE))
+        while True:
+            count = fill(view)
+            if not count:
+                return
+            yield view[:count]
+    elif hasattr(source, 'read'):
+        while True:
+            block = source.read(SPOOL_BLOCK_SIZE)
+            if not block:
+                return
+            yield block
+    else:
+        for block in source:
+            if block:
+                yield block
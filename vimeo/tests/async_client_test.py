@@ -0,0 +1,168 @@
+import asyncio
+import hashlib
+import os
+import tempfile
+import pytest
+from vimeo import AsyncVimeoClient, exceptions
+from vimeo.upload_state import SQLiteUploadStateStore, file_key
+
+# aiohttp only comes with the `async` extra.
+web = pytest.importorskip('aiohttp.web')
+
+
+def run(coroutine):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+async def start_server(routes):
+    app = web.Application()
+    app.add_routes(routes)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    port = runner.addresses[0][1]
+    return runner, 'http://127.0.0.1:%d' % port
+
+
+def test_verbs_send_vimeo_headers():
+    """
+    The async verbs should send the same headers and JSON bodies as the
+    blocking client.
+    """
+    seen = {}
+
+    async def handler(request):
+        seen['headers'] = request.headers
+        seen['body'] = await request.json()
+        return web.json_response({'uri': '/videos/1'})
+
+    async def scenario():
+        runner, root = await start_server([web.patch('/videos/1', handler)])
+        try:
+            async with AsyncVimeoClient(token='token') as client:
+                client.API_ROOT = root
+                response = await client.patch('/videos/1', data={'name': 'x'})
+                return response
+        finally:
+            await runner.cleanup()
+
+    response = run(scenario())
+
+    assert response.status_code == 200
+    assert response.json() == {'uri': '/videos/1'}
+    assert seen['body'] == {'name': 'x'}
+    assert seen['headers']['Authorization'] == 'Bearer token'
+    assert seen['headers']['Accept'] == AsyncVimeoClient.ACCEPT_HEADER
+
+
+def test_upload_sends_every_chunk():
+    """
+    An async upload should create the attempt then PATCH the file through tus
+    in order, following the offset reported by the server.
+    """
+    received = bytearray()
+
+    async def create(request):
+        return web.json_response({
+            'uri': '/videos/1',
+            'upload': {'upload_link': str(request.url.with_path('/tus/1'))}
+        })
+
+    async def patch(request):
+        assert int(request.headers['Upload-Offset']) == len(received)
+        received.extend(await request.read())
+        return web.Response(status=204, headers={
+            'Upload-Offset': str(len(received))
+        })
+
+    payload = os.urandom(2500)
+    with tempfile.NamedTemporaryFile(delete=False) as f:
+        f.write(payload)
+
+    async def scenario():
+        runner, root = await start_server([
+            web.post('/me/videos', create),
+            web.patch('/tus/1', patch),
+        ])
+        try:
+            async with AsyncVimeoClient(token='token') as client:
+                client.API_ROOT = root
+                return await client.upload(
+                    f.name, data={'chunk_size': 1000})
+        finally:
+            await runner.cleanup()
+
+    try:
+        assert run(scenario()) == '/videos/1'
+    finally:
+        os.unlink(f.name)
+    assert bytes(received) == payload
+
+
+def test_upload_resumes_with_the_options_of_the_blocking_client(tmp_path):
+    """
+    An async upload should take the same options as a blocking one: an
+    interrupted upload resumes from the state store, and the checksums cover
+    the bytes sent before it was interrupted.
+    """
+    received = bytearray()
+    attempts = []
+    failing = [True]
+
+    async def create(request):
+        attempts.append(request)
+        return web.json_response({
+            'uri': '/videos/1',
+            'upload': {'upload_link': str(request.url.with_path('/tus/1'))}
+        })
+
+    async def head(request):
+        return web.Response(headers={'Upload-Offset': str(len(received))})
+
+    async def patch(request):
+        body = await request.read()
+        if failing[0] and received:
+            return web.Response(status=500)
+        received.extend(body)
+        return web.Response(status=204, headers={
+            'Upload-Offset': str(len(received))
+        })
+
+    payload = os.urandom(2500)
+    filename = str(tmp_path / 'video.mp4')
+    with open(filename, 'wb') as f:
+        f.write(payload)
+    store = SQLiteUploadStateStore(str(tmp_path / 'state'))
+
+    async def scenario():
+        runner, root = await start_server([
+            web.post('/me/videos', create),
+            web.head('/tus/1', head),
+            web.patch('/tus/1', patch),
+        ])
+        try:
+            async with AsyncVimeoClient(
+                    token='token', upload_state_store=store) as client:
+                client.API_ROOT = root
+                with pytest.raises(exceptions.VideoUploadFailure):
+                    await client.upload(
+                        filename, data={'chunk_size': 1000}, retries=0)
+                failing[0] = False
+                return await client.upload(
+                    filename, data={'chunk_size': 1000},
+                    checksums=['sha256'], bandwidth=10 ** 6)
+        finally:
+            await runner.cleanup()
+
+    uri, digests = run(scenario())
+
+    assert uri == '/videos/1'
+    assert len(attempts) == 1
+    assert bytes(received) == payload
+    assert digests == {'sha256': hashlib.sha256(payload).hexdigest()}
+    assert store.get('upload:' + file_key(filename)) is None
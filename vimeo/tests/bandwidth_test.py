@@ -0,0 +1,57 @@
+import threading
+import time
+import pytest
+from vimeo.bandwidth import (
+    BandwidthLimiter, PriorityBandwidthLimiter, SharedBandwidthLimiter,
+    upload_limiter)
+
+
+def timed(function, *args):
+    started = time.monotonic()
+    function(*args)
+    return time.monotonic() - started
+
+
+@pytest.mark.parametrize('limiter_class', [
+    BandwidthLimiter, SharedBandwidthLimiter])
+def test_set_rate_applies_right_away(limiter_class):
+    limiter = limiter_class(1000)
+    limiter.consume(1000)
+    assert timed(limiter.consume, 200) == pytest.approx(0.2, abs=0.05)
+
+    limiter.set_rate(10000)
+    assert limiter.burst == 10000
+    assert timed(limiter.consume, 1000) < 0.15
+
+
+def test_high_priority_sends_first():
+    limiter = PriorityBandwidthLimiter(10000, burst=1000)
+    limiter.consume(1000)
+    finished = []
+
+    def send(priority):
+        limiter.consume(1000, priority)
+        finished.append(priority)
+
+    low = threading.Thread(target=send, args=('low',))
+    low.start()
+    time.sleep(0.02)
+    high = threading.Thread(target=send, args=('high',))
+    high.start()
+    low.join()
+    high.join()
+
+    assert finished == ['high', 'low']
+
+
+def test_upload_limiter():
+    shared = PriorityBandwidthLimiter(1000)
+    assert upload_limiter() is None
+    assert upload_limiter(shared, priority='low').priority == 'low'
+
+    limiter = upload_limiter(shared, bandwidth=500)
+    assert limiter.limiters[0].rate == 500
+    assert limiter.limiters[1].priority == 'normal'
+
+    with pytest.raises(ValueError):
+        shared.for_priority('urgent')
@@ -0,0 +1,51 @@
+from vimeo import VimeoClient, exceptions
+from vimeo.tests.fake_session import FakeResponse, FakeSession
+
+
+class SlowSession(FakeSession):
+    """Take a little while per call and refuse URIs ending in 0."""
+
+    def __init__(self):
+        super().__init__(latency=0.01)
+
+    def respond(self, method, url, **kwargs):
+        if url.endswith('0'):
+            return FakeResponse(404, {'error': 'not found'})
+        return FakeResponse(200)
+
+
+def test_batch_runs_concurrently_and_keeps_order():
+    session = SlowSession()
+    client = VimeoClient(token='token', session=session)
+    operations = [('patch', '/videos/%d' % index, {'privacy': {'view': 'nobody'}})
+                  for index in range(1, 25)]
+
+    results = client.batch(operations, concurrency=4)
+
+    assert [result.index for result in results] == list(range(24))
+    assert [result.ok for result in results] == \
+        [not uri.endswith('0') for _, uri, _ in operations]
+    assert isinstance(results[9].error, exceptions.BatchOperationFailure)
+    assert results[9].error.status_code == 404
+    assert 1 < session.peak <= 4
+
+
+def test_batch_streams_from_a_generator():
+    client = VimeoClient(token='token', session=SlowSession())
+    operations = ({'method': 'GET', 'uri': '/videos/%d' % index}
+                  for index in range(1, 100))
+
+    results = client.batch(operations, concurrency=2, stream=True)
+
+    assert next(results).index == 0
+    assert sum(1 for _ in results) == 98
+
+
+def test_errors_raised_by_an_operation_are_described():
+    session = FakeSession(failures=1, error=ValueError('bad operation'))
+    client = VimeoClient(token='token', session=session)
+
+    result, = client.batch([('get', '/videos/1', None)])
+
+    assert not result.ok
+    assert 'bad operation' in str(result.error)
@@ -0,0 +1,100 @@
+import json
+import os
+import requests
+from vimeo import VimeoClient
+from vimeo.bulk import load_jobs, interleave_by_size
+from vimeo.tests.fake_session import FakeResponse, FakeSession
+
+
+class FakeBulkSession(FakeSession):
+    """Accept any number of uploads, refusing the first attempt creation."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.uploads = {}
+        self.refused = False
+
+    def respond(self, method, url, **kwargs):
+        with self.lock:
+            if method == 'POST':
+                if not self.refused:
+                    self.refused = True
+                    return FakeResponse(500, {'error': 'try again'})
+                video = len(self.uploads) + 1
+                self.uploads[video] = bytearray()
+                return FakeResponse(200, {
+                    'uri': '/videos/%d' % video,
+                    'upload': {'upload_link': 'https://tus/%d' % video}
+                })
+            received = self.uploads[int(url.rsplit('/', 1)[1])]
+            received.extend(kwargs['data'].read())
+            return FakeResponse(204, headers={
+                'Upload-Offset': str(len(received))
+            })
+
+
+def make_files(directory, sizes):
+    paths = []
+    for index, size in enumerate(sizes):
+        path = os.path.join(directory, 'video%d.mp4' % index)
+        with open(path, 'wb') as f:
+            f.write(os.urandom(size))
+        paths.append(path)
+    return paths
+
+
+def test_load_jobs_from_manifests(tmp_path):
+    directory = str(tmp_path)
+    paths = make_files(directory, [10, 20])
+
+    manifest = os.path.join(directory, 'manifest.jsonl')
+    with open(manifest, 'w') as f:
+        for path in paths:
+            f.write(json.dumps({'path': path, 'data': {'name': path}}) + '\n')
+
+    jobs = load_jobs(manifest, data={'privacy': {'view': 'nobody'}})
+    assert [job.path for job in jobs] == paths
+    assert jobs[0].data == {'name': paths[0], 'privacy': {'view': 'nobody'}}
+
+    assert [job.path for job in load_jobs(directory)] == \
+        sorted(paths + [manifest])
+
+
+def test_interleave_by_size(tmp_path):
+    directory = str(tmp_path)
+    paths = make_files(directory, [1, 5, 3, 4, 2])
+
+    ordered = interleave_by_size(load_jobs(paths))
+
+    assert [job.size for job in ordered] == [5, 1, 4, 2, 3]
+
+
+def test_bulk_upload_retries_failed_files(tmp_path):
+    directory = str(tmp_path)
+    paths = make_files(directory, [300, 100, 200])
+
+    session = FakeBulkSession()
+    client = VimeoClient(token='token', session=session)
+    client.BULK_RETRY_DELAY = 0
+
+    results = list(client.bulk_upload(directory, concurrency=2))
+
+    assert all(result.ok for result in results)
+    assert sorted(result.attempts for result in results) == [1, 1, 2]
+    assert sorted(len(data) for data in session.uploads.values()) == \
+        [100, 200, 300]
+
+
+def test_bulk_upload_retries_dropped_connections(tmp_path):
+    make_files(str(tmp_path), [300, 100, 200])
+
+    session = FakeBulkSession(
+        failures=1, error=requests.exceptions.ConnectionError())
+    client = VimeoClient(token='token', session=session)
+    client.BULK_RETRY_DELAY = 0
+
+    results = list(client.bulk_upload(str(tmp_path), concurrency=2))
+
+    assert all(result.ok for result in results)
+    # A dropped connection and a refused attempt, one retry each.
+    assert sum(result.attempts for result in results) == 5
@@ -0,0 +1,78 @@
+import tempfile
+import time
+import pytest
+from vimeo import VimeoClient
+from vimeo.cache import DiskCache, MemoryCache
+from vimeo.tests.fake_session import FakeResponse, FakeSession
+
+
+class FakeVideoSession(FakeSession):
+    """Serve a video with an ETag, honouring If-None-Match."""
+
+    def __init__(self):
+        super().__init__()
+        self.version = 1
+        self.calls = []
+
+    def respond(self, method, url, headers=None, **kwargs):
+        self.calls.append((method, headers.get('If-None-Match')))
+        if method == 'PATCH':
+            self.version += 1
+            return FakeResponse(200)
+
+        etag = '"v%d"' % self.version
+        if headers.get('If-None-Match') == etag:
+            return FakeResponse(304, headers={'ETag': etag})
+        return FakeResponse(
+            200, {'version': self.version}, headers={'ETag': etag})
+
+
+def make_cache(kind, ttl):
+    if kind == 'memory':
+        return MemoryCache(ttl=ttl)
+    return DiskCache(tempfile.mkdtemp(), ttl=ttl)
+
+
+@pytest.mark.parametrize('kind', ['memory', 'disk'])
+def test_fresh_responses_are_served_from_cache(kind):
+    session = FakeVideoSession()
+    client = VimeoClient(token='token', session=session,
+                         cache=make_cache(kind, 60))
+
+    first = client.get('/videos/1', params={'fields': 'uri', 'a': 1})
+    second = client.get('/videos/1', params={'a': 1, 'fields': 'uri'})
+    other_fields = client.get('/videos/1', params={'fields': 'name'})
+
+    assert first.json() == second.json() == {'version': 1}
+    assert other_fields.json() == {'version': 1}
+    assert len(session.calls) == 2
+
+    # A write drops every cached response of the URI.
+    client.patch('/videos/1', data={'name': 'new'})
+    assert client.get('/videos/1', params={'fields': 'uri'}).json() == \
+        {'version': 2}
+
+
+@pytest.mark.parametrize('kind', ['memory', 'disk'])
+def test_stale_responses_are_revalidated(kind):
+    session = FakeVideoSession()
+    client = VimeoClient(token='token', session=session,
+                         cache=make_cache(kind, 0))
+
+    client.get('/videos/1')
+    time.sleep(0.01)
+    response = client.get('/videos/1')
+
+    assert response.status_code == 200
+    assert response.json() == {'version': 1}
+    assert session.calls == [('GET', None), ('GET', '"v1"')]
+
+
+def test_cache_is_keyed_by_token():
+    session = FakeVideoSession()
+    cache = MemoryCache()
+
+    VimeoClient(token='one', session=session, cache=cache).get('/videos/1')
+    VimeoClient(token='two', session=session, cache=cache).get('/videos/1')
+
+    assert len(session.calls) == 2
@@ -0,0 +1,69 @@
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from vimeo import VimeoClient
+from vimeo.instrumentation import Instrumentation
+from vimeo.tests.fake_session import FakeSession
+
+
+def test_session_is_pooled_and_shared():
+    """
+    The client should hand every verb the same pooled session, sized with the
+    options it was built with, instead of going through the module level
+    Requests helpers.
+    """
+    client = VimeoClient(token='token', pool_maxsize=32)
+
+    session = client.session
+    assert session is client.session
+
+    adapter = session.get_adapter(client.API_ROOT)
+    assert adapter._pool_maxsize == 32
+
+    client.close()
+    assert client._session is None
+
+
+def test_callers_are_cached():
+    """
+    Looking up a verb twice should not rebuild the caller.
+    """
+    client = VimeoClient(token='token')
+
+    assert client.get is client.get
+    assert client.get is not client.post
+
+
+def test_handed_session_is_not_closed():
+    session = requests.Session()
+    client = VimeoClient(token='token', session=session)
+
+    with client:
+        assert client.session is session
+    assert client.session is session
+
+
+def test_coalesce_shares_identical_gets():
+    session = FakeSession(latency=0.2)
+    events = []
+    instrumentation = Instrumentation()
+    instrumentation.add_listener(events.append)
+    client = VimeoClient(token='token', session=session, coalesce=True,
+                         instrumentation=instrumentation)
+
+    def call(params):
+        return client.get('/videos/1', params=params)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        same = list(executor.map(call, [{'fields': 'uri'}] * 6))
+        other = executor.submit(call, {'fields': 'name'}).result()
+
+    assert len(session.sent) == 2
+    assert all(response is same[0] for response in same)
+    assert other is not same[0]
+    # A shared request is only reported once.
+    assert len(events) == 2
+
+    # Writes are never coalesced.
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        list(executor.map(lambda _: client.post('/videos/1'), range(4)))
+    assert len(session.sent) == 6
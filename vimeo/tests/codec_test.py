@@ -0,0 +1,37 @@
+import json
+import pytest
+from vimeo import VimeoClient
+from vimeo.codec import JSONCodec, LazyJSON, get_codec
+from vimeo.tests.fake_api import FakeVimeoAPI
+
+
+def test_lazy_json_decodes_up_to_the_key_read():
+    body = {'total': 2, 'paging': {'next': None}, 'data': [{'uri': '/a'}],
+            'after': 'x'}
+    lazy = LazyJSON(json.dumps(body, indent=2).encode('utf-8'))
+
+    assert lazy['paging'] == {'next': None}
+    assert 'data' not in lazy._values
+    assert lazy.get('missing') is None
+    assert dict(lazy) == body
+    with pytest.raises(ValueError):
+        LazyJSON(b'[1, 2]')['a']
+
+
+def test_standard_library_is_the_default_codec():
+    # Even with a faster codec installed, it has to be asked for.
+    assert type(get_codec()) is JSONCodec
+    assert type(VimeoClient(token='token').codec) is JSONCodec
+
+
+@pytest.mark.parametrize('codec', ['json', 'orjson'])
+def test_client_encodes_and_decodes_with_codec(codec):
+    if codec == 'orjson':
+        pytest.importorskip('orjson')
+    with FakeVimeoAPI() as api:
+        client = VimeoClient(token='token', codec=codec)
+        client.API_ROOT = api.url
+        assert client.codec.name == codec
+
+        assert client.patch('/videos/1', data={'name': 'x'}).json() == {}
+        assert client.get('/videos/1').json()['uri'] == '/videos/1'
@@ -0,0 +1,399 @@
+"""A local stand-in for the Vimeo API and its tus server.
+
+Used by the tests and the benchmarks in `benchmarks/`. It mimics just
+enough of the API for the client to upload, replace, add pictures and
+texttracks and walk collections, and lets the network conditions be
+tuned:
+
+    with FakeVimeoAPI(latency=0.01, bandwidth=50 * 1024 * 1024) as api:
+        client = VimeoClient(token='token')
+        client.API_ROOT = api.url
+        client.upload('video.mp4')
+"""
+
+import datetime
+import json
+import random
+import re
+import socket
+import socketserver
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+
+class _ThreadingHTTPServer(socketserver.ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class FakeVimeoAPI:
+    """Serve a fake Vimeo API from a background thread.
+
+    Args:
+        latency (float): Seconds added before every response.
+        bandwidth (int): Bytes per second a tus PATCH body is read at.
+            Unlimited by default.
+        failure_rate (float): Chance that a tus PATCH drops the connection
+            half way through its body, like a flaky network would.
+        rate_limit (int): Requests allowed per `rate_limit_window` seconds.
+            Unlimited by default. Every API response carries the
+            `X-RateLimit-*` headers either way.
+        rate_limit_window (float): Seconds before the rate limit resets.
+        videos (int): Number of videos in the `/me/videos` collection.
+        keep_data (bool): Keep uploaded bytes in `uploads` so they can be
+            checked, instead of only counting them.
+        seed (int): Seed of the failure injection.
+    """
+
+    BLOCK_SIZE = 64 * 1024
+
+    def __init__(self, latency=0.0, bandwidth=None, failure_rate=0.0,
+                 rate_limit=None, rate_limit_window=60.0, videos=100,
+                 keep_data=False, seed=None):
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.failure_rate = failure_rate
+        self.rate_limit = rate_limit
+        self.rate_limit_window = rate_limit_window
+        self.videos = videos
+        self.keep_data = keep_data
+        self.uploads = {}
+        # Status and transcode status of videos still transcoding, by id.
+        self.transcoding = {}
+        self.requests = []
+        self.lock = threading.Lock()
+        self._random = random.Random(seed)
+        self._next_id = 1
+        self._remaining = rate_limit
+        self._reset = None
+        self._server = None
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address
+        return 'http://%s:%d' % (host, port)
+
+    def start(self):
+        self._server = _ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+        self._server.api = self
+        self._thread = threading.Thread(target=self._server.serve_forever)
+        self._thread.daemon = True
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def new_upload(self, size, uri=None):
+        """Register a tus upload and get the attempt describing it."""
+        with self.lock:
+            upload_id = self._next_id
+            self._next_id += 1
+            self.uploads[upload_id] = {
+                'size': size,
+                'offset': 0,
+                'data': bytearray() if self.keep_data else None,
+            }
+        return {
+            'uri': uri or '/videos/%d' % upload_id,
+            'upload': {
+                'approach': 'tus',
+                'size': size,
+                'upload_link': '%s/tus/%d' % (self.url, upload_id),
+            },
+        }
+
+    def take_rate_limit(self):
+        """Book a request against the rate limit.
+
+        Returns:
+            tuple: Whether the request is allowed, and the rate limit headers.
+        """
+        if self.rate_limit is None:
+            reset = time.time() + self.rate_limit_window
+            return True, _rate_limit_headers(1000000, 1000000, reset)
+
+        with self.lock:
+            now = time.time()
+            if self._reset is None or now >= self._reset:
+                self._reset = now + self.rate_limit_window
+                self._remaining = self.rate_limit
+            allowed = self._remaining > 0
+            if allowed:
+                self._remaining -= 1
+            return allowed, _rate_limit_headers(
+                self.rate_limit, self._remaining, self._reset)
+
+    def should_fail(self):
+        with self.lock:
+            return self._random.random() < self.failure_rate
+
+    def video(self, video_id):
+        status, transcode = self.transcoding.get(
+            video_id, ('available', 'complete'))
+        return {
+            'uri': '/videos/%d' % video_id,
+            'name': 'Video %d' % video_id,
+            'link': 'https://vimeo.com/%d' % video_id,
+            'status': status,
+            'transcode': {'status': transcode},
+            'metadata': {'connections': {
+                'pictures': {'uri': '/videos/%d/pictures' % video_id},
+                'texttracks': {'uri': '/videos/%d/texttracks' % video_id},
+            }},
+        }
+
+
+def project(body, fields):
+    """Keep only the dotted `fields` of a body, like the API does."""
+    if not fields:
+        return body
+    if isinstance(body, list):
+        return [project(item, fields) for item in body]
+    if not isinstance(body, dict):
+        return body
+
+    nested = {}
+    for field in fields.split(','):
+        key, _, rest = field.partition('.')
+        if key in body:
+            nested.setdefault(key, []).append(rest)
+    return {
+        key: body[key] if '' in rests else project(body[key], ','.join(rests))
+        for key, rests in nested.items()
+    }
+
+
+def _rate_limit_headers(limit, remaining, reset):
+    reset = datetime.datetime.fromtimestamp(reset, datetime.timezone.utc)
+    return {
+        'X-RateLimit-Limit': str(limit),
+        'X-RateLimit-Remaining': str(remaining),
+        'X-RateLimit-Reset': reset.strftime('%Y-%m-%dT%H:%M:%S+00:00'),
+    }
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    ROUTES = [
+        ('GET', r'^/me/videos$', 'list_videos'),
+        ('POST', r'^/me/videos$', 'create_video'),
+        ('GET', r'^/videos$', 'list_videos_by_uri'),
+        ('GET', r'^/videos/(\d+)$', 'get_video'),
+        ('PATCH', r'^/videos/(\d+)$', 'edit'),
+        ('DELETE', r'^/videos/(\d+)$', 'delete'),
+        ('POST', r'^/videos/(\d+)/versions$', 'create_version'),
+        ('POST', r'^/videos/(\d+)/texttracks$', 'create_texttrack'),
+        ('POST', r'^/videos/(\d+)/pictures$', 'create_picture'),
+        ('PATCH', r'^/videos/(\d+)/pictures/(\d+)$', 'edit'),
+        ('PUT', r'^/files/.+$', 'put_file'),
+        ('HEAD', r'^/tus/(\d+)$', 'tus_head'),
+        ('PATCH', r'^/tus/(\d+)$', 'tus_patch'),
+    ]
+
+    def setup(self):
+        super().setup()
+        # Headers and body go out in separate writes, don't let Nagle hold
+        # the body back on keep-alive connections.
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    @property
+    def api(self):
+        return self.server.api
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        self.route('GET')
+
+    def do_POST(self):
+        self.route('POST')
+
+    def do_PUT(self):
+        self.route('PUT')
+
+    def do_PATCH(self):
+        self.route('PATCH')
+
+    def do_DELETE(self):
+        self.route('DELETE')
+
+    def do_HEAD(self):
+        self.route('HEAD')
+
+    def route(self, method):
+        parts = urlsplit(self.path)
+        self.query = dict(parse_qsl(parts.query))
+        with self.api.lock:
+            self.api.requests.append((method, parts.path))
+        if self.api.latency:
+            time.sleep(self.api.latency)
+
+        for route_method, pattern, name in self.ROUTES:
+            match = re.match(pattern, parts.path)
+            if route_method == method and match:
+                return getattr(self, name)(*match.groups())
+        self.read_body()
+        self.reply(404, {'error': 'Not found.'})
+
+    def read_body(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        return self.rfile.read(length) if length else b''
+
+    def read_json(self):
+        body = self.read_body()
+        if self.headers.get('Content-Type') == 'application/json':
+            return json.loads(body.decode('utf-8'))
+        return dict(parse_qsl(body.decode('utf-8')))
+
+    def reply(self, status, body=None, headers=None, rate_limited=True):
+        headers = dict(headers or {})
+        if rate_limited:
+            allowed, rate_headers = self.api.take_rate_limit()
+            headers.update(rate_headers)
+            if not allowed:
+                status, body = 429, {'error': 'Too many API requests.'}
+
+        payload = json.dumps(body).encode('utf-8') if body is not None else b''
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        if payload:
+            self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(payload)
+
+    def list_videos(self):
+        page = int(self.query.get('page', 1))
+        per_page = min(int(self.query.get('per_page', 25)), 100)
+        total = self.api.videos
+        start = (page - 1) * per_page
+        last = max(1, -(-total // per_page))
+        next_uri = None
+        if page < last:
+            next_uri = '/me/videos?page=%d&per_page=%d' % (page + 1, per_page)
+        self.reply(200, {
+            'total': total,
+            'page': page,
+            'per_page': per_page,
+            'paging': {'next': next_uri},
+            'data': [project(self.api.video(video_id + 1),
+                             self.query.get('fields'))
+                     for video_id in range(start, min(start + per_page, total))],
+        })
+
+    def list_videos_by_uri(self):
+        ids = [int(uri.rsplit('/', 1)[-1])
+               for uri in self.query.get('uris', '').split(',') if uri]
+        data = [project(self.api.video(video_id), self.query.get('fields'))
+                for video_id in ids
+                if video_id <= self.api.videos or video_id in self.api.uploads]
+        self.reply(200, {
+            'total': len(data),
+            'page': 1,
+            'per_page': len(data),
+            'paging': {'next': None},
+            'data': data,
+        })
+
+    def create_video(self):
+        data = self.read_json()
+        size = int(data.get('upload', {}).get('size', 0))
+        self.reply(200, self.api.new_upload(size))
+
+    def create_version(self, video_id):
+        data = self.read_json()
+        size = int(data.get('upload', {}).get('size', 0))
+        attempt = self.api.new_upload(size)
+        self.reply(201, {'upload': attempt['upload']})
+
+    def get_video(self, video_id):
+        self.reply(200, project(self.api.video(int(video_id)),
+                                self.query.get('fields')))
+
+    def edit(self, *ids):
+        self.read_body()
+        self.reply(200, {})
+
+    def delete(self, video_id):
+        self.reply(204)
+
+    def create_texttrack(self, video_id):
+        data = self.read_json()
+        self.reply(201, {
+            'uri': '/videos/%s/texttracks/1' % video_id,
+            'link': '%s/files/texttracks/%s' % (self.api.url, video_id),
+            'type': data.get('type'),
+            'language': data.get('language'),
+        })
+
+    def create_picture(self, video_id):
+        self.read_body()
+        self.reply(201, {
+            'uri': '/videos/%s/pictures/1' % video_id,
+            'link': '%s/files/pictures/%s' % (self.api.url, video_id),
+        })
+
+    def put_file(self):
+        self.read_body()
+        self.reply(200, {}, rate_limited=False)
+
+    def tus_head(self, upload_id):
+        upload = self.api.uploads.get(int(upload_id))
+        if upload is None:
+            return self.reply(404, rate_limited=False)
+        self.reply(200, headers={
+            'Upload-Offset': str(upload['offset']),
+            'Upload-Length': str(upload['size']),
+            'Tus-Resumable': '1.0.0',
+        }, rate_limited=False)
+
+    def tus_patch(self, upload_id):
+        upload = self.api.uploads.get(int(upload_id))
+        length = int(self.headers.get('Content-Length') or 0)
+        if upload is None or \
+                int(self.headers.get('Upload-Offset', -1)) != upload['offset']:
+            self.rfile.read(length)
+            return self.reply(409, rate_limited=False)
+
+        failing = self.api.should_fail()
+        to_read = length // 2 if failing else length
+        started = time.monotonic()
+        read = 0
+        while read < to_read:
+            block = self.rfile.read(min(self.api.BLOCK_SIZE, to_read - read))
+            if not block:
+                break
+            read += len(block)
+            with self.api.lock:
+                upload['offset'] += len(block)
+                if upload['data'] is not None:
+                    upload['data'].extend(block)
+            if self.api.bandwidth:
+                ahead = read / self.api.bandwidth - (time.monotonic() - started)
+                if ahead > 0:
+                    time.sleep(ahead)
+
+        if failing:
+            # Drop the connection like a reset network would.
+            self.close_connection = True
+            return
+
+        self.reply(204, headers={
+            'Upload-Offset': str(upload['offset']),
+            'Tus-Resumable': '1.0.0',
+        }, rate_limited=False)
@@ -0,0 +1,110 @@
+import os
+import tempfile
+import pytest
+from vimeo import VimeoClient, exceptions
+from vimeo.tests.fake_api import FakeVimeoAPI
+
+
+def make_file(size, suffix='.mp4'):
+    with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as f:
+        f.write(os.urandom(size))
+    return f.name
+
+
+def make_client(api):
+    client = VimeoClient(token='token')
+    client.API_ROOT = api.url
+    return client
+
+
+def test_upload_survives_dropped_connections():
+    """
+    A full upload over HTTP, with chunks dropped half way, should resume each
+    chunk from the server offset and end with every byte in place.
+    """
+    filename = make_file(300 * 1024)
+    with FakeVimeoAPI(failure_rate=0.3, keep_data=True, seed=1) as api:
+        client = make_client(api)
+        uri = client.upload(filename, data={'chunk_size': 32 * 1024},
+                            retries=10, retry_delay=0)
+        replaced = client.replace(uri, filename, retry_delay=0, retries=10)
+
+        with open(filename, 'rb') as f:
+            payload = f.read()
+        assert uri == replaced == '/videos/1'
+        assert bytes(api.uploads[1]['data']) == payload
+        assert bytes(api.uploads[2]['data']) == payload
+    os.unlink(filename)
+
+
+def test_upload_streams_of_unknown_size():
+    """Generators and pipes should be read once and uploaded whole."""
+    payload = os.urandom(200 * 1024)
+    read_fd, write_fd = os.pipe()
+    with os.fdopen(write_fd, 'wb') as pipe:
+        pipe.write(payload[:60000])
+
+    with FakeVimeoAPI(keep_data=True) as api, \
+            os.fdopen(read_fd, 'rb') as pipe:
+        client = make_client(api)
+        blocks = (payload[i:i + 1000] for i in range(0, len(payload), 1000))
+        client.upload(blocks, data={'chunk_size': 64 * 1024})
+        client.upload(pipe)
+
+        assert bytes(api.uploads[1]['data']) == payload
+        assert bytes(api.uploads[2]['data']) == payload[:60000]
+
+        with pytest.raises(exceptions.UploadSourceTooLarge):
+            client.upload(iter([payload]), max_spool_size=1000)
+
+
+def test_pictures_texttracks_and_collections():
+    picture = make_file(1024, '.png')
+    texttrack = make_file(1024, '.vtt')
+    with FakeVimeoAPI(videos=30) as api:
+        client = make_client(api)
+
+        assert client.upload_picture('/videos/1', picture, activate=True)['active']
+        assert client.upload_texttrack(
+            '/videos/1', 'subtitles', 'en', texttrack)['link']
+        assert len(list(client.iter_items('/me/videos', per_page=7))) == 30
+    os.unlink(picture)
+    os.unlink(texttrack)
+
+
+def test_publish_uploads_assets_alongside_the_video():
+    video = make_file(256 * 1024)
+    picture = make_file(1024, '.png')
+    texttrack = make_file(1024, '.vtt')
+    with FakeVimeoAPI(bandwidth=1024 * 1024) as api:
+        client = make_client(api)
+        client.PUBLISH_RETRY_DELAY = 0
+        upload_texttrack = client.upload_texttrack
+        failures = []
+
+        def flaky_texttrack(*args):
+            if not failures:
+                failures.append(args)
+                raise exceptions.TexttrackUploadFailure(None, 'flaky')
+            return upload_texttrack(*args)
+        client.upload_texttrack = flaky_texttrack
+
+        result = client.publish(
+            video, picture=picture,
+            texttracks=[('subtitles', 'en', texttrack),
+                        {'track_type': 'captions', 'language': 'fr',
+                         'filename': texttrack}],
+            data={'chunk_size': 64 * 1024})
+
+        assert result.ok and result.uri == '/videos/1'
+        assert result.picture['active']
+        assert [track['language'] for track in result.texttracks] == \
+            ['en', 'fr']
+        assert len(failures) == 1
+
+        # The assets went up while the video was still being sent.
+        paths = [path for method, path in api.requests if method != 'HEAD']
+        assert paths.index('/videos/1/pictures') < \
+            len(paths) - 1 - paths[::-1].index('/tus/1')
+    for filename in (video, picture, texttrack):
+        os.unlink(filename)
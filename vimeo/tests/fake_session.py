@@ -0,0 +1,81 @@
+"""In-process stand-ins for a Requests session and its responses.
+
+Handy when a test needs to script the API answers call by call, or inject
+latency and failures, without the local server of `fake_api`:
+
+    class VideoSession(FakeSession):
+        def respond(self, method, url, **kwargs):
+            return FakeResponse(200, {'uri': '/videos/1'})
+
+    session = VideoSession(failures=1, error=ConnectionError())
+    client = VimeoClient(token='token', session=session)
+"""
+
+import json as _json
+import threading
+import time
+import requests
+
+
+class FakeResponse:
+    """A response with the `requests.Response` surface the client uses."""
+
+    def __init__(self, status_code=200, json=None, headers=None,
+                 content=None):
+        self.status_code = status_code
+        self._json = json
+        self.headers = dict(headers or {})
+        if content is None:
+            content = b'' if json is None else _json.dumps(json).encode()
+        self.content = content
+
+    def json(self):
+        return self._json
+
+
+class FakeSession(requests.Session):
+    """Session answering every request with `respond`, without any network.
+
+    Args:
+        latency (float): Seconds each request takes.
+        failures (int): Number of first requests that fail.
+        error (Exception): Raised by the failing requests. They are answered
+            with a `status` response when not given.
+        status (int): Status of the failing requests.
+
+    Every request is recorded in `sent` as a (method, url, kwargs) tuple,
+    and `peak` keeps the most requests in flight at once.
+    """
+
+    def __init__(self, latency=0, failures=0, error=None, status=503):
+        super().__init__()
+        self.latency = latency
+        self.failures = failures
+        self.error = error
+        self.status = status
+        self.lock = threading.Lock()
+        self.sent = []
+        self.in_flight = 0
+        self.peak = 0
+
+    def request(self, method, url, **kwargs):
+        with self.lock:
+            self.sent.append((method, url, kwargs))
+            failing = len(self.sent) <= self.failures
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        try:
+            if self.latency:
+                time.sleep(self.latency)
+            if failing:
+                if self.error is not None:
+                    raise self.error
+                return FakeResponse(self.status)
+            return self.respond(method, url, **kwargs)
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+    def respond(self, method, url, **kwargs):
+        """Answer a request that did not fail, with a 200 by default."""
+        return FakeResponse(200)
@@ -0,0 +1,47 @@
+from vimeo import VimeoClient
+from vimeo.fields import FieldSelector
+from vimeo.tests.fake_api import FakeVimeoAPI
+
+
+def make_client(api, selector):
+    client = VimeoClient(token='token', field_selector=selector)
+    client.API_ROOT = api.url
+    return client
+
+
+def test_learns_fields_then_selects_them():
+    selector = FieldSelector(learn=True)
+    with FakeVimeoAPI() as api:
+        client = make_client(api, selector)
+        video = client.get('/videos/1').json()
+        assert video['transcode']['status'] == 'complete'
+        assert video.get('name') == 'Video 1'
+        page = client.get('/me/videos', params={'per_page': 2}).json()
+        assert [item['uri'] for item in page['data']] == \
+            ['/videos/1', '/videos/2']
+
+        assert selector.learned() == {
+            '/videos/{id}': 'name,transcode.status',
+            '/me/videos': 'uri',
+        }
+        selector.freeze()
+
+        assert client.get('/videos/2').json() == {
+            'name': 'Video 2', 'transcode': {'status': 'complete'}}
+        page = client.get('/me/videos', params={'per_page': 2}).json()
+        assert page['data'] == [{'uri': '/videos/1'}, {'uri': '/videos/2'}]
+
+    report = {row.path: row for row in selector.report()}
+    assert report['/videos/{id}'].requests == 2
+    assert report['/videos/{id}'].projected == 1
+    assert report['/videos/{id}'].bytes_saved > 0
+
+
+def test_explicit_fields_are_kept():
+    selector = FieldSelector({'/videos/{id}': ['uri']})
+    with FakeVimeoAPI() as api:
+        client = make_client(api, selector)
+        video = client.get('/videos/1', params={'fields': 'name'}).json()
+
+    assert video == {'name': 'Video 1'}
+    assert selector.report()[0].projected == 0
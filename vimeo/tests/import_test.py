@@ -0,0 +1,26 @@
+import subprocess
+import sys
+
+# Only needed to upload, or by optional features.
+LAZY_MODULES = [
+    'aiohttp', 'asyncio', 'concurrent.futures', 'mmap', 'multiprocessing',
+    'pickle', 'sqlite3', 'vimeo.async_client', 'vimeo.readers',
+    'vimeo.sources', 'vimeo.tus', 'vimeo.upload_state', 'vimeo.workers',
+]
+
+
+def test_import_leaves_upload_machinery_unloaded():
+    script = (
+        'import sys, vimeo\n'
+        'client = vimeo.VimeoClient(token="token")\n'
+        'print(",".join(m for m in %r if m in sys.modules))' % LAZY_MODULES
+    )
+    output = subprocess.check_output(
+        [sys.executable, '-c', script], universal_newlines=True)
+    assert output.strip() == ''
+
+
+def test_async_client_is_loaded_on_first_use():
+    import vimeo
+    from vimeo.async_client import AsyncVimeoClient
+    assert vimeo.AsyncVimeoClient is AsyncVimeoClient
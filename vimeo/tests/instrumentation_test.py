@@ -0,0 +1,114 @@
+from vimeo import VimeoClient
+from vimeo.instrumentation import (
+    Instrumentation, MetricsAggregator, RequestEvent, RetryEvent,
+    path_template)
+from vimeo.tests.fake_session import FakeResponse, FakeSession
+
+
+class VideoSession(FakeSession):
+    def respond(self, method, url, **kwargs):
+        return FakeResponse(
+            404 if url.endswith('missing') else 200, {'uri': '/videos/1'},
+            headers={'X-RateLimit-Remaining': '42'})
+
+
+def test_path_template():
+    assert path_template('https://api.vimeo.com/videos/1234/texttracks') == \
+        '/videos/{id}/texttracks'
+    assert path_template('/users/42/albums/7?fields=uri') == \
+        '/users/{id}/albums/{id}'
+    assert path_template('/me/videos') == '/me/videos'
+
+
+def test_metrics_are_aggregated_per_endpoint():
+    metrics = MetricsAggregator()
+    events = []
+    instrumentation = Instrumentation()
+    instrumentation.add_listener(metrics)
+    instrumentation.add_listener(events.append)
+    instrumentation.add_before_request(
+        lambda method, url, kwargs: kwargs['headers'].update({'X-Trace': '1'}))
+
+    client = VimeoClient(token='token', session=VideoSession(),
+                         instrumentation=instrumentation)
+    client.get('/videos/1')
+    client.get('/videos/2')
+    client.patch('/videos/2', data={'name': 'x'})
+    client.get('/videos/missing')
+
+    assert all(isinstance(event, RequestEvent) for event in events)
+    assert [event.status for event in events] == [200, 200, 200, 404]
+    assert events[2].bytes_sent == len(client.codec.dumps({'name': 'x'}))
+    assert metrics.durations[('get', '/videos/{id}', '200')].count == 2
+    assert metrics.quantile('get', '/videos/{id}', 200, 0.99) == 0.005
+    assert metrics.rate_limit_remaining == 42
+
+    rendered = metrics.render_prometheus()
+    assert 'vimeo_request_duration_seconds_count{method="get",' \
+        'path="/videos/{id}",status="200"} 2' in rendered
+    assert 'vimeo_rate_limit_remaining 42' in rendered
+
+
+class StreamedResponse:
+    status_code = 200
+    headers = {'Content-Length': '1048576'}
+
+    @property
+    def content(self):
+        raise AssertionError('The streamed body was read.')
+
+
+class StreamingSession(FakeSession):
+    def respond(self, method, url, **kwargs):
+        return StreamedResponse()
+
+
+def test_streamed_responses_are_not_read():
+    events = []
+    instrumentation = Instrumentation()
+    instrumentation.add_listener(events.append)
+    client = VimeoClient(token='token', session=StreamingSession(),
+                         instrumentation=instrumentation)
+
+    client.get('/videos/1/files', stream=True)
+
+    assert events[0].bytes_received == 1048576
+
+
+class FlakyUploadSession(FakeSession):
+    """Drop the connection on the first tus PATCH."""
+
+    def __init__(self):
+        super().__init__()
+        self.received = bytearray()
+
+    def respond(self, method, url, data=None, **kwargs):
+        if method == 'POST':
+            return FakeResponse(200, {
+                'uri': '/videos/1',
+                'upload': {'upload_link': 'https://tus/1'}
+            })
+        if method == 'PATCH':
+            if not self.received:
+                self.received.extend(data.read()[:10])
+                raise ConnectionError('connection reset')
+            self.received.extend(data.read())
+        return FakeResponse(204, headers={
+            'Upload-Offset': str(len(self.received))
+        })
+
+
+def test_tus_chunk_retries_are_reported(tmp_path):
+    path = tmp_path / 'video.mp4'
+    path.write_bytes(b'x' * 100)
+    events = []
+    instrumentation = Instrumentation()
+    instrumentation.add_listener(events.append)
+    client = VimeoClient(token='token', session=FlakyUploadSession(),
+                         instrumentation=instrumentation)
+
+    assert client.upload(str(path), retry_delay=0) == '/videos/1'
+
+    retries = [event for event in events if isinstance(event, RetryEvent)]
+    assert [(event.method, event.reason) for event in retries] == \
+        [('patch', 'ConnectionError')]
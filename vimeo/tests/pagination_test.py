@@ -0,0 +1,67 @@
+import pytest
+from urllib.parse import urlsplit, parse_qsl
+from vimeo import VimeoClient, exceptions
+from vimeo.tests.fake_session import FakeResponse, FakeSession
+
+
+class FakeCollectionSession(FakeSession):
+    """Serve a collection of `total` items, `per_page` at a time."""
+
+    def __init__(self, total, per_page, missing_page=None):
+        super().__init__()
+        self.total = total
+        self.per_page = per_page
+        self.missing_page = missing_page
+        self.requested = []
+
+    def respond(self, method, url, params=None, **kwargs):
+        params = dict(params or {})
+        params.update(parse_qsl(urlsplit(url).query))
+        page = int(params.get('page', 1))
+        self.requested.append((page, params.get('fields')))
+        if page == self.missing_page:
+            return FakeResponse(404, {'error': 'gone'})
+
+        start = (page - 1) * self.per_page
+        items = list(range(start, min(start + self.per_page, self.total)))
+        last = -(-self.total // self.per_page)
+        next_uri = None
+        if page < last:
+            next_uri = '/me/videos?page=%d&per_page=%d' % (
+                page + 1, self.per_page)
+        return FakeResponse(200, {
+            'total': self.total,
+            'page': page,
+            'per_page': self.per_page,
+            'paging': {'next': next_uri},
+            'data': [{'uri': '/videos/%d' % item} for item in items],
+        })
+
+
+@pytest.mark.parametrize('options', [
+    {},
+    {'prefetch': True},
+    {'workers': 3},
+])
+def test_iter_items_walks_every_page(options):
+    session = FakeCollectionSession(total=95, per_page=10)
+    client = VimeoClient(token='token', session=session)
+
+    items = list(client.iter_items(
+        '/me/videos', params={'fields': 'uri'}, per_page=10, **options))
+
+    assert [item['uri'] for item in items] == \
+        ['/videos/%d' % index for index in range(95)]
+    assert sorted(session.requested) == \
+        [(page, 'uri') for page in range(1, 11)]
+
+
+def test_iter_pages_raises_on_failed_page():
+    session = FakeCollectionSession(total=50, per_page=10, missing_page=3)
+    client = VimeoClient(token='token', session=session)
+
+    pages = client.iter_pages('/me/videos', per_page=10)
+    assert next(pages)['page'] == 1
+    assert next(pages)['page'] == 2
+    with pytest.raises(exceptions.PageLoadFailure):
+        next(pages)
@@ -0,0 +1,101 @@
+import sqlite3
+import time
+import pytest
+from vimeo import VimeoClient, exceptions
+from vimeo.ratelimit import (
+    RateLimitGovernor, SQLiteRateLimitGovernor, parse_reset)
+from vimeo.tests.fake_session import FakeResponse, FakeSession
+
+
+def rate_limit_headers(limit, remaining, reset):
+    return {
+        'X-RateLimit-Limit': str(limit),
+        'X-RateLimit-Remaining': str(remaining),
+        'X-RateLimit-Reset': str(reset),
+    }
+
+
+def test_parse_reset():
+    assert parse_reset('2019-12-05T20:10:37+00:00') == 1575576637
+    assert parse_reset('1575576637') == 1575576637
+    assert parse_reset(None) is None
+    assert parse_reset('soon') is None
+
+
+def test_governor_spreads_requests_near_the_limit():
+    governor = RateLimitGovernor(slowdown=0.5)
+    reset = time.time() + 10
+
+    # Plenty of quota left, nothing to wait for.
+    governor.update('a', FakeResponse(
+        200, headers=rate_limit_headers(100, 90, reset)))
+    assert governor.reserve('a') == 0
+
+    # Under half of the quota, the 10 seconds left are split among the 10
+    # remaining requests.
+    governor.update('b', FakeResponse(
+        200, headers=rate_limit_headers(100, 10, reset)))
+    assert governor.reserve('b') == 0
+    assert governor.reserve('b') == pytest.approx(1, abs=0.1)
+
+    # Out of quota, wait for the reset.
+    governor.update('c', FakeResponse(
+        200, headers=rate_limit_headers(100, 0, reset)))
+    assert governor.reserve('c') == pytest.approx(10, abs=0.1)
+
+
+class RateLimitedSession(FakeSession):
+    def __init__(self, limited):
+        super().__init__()
+        self.limited = limited
+
+    def respond(self, method, url, **kwargs):
+        if len(self.sent) <= self.limited:
+            return FakeResponse(
+                429, headers=rate_limit_headers(100, 0, time.time()))
+        return FakeResponse(
+            200, headers=rate_limit_headers(100, 99, time.time() + 60))
+
+
+def test_client_waits_out_429():
+    session = RateLimitedSession(limited=2)
+    governor = RateLimitGovernor()
+    governor.DEFAULT_RETRY_AFTER = 0.01
+    client = VimeoClient(token='token', session=session,
+                         rate_limit_governor=governor)
+
+    assert client.get('/me').status_code == 200
+    assert len(session.sent) == 3
+
+
+def test_client_without_governor_raises_on_429():
+    client = VimeoClient(token='token', session=RateLimitedSession(limited=1))
+
+    with pytest.raises(exceptions.APIRateLimitExceededFailure):
+        client.get('/me')
+
+
+def test_governor_never_stores_the_token(tmp_path):
+    path = str(tmp_path / 'journal.db')
+    client = VimeoClient(token='secret-token', session=RateLimitedSession(0),
+                         rate_limit_governor=SQLiteRateLimitGovernor(path))
+    client.get('/me')
+
+    keys = [row[0] for row in
+            sqlite3.connect(path).execute('SELECT key FROM rate_budget')]
+    assert len(keys) == 1
+    assert 'secret-token' not in keys[0]
+
+
+def test_retry_after_outlasts_a_second_granular_reset():
+    governor = RateLimitGovernor()
+    # A reset header rounded down to a second that is already under way.
+    response = FakeResponse(
+        429, headers=rate_limit_headers(100, 0, int(time.time())))
+
+    waits = [governor.retry_after('a', response, retries)
+             for retries in range(3)]
+
+    assert waits[0] >= governor.DEFAULT_RETRY_AFTER
+    assert waits[0] < waits[1] < waits[2]
+    assert governor.retry_after('a', response, 3) is None
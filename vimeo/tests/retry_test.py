@@ -0,0 +1,73 @@
+import pytest
+import requests
+from vimeo import VimeoClient
+from vimeo.retry import RetryBudget, RetryPolicy
+from vimeo.tests.fake_session import FakeResponse, FakeSession
+
+
+def test_policy_only_retries_unsafe_verbs_when_allowed():
+    policy = RetryPolicy()
+    reset = requests.exceptions.ConnectionError()
+
+    assert policy.is_retryable('get', error=reset)
+    assert not policy.is_retryable('post', error=reset)
+    assert policy.is_retryable('post', error=reset, allow_unsafe=True)
+    assert policy.is_retryable(
+        'post', error=requests.exceptions.ConnectTimeout())
+    assert policy.is_retryable('delete', response=FakeResponse(502))
+    assert not policy.is_retryable('get', response=FakeResponse(404))
+
+
+def test_policy_backs_off_exponentially_with_jitter():
+    policy = RetryPolicy(backoff=1, multiplier=2, max_backoff=5, jitter=False)
+    assert [policy.wait(n) for n in range(4)] == [1, 2, 4, 5]
+    assert policy.wait(0, FakeResponse(503, headers={'Retry-After': '3'})) == 3
+
+    policy = RetryPolicy(backoff=1, multiplier=2)
+    assert all(0 <= policy.wait(2) <= 4 for _ in range(20))
+
+
+def test_budget_caps_retries():
+    budget = RetryBudget(ratio=0.5, minimum=1)
+    assert budget.withdraw()
+    assert not budget.withdraw()
+    budget.deposit()
+    budget.deposit()
+    assert budget.withdraw()
+
+
+def test_client_retries_idempotent_calls(monkeypatch):
+    monkeypatch.setattr('time.sleep', lambda seconds: None)
+    session = FakeSession(
+        failures=2, error=requests.exceptions.ConnectionError())
+    client = VimeoClient(token='token', session=session,
+                         retry_policy=RetryPolicy())
+
+    assert client.get('/me').status_code == 200
+    assert len(session.sent) == 3
+
+    session = FakeSession(failures=1)
+    client = VimeoClient(token='token', session=session,
+                         retry_policy=RetryPolicy())
+    assert client.post('/me/videos').status_code == 503
+    assert client.post('/me/videos', retry=True).status_code == 200
+
+
+def test_client_gives_up_after_max_retries(monkeypatch):
+    monkeypatch.setattr('time.sleep', lambda seconds: None)
+    session = FakeSession(
+        failures=5, error=requests.exceptions.ReadTimeout())
+    client = VimeoClient(token='token', session=session,
+                         retry_policy=RetryPolicy(max_retries=2))
+
+    with pytest.raises(requests.exceptions.ReadTimeout):
+        client.get('/me')
+    assert len(session.sent) == 3
+
+
+def test_client_does_not_retry_without_policy():
+    session = FakeSession(failures=1)
+    client = VimeoClient(token='token', session=session)
+
+    assert client.get('/me').status_code == 503
+    assert len(session.sent) == 1
@@ -0,0 +1,69 @@
+import threading
+import time
+from vimeo import VimeoClient
+from vimeo.auth.token_provider import FileTokenCache, TokenProvider
+
+
+class FakeGrantClient:
+    """Stand in for a client calling the client credentials grant."""
+
+    app_info = ('app', 'secret')
+
+    def __init__(self, expires_in=None, delay=0):
+        self.grants = 0
+        self.expires_in = expires_in
+        self.delay = delay
+
+    def call_grant(self, path, data):
+        time.sleep(self.delay)
+        self.grants += 1
+        resp = {'access_token': 'token-%d' % self.grants,
+                'scope': data.get('scope')}
+        if self.expires_in:
+            resp['expires_in'] = self.expires_in
+        return 200, {}, resp
+
+
+def test_concurrent_callers_share_one_grant():
+    client = FakeGrantClient(delay=0.05)
+    provider = TokenProvider(scope=['public'])
+    tokens = []
+
+    threads = [threading.Thread(target=lambda: tokens.append(
+        provider.get_token(client))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert tokens == ['token-1'] * 8
+    assert client.grants == 1
+
+
+def test_file_cache_is_shared_and_refreshed_ahead(tmp_path):
+    client = FakeGrantClient(expires_in=3600)
+    first = TokenProvider(cache=FileTokenCache(str(tmp_path)))
+    assert first.get_token(client) == 'token-1'
+
+    # A cold provider, like another process, reuses the cached token.
+    second = TokenProvider(cache=FileTokenCache(str(tmp_path)),
+                           refresh_margin=3600)
+    assert second.get_token(client) == 'token-1'
+
+    # The token was within the refresh margin, so it was renewed meanwhile.
+    for _ in range(100):
+        if client.grants == 2:
+            break
+        time.sleep(0.01)
+    assert client.grants == 2
+    assert first.get_token(client) == 'token-2'
+
+
+def test_client_uses_provider_token():
+    provider = TokenProvider()
+    client = VimeoClient(key='app', secret='secret', token_provider=provider)
+    client.call_grant = FakeGrantClient().call_grant
+
+    assert client.token == 'token-1'
+    request = client._token(type('Request', (), {'headers': {}})())
+    assert request.headers['Authorization'] == 'Bearer token-1'
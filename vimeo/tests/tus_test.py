@@ -0,0 +1,243 @@
+import base64
+import hashlib
+import io
+import os
+from vimeo.chunking import AIMDChunkPolicy, ChunkPolicy, MAX_CHUNKS
+from vimeo.readers import BufferPoolChunkReader
+from vimeo.retry import RetryBudget, RetryPolicy
+from vimeo.tests.fake_session import FakeResponse, FakeSession
+from vimeo.tus import TusUploader
+
+
+def tus_response(status_code, offset):
+    return FakeResponse(status_code, headers={'Upload-Offset': str(offset)})
+
+
+class FakeTusSession(FakeSession):
+    """Stand in for a Requests session talking to a tus server."""
+
+    def __init__(self, fail_on=(), fail_heads=()):
+        super().__init__()
+        self.received = bytearray()
+        self.fail_on = set(fail_on)
+        self.fail_heads = set(fail_heads)
+        self.patches = 0
+        self.heads = 0
+
+    def respond(self, method, url, data=None, headers=None, **kwargs):
+        if method == 'HEAD':
+            return self.head_offset()
+        return self.patch_chunk(data, headers)
+
+    def head_offset(self):
+        self.heads += 1
+        if self.heads in self.fail_heads:
+            raise ConnectionError('connection reset')
+        return tus_response(200, len(self.received))
+
+    def patch_chunk(self, data, headers):
+        assert int(headers['Upload-Offset']) == len(self.received)
+        data = data.read()
+        self.patches += 1
+        if self.patches in self.fail_on:
+            # Keep half of the chunk, then fail like a dropped connection.
+            self.received.extend(data[:len(data) // 2])
+            raise ConnectionError('connection reset')
+        self.received.extend(data)
+        return tus_response(204, len(self.received))
+
+
+def upload(payload, session, **kwargs):
+    progress = []
+    uploader = TusUploader(
+        session, io.BytesIO(payload), 'https://tus/1', len(payload), 100,
+        progress=progress.append, retry_delay=0, **kwargs)
+    assert uploader.upload() == len(payload)
+    return progress
+
+
+def test_upload_sends_chunks_in_order():
+    payload = os.urandom(1050)
+    session = FakeTusSession()
+
+    progress = upload(payload, session)
+
+    assert bytes(session.received) == payload
+    assert session.patches == 11
+    assert [p.offset for p in progress][-1] == len(payload)
+    assert progress[-1].sent == len(payload)
+
+
+def test_read_ahead_resumes_from_server_offset():
+    """
+    With several readers, a failed chunk should resume from the offset the
+    server kept, and the chunks read ahead should still line up.
+    """
+    payload = os.urandom(1050)
+    session = FakeTusSession(fail_on={3, 7})
+
+    upload(payload, session, workers=4, max_in_flight=300)
+
+    assert bytes(session.received) == payload
+
+
+def test_requests_carry_the_timeout():
+    payload = os.urandom(250)
+    session = FakeTusSession(fail_on={2})
+
+    upload(payload, session, timeout=(3.05, 30))
+
+    assert {method for method, _, _ in session.sent} == {'HEAD', 'PATCH'}
+    assert all(kwargs['timeout'] == (3.05, 30)
+               for _, _, kwargs in session.sent)
+
+
+def test_shared_retry_budget_refills_with_chunks():
+    """
+    A retry budget shared with the client should be refilled by the chunks
+    sent, and a failed HEAD should use up a retry instead of failing.
+    """
+    payload = os.urandom(2000)
+    session = FakeTusSession(fail_on=range(1, 60, 3), fail_heads={1})
+    policy = RetryPolicy(backoff=0, budget=RetryBudget(ratio=0.5, minimum=2))
+
+    upload(payload, session, retry_policy=policy)
+
+    assert bytes(session.received) == payload
+
+
+def test_chunk_policy_never_exceeds_max_chunks():
+    """
+    Whatever a policy asks for, an upload should never take more than
+    `MAX_CHUNKS` chunks.
+    """
+    class ShrinkingPolicy(ChunkPolicy):
+        def next_chunk_size(self, chunk_size, elapsed, succeeded):
+            return 1
+
+    payload = os.urandom(5000)
+    session = FakeTusSession()
+
+    upload(payload, session, chunk_policy=ShrinkingPolicy())
+
+    assert bytes(session.received) == payload
+    assert session.patches <= MAX_CHUNKS
+
+
+def test_aimd_policy():
+    policy = AIMDChunkPolicy(minimum=10, maximum=1000, target_duration=1,
+                             increase=100, decrease=0.5)
+
+    assert policy.first_chunk_size(5000, 10 ** 6) == 1000
+    assert policy.next_chunk_size(400, 0.5, True) == 500
+    assert policy.next_chunk_size(400, 1.5, True) == 400
+    assert policy.next_chunk_size(400, 3, True) == 200
+    assert policy.next_chunk_size(400, 0.5, False) == 200
+    assert policy.next_chunk_size(15, 0.5, False) == 10
+
+
+def test_file_readers_resume_from_server_offset(tmp_path):
+    """Memory mapped and pooled reads should send the same bytes as a copy."""
+    payload = os.urandom(1050)
+    path = tmp_path / 'video.mp4'
+    path.write_bytes(payload)
+
+    for reader in ('mmap', 'pool'):
+        session = FakeTusSession(fail_on={3, 7})
+        with open(str(path), 'rb') as stream:
+            uploader = TusUploader(
+                session, stream, 'https://tus/1', len(payload), 100,
+                workers=3, retry_delay=0, reader=reader)
+            assert uploader.upload() == len(payload)
+        assert bytes(session.received) == payload
+
+
+def test_buffer_pool_reuses_buffers(tmp_path):
+    path = tmp_path / 'video.mp4'
+    path.write_bytes(os.urandom(300))
+
+    with open(str(path), 'rb') as stream:
+        reader = BufferPoolChunkReader(stream)
+        first = reader.read(0, 100)
+        buffer = first.obj
+        reader.release(first)
+        second = reader.read(100, 100)
+
+        assert second.obj is buffer
+        assert bytes(second) == path.read_bytes()[100:200]
+
+
+def test_buffer_pool_reuses_buffers_as_chunks_grow(tmp_path):
+    """Growing chunks should not each get a freshly allocated buffer."""
+    payload = os.urandom(512 * 1024)
+    path = tmp_path / 'video.mp4'
+    path.write_bytes(payload)
+
+    buffers = set()
+    with open(str(path), 'rb') as stream:
+        reader = BufferPoolChunkReader(stream)
+        offset, length = 0, 1000
+        while offset < len(payload):
+            chunk = reader.read(offset, length)
+            buffers.add(id(chunk.obj))
+            assert bytes(chunk) == payload[offset:offset + length]
+            offset += len(chunk)
+            length += 1000
+            reader.release(chunk)
+
+    # A buffer for each power of two from 64 KiB to 256 KiB.
+    assert len(buffers) <= 3
+
+
+class ChecksumTusSession(FakeTusSession):
+    """Refuse a chunk when its `Upload-Checksum` does not match."""
+
+    def __init__(self, corrupt_on=()):
+        super().__init__()
+        self.corrupt_on = set(corrupt_on)
+
+    def patch_chunk(self, data, headers):
+        data = bytes(data.read())
+        self.patches += 1
+        if self.patches in self.corrupt_on:
+            data = data[:-1] + bytes([data[-1] ^ 1])
+
+        algorithm, expected = headers['Upload-Checksum'].split(' ')
+        digest = base64.b64encode(hashlib.new(algorithm, data).digest())
+        if digest.decode('ascii') != expected:
+            return tus_response(460, len(self.received))
+        self.received.extend(data)
+        return tus_response(204, len(self.received))
+
+
+def test_checksums_are_computed_from_sent_chunks():
+    payload = os.urandom(1050)
+
+    session = FakeTusSession(fail_on={2, 5})
+    uploader = TusUploader(
+        session, io.BytesIO(payload), 'https://tus/1', len(payload), 100,
+        retry_delay=0, checksums=['sha256', 'md5'])
+    uploader.upload()
+    assert uploader.hexdigests() == {
+        'sha256': hashlib.sha256(payload).hexdigest(),
+        'md5': hashlib.md5(payload).hexdigest(),
+    }
+
+    # A resumed upload hashes what was already sent from the file.
+    session = FakeTusSession()
+    session.received.extend(payload[:420])
+    uploader = TusUploader(
+        session, io.BytesIO(payload), 'https://tus/1', len(payload), 100,
+        offset=420, checksums=['sha256'])
+    uploader.upload()
+    assert uploader.hexdigests()['sha256'] == hashlib.sha256(payload).hexdigest()
+
+
+def test_corrupted_chunk_is_sent_again():
+    payload = os.urandom(1050)
+    session = ChecksumTusSession(corrupt_on={4})
+
+    upload(payload, session, checksum_algorithm='sha1')
+
+    assert bytes(session.received) == payload
+    assert session.patches == 12
@@ -0,0 +1,70 @@
+import os
+import pathlib
+import pytest
+import requests
+from vimeo import VimeoClient, exceptions
+from vimeo.tests.fake_session import FakeResponse, FakeSession
+from vimeo.upload_state import (
+    JSONFileUploadStateStore, SQLiteUploadStateStore, file_key)
+
+
+class FakeVimeoSession(FakeSession):
+    """Answer the upload attempt and tus calls without any network."""
+
+    def __init__(self):
+        super().__init__()
+        self.received = bytearray()
+        self.attempts = 0
+        self.fail_patches = False
+
+    def respond(self, method, url, **kwargs):
+        if method == 'POST':
+            self.attempts += 1
+            return FakeResponse(200, {
+                'uri': '/videos/1',
+                'upload': {'upload_link': 'https://tus/1'}
+            })
+        if method == 'HEAD':
+            return FakeResponse(200, headers={
+                'Upload-Offset': str(len(self.received))
+            })
+        if self.fail_patches and self.received:
+            raise requests.exceptions.ConnectionError('connection reset')
+        self.received.extend(kwargs['data'].read())
+        return FakeResponse(204, headers={
+            'Upload-Offset': str(len(self.received))
+        })
+
+
+@pytest.mark.parametrize('store_class', [
+    JSONFileUploadStateStore,
+    SQLiteUploadStateStore,
+])
+@pytest.mark.parametrize('path_type', [str, pathlib.Path])
+def test_interrupted_upload_resumes(tmp_path, store_class, path_type):
+    """
+    A second upload of the same file should continue the attempt of the first
+    one from the offset kept by the server, without creating a new attempt.
+    The file may be given as a string or a `pathlib.Path`.
+    """
+    filename = path_type(tmp_path / 'video.mp4')
+    payload = os.urandom(4096)
+    with open(filename, 'wb') as f:
+        f.write(payload)
+
+    store = store_class(str(tmp_path / 'state'))
+    session = FakeVimeoSession()
+    client = VimeoClient(token='token', session=session,
+                         upload_state_store=store)
+
+    session.fail_patches = True
+    with pytest.raises(exceptions.VideoUploadFailure):
+        client.upload(filename, data={'chunk_size': 1024}, retries=0)
+    assert len(session.received) == 1024
+
+    session.fail_patches = False
+    assert client.upload(filename, data={'chunk_size': 1024}) == '/videos/1'
+
+    assert session.attempts == 1
+    assert bytes(session.received) == payload
+    assert store.get('upload:' + file_key(filename)) is None
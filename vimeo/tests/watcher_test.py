@@ -0,0 +1,72 @@
+import asyncio
+import threading
+import time
+from vimeo import VimeoClient
+from vimeo.tests.fake_api import FakeVimeoAPI
+from vimeo.watcher import TranscodeWatcher
+
+
+def make_watcher(api, **kwargs):
+    client = VimeoClient(token='token')
+    client.API_ROOT = api.url
+    return TranscodeWatcher(client, interval=0.01, max_interval=0.05,
+                            max_misses=2, **kwargs)
+
+
+def test_videos_are_polled_in_batches_until_done():
+    with FakeVimeoAPI(videos=10) as api:
+        api.transcoding[2] = ('transcoding', 'in_progress')
+        api.transcoding[3] = ('transcoding_error', 'error')
+        watcher = make_watcher(api, batch_size=2)
+        seen = []
+        futures = [watcher.watch('/videos/%d' % video_id, seen.append)
+                   for video_id in (1, 2, 3, 99)]
+
+        timer = threading.Timer(0.1, api.transcoding.pop, args=(2,))
+        timer.start()
+        watcher.run(timeout=5)
+        timer.join()
+
+        statuses = [future.result()['status'] for future in futures]
+        assert statuses == ['available', 'available', 'transcoding_error',
+                            'not_found']
+        assert sorted(video['uri'] for video in seen) == \
+            ['/videos/1', '/videos/2', '/videos/3', '/videos/99']
+        # Four videos, two per request, the first round takes two requests.
+        polls = [path for method, path in api.requests if path == '/videos']
+        assert len(polls) < 2 * 4
+
+
+def test_async_iteration_yields_finished_videos():
+    async def collect(watcher):
+        uris = []
+        async for video in watcher:
+            uris.append(video['uri'])
+        return uris
+
+    with FakeVimeoAPI(videos=10) as api:
+        watcher = make_watcher(api)
+        watcher.watch('/videos/4')
+        watcher.watch('/videos/5')
+        loop = asyncio.new_event_loop()
+        try:
+            uris = loop.run_until_complete(collect(watcher))
+        finally:
+            loop.close()
+
+    assert sorted(uris) == ['/videos/4', '/videos/5']
+
+
+def test_rate_limited_polls_wait_for_the_reset():
+    with FakeVimeoAPI(videos=10, rate_limit=1, rate_limit_window=0.5) as api:
+        watcher = make_watcher(api, batch_size=1, min_remaining=0)
+        watcher.max_interval = 30
+        watcher.watch('/videos/1')
+        watcher.watch('/videos/2')
+
+        started = time.monotonic()
+        watcher.run(timeout=10)
+
+        assert watcher.pending == 0
+        # Paused until `X-RateLimit-Reset`, not for `max_interval`.
+        assert time.monotonic() - started < 5
@@ -0,0 +1,109 @@
+import os
+import requests
+from vimeo import VimeoClient
+from vimeo.bandwidth import SharedBandwidthLimiter
+from vimeo.ratelimit import SQLiteRateLimitGovernor
+from vimeo.tests.fake_api import FakeVimeoAPI
+from vimeo.tests.fake_session import FakeResponse
+from vimeo.workers import UploadJournal, UploadWorkerPool, _work
+
+
+class FakeAPIClient(VimeoClient):
+    """Client pointed at the fake API given in its options."""
+
+    def __init__(self, api_root, **kwargs):
+        super().__init__(**kwargs)
+        self.API_ROOT = api_root
+
+
+class FlakyClient(VimeoClient):
+    """Client whose first upload drops the connection."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.uploads = 0
+
+    def upload(self, filename, **kwargs):
+        self.uploads += 1
+        if self.uploads == 1:
+            raise requests.exceptions.ConnectionError('connection reset')
+        return '/videos/1'
+
+
+def test_worker_processes_drain_the_journal(tmp_path):
+    directory = str(tmp_path)
+    journal_path = os.path.join(directory, 'journal.db')
+    journal = UploadJournal(journal_path)
+    payloads = []
+    for index in range(6):
+        filename = os.path.join(directory, '%d.mp4' % index)
+        payloads.append(os.urandom(20000 + index))
+        with open(filename, 'wb') as f:
+            f.write(payloads[-1])
+        journal.add(filename, data={'name': str(index)})
+    journal.add(os.path.join(directory, 'missing.mp4'))
+
+    with FakeVimeoAPI(keep_data=True) as api:
+        pool = UploadWorkerPool(
+            journal_path, {'token': 'token', 'api_root': api.url},
+            processes=2, threads=2, retries=1, bandwidth=10 * 1024 * 1024,
+            client_class=FakeAPIClient)
+        jobs = pool.run()
+
+        assert [job.ok for job in jobs] == [True] * 6 + [False]
+        assert jobs[-1].attempts == 1
+        uploaded = sorted(bytes(upload['data'])
+                          for upload in api.uploads.values())
+        assert uploaded == sorted(payloads)
+    assert journal.counts() == {'done': 6, 'failed': 1}
+    journal.close()
+
+
+def test_rate_budget_and_bandwidth_are_shared(tmp_path):
+    path = str(tmp_path / 'budget.db')
+    response = FakeResponse(headers={
+        'X-RateLimit-Limit': '100',
+        'X-RateLimit-Remaining': '0',
+        'X-RateLimit-Reset': '4102444800',
+    })
+    SQLiteRateLimitGovernor(path).update('token', response)
+    # Another governor, like one in another process, sees the empty budget.
+    assert SQLiteRateLimitGovernor(path, max_wait=5).reserve('token') == 5
+
+    limiter = SharedBandwidthLimiter(1000, burst=1000)
+    limiter.consume(1000)
+    assert limiter._state[0] <= 1
+
+
+def test_connection_errors_are_retried(tmp_path):
+    journal_path = str(tmp_path / 'journal.db')
+    journal = UploadJournal(journal_path)
+    journal.add(__file__)
+
+    _work(journal_path, FlakyClient, {'token': 'token'}, 1, 1, None, {},
+          retry_delay=0.1)
+
+    job, = journal.jobs()
+    assert job.ok
+    assert job.attempts == 2
+    journal.close()
+
+
+def test_failed_jobs_back_off_and_live_jobs_keep_their_lease(tmp_path):
+    journal = UploadJournal(str(tmp_path / 'journal.db'))
+    journal.add('video.mp4')
+
+    job = journal.claim(1)
+    journal.fail(job.id, OSError('disk hiccup'), retry=True, delay=60)
+    assert journal.claim(2) is None
+    assert 59 < journal.next_due() <= 60
+
+    journal.fail(job.id, OSError('disk hiccup'), retry=True)
+    job = journal.claim(2)
+    # Another pool starting up leaves a job that is still running alone,
+    # until its worker stops sending heartbeats.
+    journal.requeue_running(stale_after=60)
+    assert journal.get(job.id).state == 'running'
+    journal.requeue_running(stale_after=0)
+    assert journal.get(job.id).state == 'pending'
+    journal.close()
@@ -0,0 +1,494 @@
+#! /usr/bin/env python
+# encoding: utf-8
+"""Drivers for the tus resumable upload protocol.
+
+https://tus.io/protocols/resumable-upload.html
+"""
+
+import asyncio
+import base64
+import collections
+import hashlib
+import time
+from concurrent.futures import ThreadPoolExecutor
+from . import exceptions
+from .chunking import MAX_CHUNKS, FixedChunkPolicy, min_chunk_size
+from .readers import open_chunk_reader
+from .retry import RetryPolicy
+
+
+TUS_VERSION = '1.0.0'
+
+
+class BaseTusUploader:
+    """Hold the upload state shared by the tus drivers.
+
+    Vimeo hands out an `upload_link` that already points at a created tus
+    upload, so the drivers only ever HEAD and PATCH that link.
+    """
+
+    DEFAULT_HEADERS = {'Tus-Resumable': TUS_VERSION}
+    SUCCESS_STATUS = 204
+
+    def __init__(self, url, size, chunk_size, offset=0, retries=3,
+                 retry_delay=1, chunk_policy=None, checksums=(),
+                 checksum_algorithm=None, retry_policy=None, on_retry=None,
+                 progress=None, limiter=None):
+        """Prep the uploader.
+
+        Args:
+            url (string): The tus `upload_link` of the upload attempt.
+            size (int): Total size of the upload, in bytes.
+            chunk_size (int): Size of each PATCH body, in bytes.
+            offset (int): Offset to start sending from.
+            retries (int): How many times a failed chunk is retried.
+            retry_delay (int): Seconds to wait before retrying a chunk.
+            chunk_policy (ChunkPolicy): Decides the size of each chunk from
+                how the previous ones went, see `vimeo.chunking`.
+            checksums (list): Names of the `hashlib` digests of the whole
+                upload to compute from the chunks as they are confirmed.
+            checksum_algorithm (string): Algorithm of the `Upload-Checksum`
+                header sent with each chunk, like `sha1` or `md5`. A chunk the
+                server finds corrupted is refused with a 460 and sent again.
+            retry_policy (RetryPolicy): Paces the retries of failed chunks
+                instead of `retries` and `retry_delay`, see `vimeo.retry`.
+            on_retry (callable): Called with the reason and the seconds to
+                wait before a failed chunk is sent again.
+            progress (callable): Called with an `UploadProgress` after each
+                chunk is confirmed by the server.
+            limiter (BandwidthLimiter): Paces the bytes sent, see
+                `vimeo.bandwidth`.
+        """
+        self.url = url
+        self.size = size
+        self.offset = offset
+        self.retries = retries
+        self.retry_delay = retry_delay
+        if retry_policy is None:
+            retry_policy = RetryPolicy(
+                max_retries=retries, backoff=retry_delay, multiplier=1,
+                jitter=False, budget=False)
+        self.retry_policy = retry_policy
+        self.on_retry = on_retry
+        self.chunk_policy = chunk_policy or FixedChunkPolicy()
+        self.chunk_size = self.chunk_policy.first_chunk_size(chunk_size, size)
+        self.chunks = 0
+        self.checksums = collections.OrderedDict(
+            (name, hashlib.new(name)) for name in checksums or ())
+        self.checksum_algorithm = checksum_algorithm
+        self.progress = progress
+        self.limiter = limiter
+        self._started = time.monotonic()
+        self._sent = 0
+
+    def retry_wait(self, error, retried):
+        """Get the seconds to wait before retrying a chunk, and report it."""
+        wait = self.retry_policy.wait(retried)
+        if self.on_retry is not None:
+            if isinstance(error, exceptions.BaseVimeoException):
+                reason = str(error.status_code)
+            else:
+                reason = type(error).__name__
+            self.on_retry(reason, wait)
+        return wait
+
+    def get_headers(self):
+        """Get the headers sent along with every tus request."""
+        return dict(self.DEFAULT_HEADERS)
+
+    def get_patch_headers(self, offset, chunk=None):
+        """Get the headers for a PATCH of `chunk` starting at `offset`."""
+        headers = self.get_headers()
+        headers['Upload-Offset'] = str(offset)
+        headers['Content-Type'] = 'application/offset+octet-stream'
+        if self.checksum_algorithm is not None and chunk is not None:
+            digest = hashlib.new(self.checksum_algorithm, chunk).digest()
+            headers['Upload-Checksum'] = '{} {}'.format(
+                self.checksum_algorithm,
+                base64.b64encode(digest).decode('ascii')
+            )
+        return headers
+
+    def get_request_length(self, offset):
+        """Get the length of the chunk starting at `offset`.
+
+        Chunks never get so small that the upload would need more than
+        `MAX_CHUNKS` of them.
+        """
+        remaining = self.size - offset
+        floor = min_chunk_size(remaining, MAX_CHUNKS - self.chunks)
+        return min(remaining, max(self.chunk_size, floor))
+
+    def next_request_length(self, offset):
+        """Get the length of the chunk starting at `offset` and count it."""
+        self.chunks += 1
+        return self.get_request_length(offset)
+
+    def record_chunk(self, elapsed, succeeded):
+        """Let the chunk policy size the next chunk."""
+        self.chunk_size = self.chunk_policy.next_chunk_size(
+            self.chunk_size, elapsed, succeeded)
+
+    def confirm(self, chunk, offset):
+        """Feed the checksums the bytes of `chunk` the server now holds.
+
+        Args:
+            chunk (bytes): The chunk sent from the current offset.
+            offset (int): The offset the server reported after it.
+        """
+        if offset > self.offset:
+            confirmed = chunk[:offset - self.offset]
+            for digest in self.checksums.values():
+                digest.update(confirmed)
+
+    def advance(self, offset):
+        """Record the offset confirmed by the server and report progress."""
+        self._sent += offset - self.offset
+        self.offset = offset
+        if self.progress is not None:
+            self.progress(UploadProgress(
+                offset,
+                self.size,
+                self._sent,
+                time.monotonic() - self._started
+            ))
+
+    def hexdigests(self):
+        """Get the checksums of the bytes confirmed so far, by name."""
+        return {name: digest.hexdigest()
+                for name, digest in self.checksums.items()}
+
+    @staticmethod
+    def parse_offset(response):
+        """Read the server offset from a HEAD or PATCH response.
+
+        Raises:
+            VideoUploadFailure: If the response does not carry an offset.
+        """
+        offset = response.headers.get('Upload-Offset')
+        if offset is None:
+            raise exceptions.VideoUploadFailure(
+                response,
+                'The tus server did not report an upload offset.'
+            )
+        return int(offset)
+
+
+class ChunkBody:
+    """File-like view over a chunk, handed to Requests as the PATCH body.
+
+    Requests sends it in small blocks, which lets a `BandwidthLimiter` pace
+    the upload as it goes instead of a whole chunk at a time.
+    """
+
+    def __init__(self, chunk, limiter=None):
+        self.chunk = chunk
+        self.limiter = limiter
+        self.position = 0
+
+    def __len__(self):
+        return len(self.chunk) - self.position
+
+    def read(self, size=-1):
+        if size is None or size < 0:
+            size = len(self)
+        block = self.chunk[self.position:self.position + size]
+        self.position += len(block)
+        if block and self.limiter is not None:
+            self.limiter.consume(len(block))
+        return block
+
+
+class UploadProgress(collections.namedtuple(
+        'UploadProgress', ['offset', 'size', 'sent', 'elapsed'])):
+    """Snapshot of a running upload handed to progress callbacks.
+
+    `offset` is the offset confirmed by the server, `sent` the bytes sent
+    since the upload (re)started and `elapsed` the seconds since then.
+    """
+
+    __slots__ = ()
+
+    @property
+    def bytes_per_second(self):
+        """Get the aggregate throughput of the upload so far."""
+        return self.sent / self.elapsed if self.elapsed > 0 else 0.0
+
+
+class TusUploader(BaseTusUploader):
+    """Upload a file through tus over a pooled Requests session.
+
+    The tus core protocol only accepts a PATCH at the current offset of an
+    upload, so chunks are always sent in order. With `workers` above one, a
+    pool of readers fetches the following chunks while the current one is on
+    the wire so the connection never waits on the disk. `max_in_flight` caps
+    the bytes held by read ahead and sent chunks together.
+
+    Chunks come from a `ChunkReader`, by default slices of a memory map of
+    the file, so no chunk is copied before it reaches the socket.
+    """
+
+    def __init__(self, session, stream, url, size, chunk_size, workers=1,
+                 max_in_flight=None, reader=None, timeout=None, **kwargs):
+        """Prep the uploader.
+
+        Args:
+            session (requests.Session): Session the requests are sent with.
+            stream (file): Binary file object to upload.
+            workers (int): Number of chunks read concurrently. Chunks of a
+                memory map are faulted in by these workers.
+            max_in_flight (int): Maximum bytes buffered at once. Defaults to
+                `workers` chunks.
+            reader (string): How chunks are read, `mmap`, `pool` or
+                `stream`. See `vimeo.readers.open_chunk_reader`.
+            timeout: Timeout of each tus request, in seconds, or a (connect,
+                read) tuple.
+            **kwargs: See `BaseTusUploader`.
+        """
+        super().__init__(url, size, chunk_size, **kwargs)
+        self.session = session
+        self.stream = stream
+        self.workers = max(1, workers)
+        self.max_in_flight = max_in_flight or self.workers * self.chunk_size
+        self.reader = reader
+        self.timeout = timeout
+
+    def get_offset(self):
+        """Ask the tus server how many bytes it has received."""
+        response = self.session.head(
+            self.url, headers=self.get_headers(), timeout=self.timeout)
+        return self.parse_offset(response)
+
+    def upload(self):
+        """Send the stream from the current offset until it is complete.
+
+        Returns:
+            int: The final offset of the upload.
+        """
+        self._started = time.monotonic()
+        self._sent = 0
+        self._reader = open_chunk_reader(self.stream, self.reader)
+        try:
+            if self.checksums and self.offset:
+                self.__hash_prefix()
+            if self.workers == 1:
+                while self.offset < self.size:
+                    length = self.next_request_length(self.offset)
+                    self.__send(self.read(self.offset, length))
+                return self.offset
+
+            with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                while self.offset < self.size:
+                    self.__upload_window(pool)
+            return self.offset
+        finally:
+            self._reader.close()
+
+    def __upload_window(self, pool):
+        """Send chunks in order while reading the following ones ahead.
+
+        Returns when the upload completes or when the server offset no longer
+        lines up with the chunks read ahead, after a partial retry.
+        """
+        pending = collections.deque()
+        next_offset = self.offset
+        try:
+            while True:
+                while next_offset < self.size and (
+                        not pending
+                        or next_offset - self.offset + self.chunk_size
+                        <= self.max_in_flight):
+                    length = self.next_request_length(next_offset)
+                    pending.append(
+                        (next_offset, pool.submit(self.read, next_offset, length))
+                    )
+                    next_offset += length
+
+                if not pending:
+                    return
+
+                start, future = pending.popleft()
+                if start != self.offset:
+                    return
+                self.__send(future.result())
+        finally:
+            for _, future in pending:
+                if not future.cancel() and future.exception() is None:
+                    self._reader.release(future.result())
+
+    def read(self, offset, length):
+        """Read `length` bytes of the stream starting at `offset`."""
+        return self._reader.read(offset, length)
+
+    def __hash_prefix(self):
+        """Feed the checksums the bytes sent before the upload resumed."""
+        position = 0
+        while position < self.offset:
+            chunk = self.read(
+                position, min(self.chunk_size, self.offset - position))
+            try:
+                if not len(chunk):
+                    return
+                for digest in self.checksums.values():
+                    digest.update(chunk)
+                position += len(chunk)
+            finally:
+                self._reader.release(chunk)
+
+    def __send(self, chunk):
+        """Upload a chunk, then hand its buffer back to the reader."""
+        try:
+            return self.upload_chunk(chunk)
+        finally:
+            self._reader.release(chunk)
+
+    def upload_chunk(self, chunk):
+        """Send a single chunk from the current offset, retrying on failure.
+
+        Returns:
+            int: The offset the server reported after the chunk.
+        """
+        retried = 0
+        while True:
+            started = time.monotonic()
+            try:
+                if retried:
+                    # Pick up from whatever the server kept of the chunk, and
+                    # only send as much of the rest as the policy now allows.
+                    offset = self.get_offset()
+                    self.confirm(chunk, offset)
+                    chunk = chunk[offset - self.offset:]
+                    chunk = chunk[:self.get_request_length(offset)]
+                    self.advance(offset)
+                    if not chunk:
+                        return offset
+
+                self.retry_policy.record_request()
+                response = self.session.patch(
+                    self.url,
+                    data=ChunkBody(chunk, self.limiter),
+                    headers=self.get_patch_headers(self.offset, chunk),
+                    timeout=self.timeout
+                )
+                if response.status_code != self.SUCCESS_STATUS:
+                    raise exceptions.VideoUploadFailure(
+                        response,
+                        'The tus server refused the chunk.'
+                    )
+                self.record_chunk(time.monotonic() - started, True)
+                offset = self.parse_offset(response)
+                self.confirm(chunk, offset)
+                self.advance(offset)
+                return self.offset
+            except Exception as e:
+                self.record_chunk(time.monotonic() - started, False)
+                if not self.retry_policy.can_retry(retried):
+                    raise
+                time.sleep(self.retry_wait(e, retried))
+                retried += 1
+
+
+class AsyncTusUploader(BaseTusUploader):
+    """Upload a stream through tus on an asyncio event loop.
+
+    Requests go through `send`, a coroutine function taking the method, url
+    and keyword arguments of the request, so they share the connection pool
+    and the concurrency limit of the client that owns them.
+    """
+
+    def __init__(self, send, stream, url, size, chunk_size, timeout=None,
+                 **kwargs):
+        super().__init__(url, size, chunk_size, **kwargs)
+        self.send = send
+        self.stream = stream
+        self.timeout = timeout
+
+    async def get_offset(self):
+        """Ask the tus server how many bytes it has received."""
+        response = await self.send(
+            'head', self.url, headers=self.get_headers(), timeout=self.timeout)
+        return self.parse_offset(response)
+
+    async def upload(self):
+        """Send the stream from the current offset until it is complete.
+
+        Returns:
+            int: The final offset of the upload.
+        """
+        self._started = time.monotonic()
+        self._sent = 0
+        if self.checksums and self.offset:
+            await self.__hash_prefix()
+        while self.offset < self.size:
+            length = self.next_request_length(self.offset)
+            await self.upload_chunk(await self.read(self.offset, length))
+        return self.offset
+
+    async def read(self, offset, length):
+        """Read `length` bytes of the stream starting at `offset`."""
+        def read():
+            self.stream.seek(offset)
+            return self.stream.read(length)
+        return await asyncio.get_event_loop().run_in_executor(None, read)
+
+    async def __hash_prefix(self):
+        """Feed the checksums the bytes sent before the upload resumed."""
+        position = 0
+        while position < self.offset:
+            chunk = await self.read(
+                position, min(self.chunk_size, self.offset - position))
+            if not chunk:
+                return
+            for digest in self.checksums.values():
+                digest.update(chunk)
+            position += len(chunk)
+
+    async def upload_chunk(self, chunk):
+        """Send a single chunk from the current offset, retrying on failure.
+
+        Returns:
+            int: The offset the server reported after the chunk.
+        """
+        retried = 0
+        while True:
+            started = time.monotonic()
+            try:
+                if retried:
+                    # Pick up from whatever the server kept of the chunk, and
+                    # only send as much of the rest as the policy now allows.
+                    offset = await self.get_offset()
+                    self.confirm(chunk, offset)
+                    chunk = chunk[offset - self.offset:]
+                    chunk = chunk[:self.get_request_length(offset)]
+                    self.advance(offset)
+                    if not chunk:
+                        return offset
+
+                if self.limiter is not None:
+                    # The limiter blocks, pace the whole chunk off the loop.
+                    await asyncio.get_event_loop().run_in_executor(
+                        None, self.limiter.consume, len(chunk))
+                self.retry_policy.record_request()
+                response = await self.send(
+                    'patch',
+                    self.url,
+                    data=chunk,
+                    headers=self.get_patch_headers(self.offset, chunk),
+                    timeout=self.timeout
+                )
+                if response.status_code != self.SUCCESS_STATUS:
+                    raise exceptions.VideoUploadFailure(
+                        response,
+                        'The tus server refused the chunk.'
+                    )
+                self.record_chunk(time.monotonic() - started, True)
+                offset = self.parse_offset(response)
+                self.confirm(chunk, offset)
+                self.advance(offset)
+                return self.offset
+            except Exception as e:
+                self.record_chunk(time.monotonic() - started, False)
+                if not self.retry_policy.can_retry(retried):
+                    raise
+                await asyncio.sleep(self.retry_wait(e, retried))
+                retried += 1
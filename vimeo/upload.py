@@ -1,161 +1,212 @@
 #! /usr/bin/env python
 # encoding: utf-8
 
+import collections
 import io
 import os
-import requests.exceptions
+from functools import partial
 from . import exceptions
-from tusclient import client
+from .bandwidth import upload_limiter
+from .chunking import MAX_CHUNKS
 
 
-class UploadVideoMixin:
-    """Handle uploading a new video to the Vimeo API."""
+class UploadPlan(collections.namedtuple(
+        'UploadPlan', ['endpoint', 'data', 'fields', 'status', 'video_uri',
+                       'chunk_size', 'state_store', 'state_key'])):
+    """How to create the upload attempt of a source and where to record it.
+
+    `video_uri` is set when replacing the source of a video, whose attempt
+    doesn't come back with its `uri`.
+    """
+
+    __slots__ = ()
+
+
+class BaseUploadVideoMixin:
+    """Prepare video uploads for the blocking and the asyncio mixins.
+
+    Everything but the requests themselves lives here, so both mixins
+    accept the same options and handle them the same way.
+    """
 
     UPLOAD_ENDPOINT = '/me/videos'
     VERSIONS_ENDPOINT = '{video_uri}/versions'
     DEFAULT_CHUNK_SIZE = (200 * 1024 * 1024)  # 200 MB
 
-    def upload(self, filename, **kwargs):
-        """Upload a file.
-
-        This should be used to upload a local file. If you want a form for your
-        site to upload direct to Vimeo, you should look at the `POST
-        /me/videos` endpoint.
+    # Store used to resume interrupted uploads, see `vimeo.upload_state`.
+    upload_state_store = None
+    # Receives upload progress events, see `vimeo.instrumentation`.
+    instrumentation = None
+    # Paces the retries of failed chunks, see `vimeo.retry`.
+    retry_policy = None
+    # Timeout of the tus requests.
+    timeout = None
 
-        https://developer.vimeo.com/api/endpoints/videos#POST/users/{user_id}/videos
+    def _plan_upload(self, filename, source, kwargs, video_uri=None):
+        """Work out the attempt to create for `source`.
 
         Args:
-            filename (string): Path on disk to file
-            **kwargs: Supply a `data` dictionary for data to set to your video
-                when uploading. See the API documentation for parameters you
-                can send. This is optional.
+            filename: The source as handed to `upload` or `replace`.
+            source (UploadSource): The opened source.
+            kwargs (dict): Keyword arguments of the call, `data` and
+                `state_store` are taken out.
+            video_uri (string): Video whose source is replaced.
 
         Returns:
-            string: The Vimeo Video URI of your uploaded video.
-
-        Raises:
-            UploadAttemptCreationFailure: If we were unable to create an upload
-                attempt for you.
-            VideoUploadFailure: If unknown errors occured when uploading your
-                video.
+            UploadPlan: The plan of the upload.
         """
-
-        filesize = self.__get_file_size(filename)
-        uri = self.UPLOAD_ENDPOINT
-        data = kwargs['data'] if 'data' in kwargs else {}
+        data = kwargs.pop('data', {})
+        if video_uri is None:
+            endpoint, fields, status = self.UPLOAD_ENDPOINT, 'uri,upload', 200
+            prefix = 'upload'
+        else:
+            endpoint = self.VERSIONS_ENDPOINT.format(video_uri=video_uri)
+            fields, status = 'upload', 201
+            prefix = 'replace:' + video_uri
+            if source.name is not None:
+                data['file_name'] = source.name
 
         # Is a `chunk_size` specified? Use default value if not.
         proposed_or_default_chunk_size = data.get('chunk_size', self.DEFAULT_CHUNK_SIZE)
         # For efficiency, lets ensure the pending chunk_size does not result in too many cycles
-        chunk_size = self.apply_chunk_size_rules(proposed_or_default_chunk_size, filesize)
+        chunk_size = self.apply_chunk_size_rules(proposed_or_default_chunk_size, source.size)
 
         # Ignore any specified upload approach and size.
         if 'upload' not in data:
             data['upload'] = {
                 'approach': 'tus',
-                'size': filesize
+                'size': source.size
             }
         else:
             data['upload']['approach'] = 'tus'
-            data['upload']['size'] = filesize
-
-        attempt = self.post(uri, data=data, params={'fields': 'uri,upload'})
-        if attempt.status_code != 200:
-            raise exceptions.UploadAttemptCreationFailure(
-                attempt,
-                "Unable to initiate an upload attempt."
-            )
+            data['upload']['size'] = source.size
 
-        attempt = attempt.json()
+        state_store = kwargs.pop('state_store', None) or self.upload_state_store
+        state_key = None
+        if state_store is None or not isinstance(
+                filename, (str, getattr(os, 'PathLike', str))):
+            state_store = None
+        else:
+            from .upload_state import file_key
 
-        return self.__perform_tus_upload(filename, attempt, chunk_size=chunk_size)
+            state_key = prefix + ':' + file_key(filename)
 
-    def replace(self, video_uri, filename, **kwargs):
-        """Replace the source of a single Vimeo video.
-
-        https://developer.vimeo.com/api/endpoints/videos#POST/videos/{video_id}/versions
+        return UploadPlan(endpoint, data, fields, status, video_uri,
+                          chunk_size, state_store, state_key)
 
-        Args:
-            video_uri (string): Vimeo Video URI
-            filename (string): Path on disk to file
-            **kwargs: Supply a `data` dictionary for data to set to your video
-                when uploading. See the API documentation for parameters you
-                can send. This is optional.
+    @staticmethod
+    def _read_attempt(plan, response):
+        """Get the upload attempt out of the response creating it.
 
-        Returns:
-            string: The Vimeo Video URI of your replaced video.
+        Raises:
+            UploadAttemptCreationFailure: If the attempt was not created.
         """
-        filesize = self.__get_file_size(filename)
-        uri = self.VERSIONS_ENDPOINT.format(video_uri=video_uri)
-
-        data = kwargs['data'] if 'data' in kwargs else {}
-        data['file_name'] = os.path.basename(filename)
-
-        # Is a `chunk_size` specified? Use default value if not.
-        proposed_or_default_chunk_size = data.get('chunk_size', self.DEFAULT_CHUNK_SIZE)
-        # For efficiency, lets ensure the pending chunk_size does not result in too many cycles
-        chunk_size = self.apply_chunk_size_rules(proposed_or_default_chunk_size, filesize)
-
-        # Ignore any specified upload approach and size.
-        if 'upload' not in data:
-            data['upload'] = {
-                'approach': 'tus',
-                'size': filesize
-            }
-        else:
-            data['upload']['approach'] = 'tus'
-            data['upload']['size'] = filesize
-
-        attempt = self.post(uri, data=data, params={'fields': 'upload'})
-        if attempt.status_code != 201:
+        if response.status_code != plan.status:
             raise exceptions.UploadAttemptCreationFailure(
-                attempt,
+                response,
                 "Unable to initiate an upload attempt."
             )
 
-        attempt = attempt.json()
+        attempt = response.json()
+        if plan.video_uri is not None:
+            # `uri` doesn't come back from `/videos/:id/versions` so we need
+            # to manually set it here for uploading.
+            attempt['uri'] = plan.video_uri
+        return attempt
 
-        # `uri` doesn't come back from `/videos/:id/versions` so we need to
-        # manually set it here for uploading.
-        attempt['uri'] = video_uri
+    @staticmethod
+    def _saved_upload(plan):
+        """Get the recorded state of an interrupted upload of the file."""
+        if plan.state_store is None:
+            return None
+        return plan.state_store.get(plan.state_key)
 
-        return self.__perform_tus_upload(filename, attempt, chunk_size=chunk_size)
+    @staticmethod
+    def _resume_attempt(plan, state, offset, filesize):
+        """Rebuild an interrupted upload attempt from its recorded state.
 
-    def __perform_tus_upload(self, filename, attempt, chunk_size=DEFAULT_CHUNK_SIZE):
-        """Take an upload attempt and perform the actual upload via tus.
-        https://tus.io/
+        The attempt is forgotten if the tus server reported no usable
+        `offset` for it.
+
+        Returns:
+            tuple: The attempt and the offset to resume from, or None and 0.
+        """
+        if offset is None or offset > filesize:
+            plan.state_store.delete(plan.state_key)
+            return None, 0
+
+        attempt = {
+            'uri': state['uri'],
+            'upload': {'upload_link': state['upload_link']}
+        }
+        return attempt, offset
+
+    def _tus_options(self, plan, attempt, filesize, offset=0, bandwidth=None,
+                     priority=None, **kwargs):
+        """Build the keyword arguments of the tus uploader of an attempt.
 
         Args:
-            filename (string): name of the video file on vimeo.com
-            attempt (:obj): requests object
-            chunk_size (int): size of each chunk. defaults to DEFAULT_CHUNK_SIZE
+            plan (UploadPlan): The plan of the upload.
+            attempt (dict): The upload attempt.
+            filesize (int): Size of the file, in bytes.
+            offset (int): Offset to resume the upload from.
+            bandwidth: Bytes per second of this upload, or its own limiter.
+            priority (string): Class of the upload in a shared limiter.
+            **kwargs: Options of the call handed to the uploader.
 
         Returns:
-            string: The Vimeo Video URI of your uploaded video.
-
-        Raises:
-            VideoUploadFailure: If unknown errors occured when uploading your
-                video.
+            dict: The keyword arguments, `offset` included.
         """
         upload_link = attempt.get('upload').get('upload_link')
 
-        try:
-            with io.open(filename, 'rb') as fs:
-                tus_client = client.TusClient('https://files.tus.vimeo.com')
-                uploader = tus_client.uploader(
-                    chunk_size=chunk_size,
-                    file_stream=fs,
-                    retries=3,
-                    url=upload_link)
-                uploader.upload()
-        except Exception as e:
-            raise exceptions.VideoUploadFailure(
-                e,
-                'Unexpected error when uploading through tus.'
-            )
+        if self.instrumentation is not None:
+            kwargs['progress'] = self.instrumentation.upload_progress(
+                attempt.get('uri'), kwargs.get('progress'))
+            kwargs['on_retry'] = partial(
+                self.instrumentation.retry, 'patch', upload_link)
+        if plan.state_store is not None:
+            kwargs['progress'] = self.__track_upload_state(
+                plan.state_store, plan.state_key, attempt, filesize,
+                kwargs.get('progress'))
+
+        kwargs['limiter'] = upload_limiter(
+            kwargs.get('limiter'), bandwidth, priority)
+        if self.retry_policy is not None and 'retries' not in kwargs:
+            kwargs.setdefault('retry_policy', self.retry_policy)
+        kwargs.setdefault('retries', 3)
+        kwargs.setdefault('timeout', self.timeout)
+        kwargs['offset'] = offset
+        return kwargs
+
+    @staticmethod
+    def _finish_upload(plan, attempt, uploader):
+        """Forget the state of a completed upload and get its result."""
+        if plan.state_store is not None:
+            plan.state_store.delete(plan.state_key)
 
+        if uploader.checksums:
+            return attempt.get('uri'), uploader.hexdigests()
         return attempt.get('uri')
 
+    @staticmethod
+    def __track_upload_state(state_store, state_key, attempt, filesize,
+                             progress=None):
+        """Build a progress callback saving each confirmed offset."""
+        state = {
+            'uri': attempt.get('uri'),
+            'upload_link': attempt.get('upload').get('upload_link'),
+            'size': filesize,
+            'offset': 0
+        }
+        state_store.set(state_key, state)
+
+        def track(snapshot):
+            state['offset'] = snapshot.offset
+            state_store.set(state_key, state)
+            if progress is not None:
+                progress(snapshot)
+        return track
+
     @staticmethod
     def apply_chunk_size_rules(proposed_chunk_size, file_size):
         """
@@ -175,24 +226,184 @@ class UploadVideoMixin:
         divides_evenly = file_size % proposed_chunk_size == 0
         number_of_chunks_proposed = chunks if divides_evenly else chunks + 1
 
-        if number_of_chunks_proposed > 1024:
-            return (file_size // 1024) + 1
+        if number_of_chunks_proposed > MAX_CHUNKS:
+            return (file_size // MAX_CHUNKS) + 1
         return proposed_chunk_size
 
-    def __get_file_size(self, filename):
-        """Get the size of a specific file.
+
+class UploadVideoMixin(BaseUploadVideoMixin):
+    """Handle uploading a new video to the Vimeo API."""
+
+    def upload(self, filename, **kwargs):
+        """Upload a file.
+
+        This should be used to upload a local file. If you want a form for your
+        site to upload direct to Vimeo, you should look at the `POST
+        /me/videos` endpoint.
+
+        https://developer.vimeo.com/api/endpoints/videos#POST/users/{user_id}/videos
 
         Args:
-            filename (string): Path on disk to file
+            filename (string): Path on disk to file. Bytes, binary file
+                objects, sockets and iterables of bytes are accepted too.
+                Sources that can't be rewound are read once into a temporary
+                file, since the size has to be known before the upload.
+            **kwargs: Supply a `data` dictionary for data to set to your video
+                when uploading. See the API documentation for parameters you
+                can send. This is optional.
+                Supply `max_spool_size` to cap the bytes a source of unknown
+                size may take on disk, and `spool_dir` to choose where they
+                go.
+                Supply a `state_store` (`vimeo.upload_state.UploadStateStore`)
+                to resume the upload of this file if a previous run was
+                interrupted. Defaults to the `upload_state_store` of the
+                client.
+                Supply `on_attempt` to be called with the video URI once the
+                upload attempt exists, before the file is sent.
+                Supply `checksums`, a list of `hashlib` names like
+                `['sha256']`, to get digests of the file computed from the
+                chunks as they are sent, without reading it twice.
+                Supply `bandwidth` to cap the bytes per second of this upload,
+                on top of any shared `limiter`, and `priority`, one of
+                `high`, `normal` or `low`, to pick its class in a shared
+                `vimeo.bandwidth.PriorityBandwidthLimiter`. Uploads are
+                `normal` by default.
+                Any other keyword argument, like `workers`, `max_in_flight`,
+                `progress`, `chunk_policy`, `checksum_algorithm` or `limiter`,
+                is handed to `vimeo.tus.TusUploader`.
 
         Returns:
-            integer: The size of the file.
+            string: The Vimeo Video URI of your uploaded video. With
+                `checksums`, a tuple of the URI and a dictionary of the hex
+                digests by name.
+
+        Raises:
+            UploadAttemptCreationFailure: If we were unable to create an upload
+                attempt for you.
+            VideoUploadFailure: If unknown errors occured when uploading your
+                video.
+            UploadSourceTooLarge: If the source is over `max_spool_size`.
         """
+        on_attempt = kwargs.pop('on_attempt', None)
+        with self.__open_source(filename, kwargs) as source:
+            plan = self._plan_upload(filename, source, kwargs)
+            return self.__upload_source(plan, source, on_attempt, kwargs)
 
+    def replace(self, video_uri, filename, **kwargs):
+        """Replace the source of a single Vimeo video.
+
+        https://developer.vimeo.com/api/endpoints/videos#POST/videos/{video_id}/versions
+
+        Args:
+            video_uri (string): Vimeo Video URI
+            filename (string): Path on disk to file, or any other source
+                accepted by `upload`.
+            **kwargs: Supply a `data` dictionary for data to set to your video
+                when uploading. See the API documentation for parameters you
+                can send. This is optional. The other keyword arguments are
+                the same as for `upload`, except that replacements are `high`
+                priority by default.
+
+        Returns:
+            string: The Vimeo Video URI of your replaced video, along with
+                the digests when `checksums` is given.
+        """
+        on_attempt = kwargs.pop('on_attempt', None)
+        kwargs.setdefault('priority', 'high')
+        with self.__open_source(filename, kwargs) as source:
+            plan = self._plan_upload(
+                filename, source, kwargs, video_uri=video_uri)
+            return self.__upload_source(plan, source, on_attempt, kwargs)
+
+    def __upload_source(self, plan, source, on_attempt, kwargs):
+        """Create or resume the upload attempt of a source, then send it."""
+        attempt, offset = self.__load_upload_state(plan, source.size)
+        if attempt is None:
+            attempt = self._read_attempt(plan, self.post(
+                plan.endpoint, data=plan.data, params={'fields': plan.fields}))
+
+        if on_attempt is not None:
+            on_attempt(attempt.get('uri'))
+        return self.__perform_tus_upload(
+            source.stream, attempt, source.size, plan, offset=offset,
+            **kwargs)
+
+    def __perform_tus_upload(self, stream, attempt, filesize, plan, offset=0,
+                             **kwargs):
+        """Take an upload attempt and perform the actual upload via tus.
+        https://tus.io/
+
+        Args:
+            stream (file): binary stream of the video, at offset 0
+            attempt (:obj): requests object
+            filesize (int): size of the file, in bytes
+            plan (UploadPlan): plan of the upload
+            offset (int): offset to resume the upload from
+            **kwargs: see `BaseUploadVideoMixin._tus_options`
+
+        Returns:
+            string: The Vimeo Video URI of your uploaded video, along with
+                the digests when `checksums` is given.
+
+        Raises:
+            VideoUploadFailure: If unknown errors occured when uploading your
+                video.
+        """
+        from .tus import TusUploader
+
+        options = self._tus_options(plan, attempt, filesize, offset, **kwargs)
         try:
-            return os.path.getsize(filename)
-        except TypeError:
-            return len(filename.read())
+            uploader = TusUploader(
+                self.session,
+                stream,
+                attempt.get('upload').get('upload_link'),
+                filesize,
+                plan.chunk_size,
+                **options)
+            uploader.upload()
+        except exceptions.VideoUploadFailure:
+            raise
+        except Exception as e:
+            raise exceptions.VideoUploadFailure(
+                e,
+                'Unexpected error when uploading through tus.'
+            )
+
+        return self._finish_upload(plan, attempt, uploader)
+
+    def __load_upload_state(self, plan, filesize):
+        """Find an interrupted upload attempt for the file.
+
+        The upload link is checked with the tus server, and the attempt is
+        forgotten if it can no longer be continued.
+
+        Returns:
+            tuple: The attempt and the offset to resume from, or None and 0.
+        """
+        state = self._saved_upload(plan)
+        if state is None:
+            return None, 0
+
+        from .tus import TusUploader
+
+        try:
+            offset = TusUploader(
+                self.session, None, state['upload_link'], filesize, 1,
+                timeout=self.timeout
+            ).get_offset()
+        except Exception:
+            offset = None
+        return self._resume_attempt(plan, state, offset, filesize)
+
+    @staticmethod
+    def __open_source(filename, kwargs):
+        """Open the source of an upload, see `vimeo.sources`."""
+        from .sources import open_upload_source
+
+        return open_upload_source(
+            filename,
+            max_spool_size=kwargs.pop('max_spool_size', None),
+            spool_dir=kwargs.pop('spool_dir', None))
 
 
 class UploadPictureMixin:
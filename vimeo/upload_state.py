@@ -0,0 +1,135 @@
+#! /usr/bin/env python
+# encoding: utf-8
+"""Persistent state of in-progress uploads, so they can be resumed."""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+
+
+def file_key(filename, content_hash=False):
+    """Get the key identifying a file across runs.
+
+    Args:
+        filename (string): Path on disk to file
+        content_hash (bool): Key on a SHA-256 of the contents instead of the
+            path and modification time. This reads the whole file.
+
+    Returns:
+        string: The key.
+    """
+    stat = os.stat(filename)
+    if not content_hash:
+        return '%s:%d:%d' % (
+            os.path.abspath(filename), stat.st_size, stat.st_mtime_ns)
+
+    digest = hashlib.sha256()
+    with open(filename, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return 'sha256:%s:%d' % (digest.hexdigest(), stat.st_size)
+
+
+class UploadStateStore:
+    """Interface for stores keeping the state of in-progress uploads.
+
+    A state is a dictionary holding the `upload_link`, the video `uri`, the
+    `size` of the file and the last `offset` confirmed by the tus server.
+    """
+
+    def get(self, key):
+        """Get the state saved under `key`, or None."""
+        raise NotImplementedError
+
+    def set(self, key, state):
+        """Save `state` under `key`."""
+        raise NotImplementedError
+
+    def delete(self, key):
+        """Forget the state saved under `key`, if any."""
+        raise NotImplementedError
+
+
+class JSONFileUploadStateStore(UploadStateStore):
+    """Keep upload states in a single JSON file.
+
+    Writes replace the file atomically. Use `SQLiteUploadStateStore` when
+    several processes share the same store.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            return self.__load().get(key)
+
+    def set(self, key, state):
+        with self._lock:
+            states = self.__load()
+            states[key] = state
+            self.__dump(states)
+
+    def delete(self, key):
+        with self._lock:
+            states = self.__load()
+            if states.pop(key, None) is not None:
+                self.__dump(states)
+
+    def __load(self):
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    def __dump(self, states):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        with os.fdopen(fd, 'w') as f:
+            json.dump(states, f)
+        os.replace(tmp, self.path)
+
+
+class SQLiteUploadStateStore(UploadStateStore):
+    """Keep upload states in a SQLite database."""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        import sqlite3
+
+        self._connection = sqlite3.connect(
+            path, timeout=30, check_same_thread=False)
+        with self._connection:
+            self._connection.execute(
+                'CREATE TABLE IF NOT EXISTS upload_state ('
+                'key TEXT PRIMARY KEY, state TEXT NOT NULL, '
+                'updated_at REAL NOT NULL)'
+            )
+
+    def get(self, key):
+        with self._lock:
+            row = self._connection.execute(
+                'SELECT state FROM upload_state WHERE key = ?', (key,)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def set(self, key, state):
+        with self._lock, self._connection:
+            self._connection.execute(
+                'INSERT OR REPLACE INTO upload_state VALUES (?, ?, ?)',
+                (key, json.dumps(state), time.time())
+            )
+
+    def delete(self, key):
+        with self._lock, self._connection:
+            self._connection.execute(
+                'DELETE FROM upload_state WHERE key = ?', (key,))
+
+    def close(self):
+        self._connection.close()
@@ -0,0 +1,282 @@
+#! /usr/bin/env python
+# encoding: utf-8
+"""Wait for many uploaded videos to finish transcoding.
+
+Pending videos are polled together, a batch of them per request to the
+`/videos?uris=` collection, and each video backs off on its own while it
+keeps transcoding.
+"""
+
+import asyncio
+import collections
+import heapq
+import itertools
+import threading
+import time
+from concurrent.futures import Future
+from .exceptions import APIRateLimitExceededFailure
+from .ratelimit import parse_reset
+
+
+class _Watched:
+    """A video being watched and when to check it next."""
+
+    def __init__(self, uri, future, interval):
+        self.uri = uri
+        self.future = future
+        self.interval = interval
+        self.misses = 0
+
+
+class TranscodeWatcher:
+    """Track videos until they are available or their transcode failed.
+
+    Each watched video gets a `concurrent.futures.Future` resolved with the
+    video, holding `uri`, `status` and `transcode.status`, once it is
+    `available` or failed. Call `poll` from your own loop, `run` until every
+    video is done, `start` a background thread, or iterate over the finished
+    videos with `async for video in watcher`.
+
+    The watcher goes through the client, so its requests are paced by the
+    client's rate limit governor if it has one. It also pauses on its own
+    when fewer than `min_remaining` requests are left in the window.
+    """
+
+    ENDPOINT = '/videos'
+    FIELDS = 'uri,status,transcode.status'
+    DONE_STATUSES = {'available', 'uploading_error', 'transcoding_error',
+                     'quota_exceeded', 'total_cap_exceeded'}
+    FAILED_TRANSCODES = {'error'}
+
+    def __init__(self, client, interval=5.0, max_interval=60.0, backoff=1.5,
+                 batch_size=50, min_remaining=10, max_misses=3):
+        """Prep the watcher.
+
+        Args:
+            client (VimeoClient): Client the videos are polled with.
+            interval (float): Seconds before a new video is first checked.
+            max_interval (float): Longest wait between two checks of a video.
+            backoff (float): Factor the wait of a video grows by each time
+                it is still transcoding.
+            batch_size (int): Most videos polled per request.
+            min_remaining (int): Requests left in the rate limit window under
+                which polling waits for the window to reset.
+            max_misses (int): Number of polls a video may be missing from the
+                results before it is resolved with a `not_found` status.
+        """
+        self.client = client
+        self.interval = interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.batch_size = batch_size
+        self.min_remaining = min_remaining
+        self.max_misses = max_misses
+        self._queue = []
+        self._watched = {}
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._paused_until = 0.0
+        self._finished = []
+        self._thread = None
+        self._stopping = False
+
+    def watch(self, uri, callback=None):
+        """Start watching a video.
+
+        Args:
+            uri (string): Vimeo Video URI, as returned by `upload`.
+            callback (callable): Called with the video once it is done.
+
+        Returns:
+            concurrent.futures.Future: Resolved with the video once done.
+        """
+        with self._lock:
+            watched = self._watched.get(uri)
+            if watched is None:
+                watched = _Watched(uri, Future(), self.interval)
+                self._watched[uri] = watched
+                self.__schedule(watched, time.monotonic() + self.interval)
+        if callback is not None:
+            watched.future.add_done_callback(
+                lambda future: callback(future.result()))
+        self._wakeup.set()
+        return watched.future
+
+    @property
+    def pending(self):
+        """Get the number of videos still being watched."""
+        with self._lock:
+            return len(self._watched)
+
+    def next_due(self):
+        """Get the seconds until the next video is due, or None."""
+        with self._lock:
+            if not self._queue:
+                return None
+            due = max(self._queue[0][0], self._paused_until)
+        return max(0.0, due - time.monotonic())
+
+    def poll(self):
+        """Check the videos that are due, a batch per request.
+
+        Returns:
+            list: The videos that finished during this round.
+        """
+        finished = []
+        while True:
+            batch = self.__take_due()
+            if not batch:
+                return finished
+            finished.extend(self.__check(batch))
+
+    def run(self, timeout=None):
+        """Poll until every watched video is done, or `timeout` seconds."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.pending:
+            self.poll()
+            wait = self.next_due()
+            if deadline is not None:
+                if time.monotonic() >= deadline:
+                    return
+                wait = min(wait or 0.0, deadline - time.monotonic())
+            if wait:
+                time.sleep(wait)
+
+    def start(self):
+        """Poll from a background thread until `stop` is called."""
+        self._stopping = False
+        self._thread = threading.Thread(target=self.__loop, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the background thread."""
+        self._stopping = True
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __aiter__(self):
+        return _FinishedVideos(self)
+
+    def __loop(self):
+        while not self._stopping:
+            self.poll()
+            self._wakeup.clear()
+            self._wakeup.wait(self.next_due())
+
+    def __schedule(self, watched, due):
+        heapq.heappush(self._queue, (due, next(self._counter), watched))
+
+    def __take_due(self):
+        """Pop the videos that are due, up to a batch."""
+        now = time.monotonic()
+        batch = []
+        with self._lock:
+            if now < self._paused_until:
+                return batch
+            while self._queue and self._queue[0][0] <= now \
+                    and len(batch) < self.batch_size:
+                batch.append(heapq.heappop(self._queue)[2])
+        return batch
+
+    def __check(self, batch):
+        """Poll a batch of videos and resolve the ones that are done."""
+        try:
+            response = self.client.get(self.ENDPOINT, params={
+                'uris': ','.join(watched.uri for watched in batch),
+                'fields': self.FIELDS,
+                'per_page': len(batch),
+            })
+        except APIRateLimitExceededFailure as e:
+            self.__pause(e.response, batch)
+            return []
+        except Exception:
+            self.__reschedule(batch)
+            return []
+
+        if response.status_code == 429:
+            self.__pause(response, batch)
+            return []
+        if response.status_code != 200:
+            self.__reschedule(batch)
+            return []
+
+        self.__pause_if_low(response)
+        videos = {video.get('uri'): video
+                  for video in response.json().get('data', [])}
+        finished = []
+        pending = []
+        for watched in batch:
+            video = videos.get(watched.uri)
+            if video is None:
+                watched.misses += 1
+                if watched.misses < self.max_misses:
+                    pending.append(watched)
+                    continue
+                video = {'uri': watched.uri, 'status': 'not_found'}
+            elif not self.is_done(video):
+                pending.append(watched)
+                continue
+            with self._lock:
+                self._watched.pop(watched.uri, None)
+            watched.future.set_result(video)
+            finished.append(video)
+
+        self.__reschedule(pending)
+        return finished
+
+    def is_done(self, video):
+        """Check if a video is available or will never be."""
+        transcode = video.get('transcode') or {}
+        return video.get('status') in self.DONE_STATUSES \
+            or transcode.get('status') in self.FAILED_TRANSCODES
+
+    def __reschedule(self, batch):
+        now = time.monotonic()
+        with self._lock:
+            for watched in batch:
+                watched.interval = min(
+                    self.max_interval, watched.interval * self.backoff)
+                self.__schedule(watched, now + watched.interval)
+
+    def __pause(self, response, batch):
+        """Hold polling until the rate limit window resets."""
+        reset = None
+        if response is not None and hasattr(response, 'headers'):
+            reset = parse_reset(response.headers.get('X-RateLimit-Reset'))
+        wait = self.max_interval if reset is None else \
+            min(self.max_interval, max(0.0, reset - time.time()))
+        with self._lock:
+            self._paused_until = time.monotonic() + wait
+            for watched in batch:
+                self.__schedule(watched, time.monotonic())
+
+    def __pause_if_low(self, response):
+        remaining = response.headers.get('X-RateLimit-Remaining')
+        if remaining is not None and int(remaining) < self.min_remaining:
+            self.__pause(response, [])
+
+
+class _FinishedVideos:
+    """Async iterator over the videos of a watcher as they finish."""
+
+    def __init__(self, watcher):
+        self.watcher = watcher
+        self.finished = collections.deque()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        loop = asyncio.get_event_loop()
+        while not self.finished:
+            if not self.watcher.pending:
+                raise StopAsyncIteration
+            wait = self.watcher.next_due()
+            if wait:
+                await asyncio.sleep(wait)
+            self.finished.extend(
+                await loop.run_in_executor(None, self.watcher.poll))
+        return self.finished.popleft()
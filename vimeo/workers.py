@@ -0,0 +1,342 @@
+#! /usr/bin/env python
+# encoding: utf-8
+"""Spread uploads over several processes.
+
+Jobs are queued in an `UploadJournal`, a SQLite database in WAL mode. An
+`UploadWorkerPool` starts worker processes that each build their own
+client and connection pool, and claim jobs from the journal until none is
+left. The workers share the rate limit budget of the token through the
+journal and, optionally, a bandwidth cap for the whole host.
+"""
+
+import collections
+import json
+import multiprocessing
+import os
+import sqlite3
+import threading
+import time
+import requests
+from . import exceptions
+from .bandwidth import SharedBandwidthLimiter
+from .ratelimit import SQLiteRateLimitGovernor
+from .upload_state import SQLiteUploadStateStore
+
+
+class JournalJob(collections.namedtuple(
+        'JournalJob', ['id', 'path', 'video_uri', 'data', 'state', 'attempts',
+                       'uri', 'error'])):
+    """A job of the journal.
+
+    `video_uri` is set for jobs replacing the source of a video. `state` is
+    one of `pending`, `running`, `done` and `failed`.
+    """
+
+    __slots__ = ()
+
+    @property
+    def ok(self):
+        return self.state == 'done'
+
+
+class UploadJournal:
+    """Queue of uploads shared by the processes of a worker pool.
+
+    Workers refresh `updated_at` on the jobs they run while they are alive,
+    so the jobs of a worker that went away can be told apart from the ones
+    another pool is still running.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(
+            path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._connection.execute('PRAGMA journal_mode=WAL')
+        self._connection.execute('PRAGMA synchronous=NORMAL')
+        self._connection.execute(
+            'CREATE TABLE IF NOT EXISTS upload_job ('
+            'id INTEGER PRIMARY KEY, path TEXT NOT NULL, video_uri TEXT, '
+            'data TEXT NOT NULL, state TEXT NOT NULL, '
+            'attempts INTEGER NOT NULL, uri TEXT, error TEXT, worker INTEGER, '
+            'updated_at REAL NOT NULL, not_before REAL NOT NULL DEFAULT 0)'
+        )
+
+    def add(self, path, data=None, video_uri=None):
+        """Queue a file.
+
+        Args:
+            path (string): Path on disk to the file.
+            data (dict): Data to set on the video.
+            video_uri (string): Replace the source of this video instead of
+                uploading a new one.
+
+        Returns:
+            int: The id of the job.
+        """
+        with self._lock:
+            return self._connection.execute(
+                'INSERT INTO upload_job (path, video_uri, data, state, '
+                'attempts, updated_at) VALUES (?, ?, ?, ?, 0, ?)',
+                (path, video_uri, json.dumps(data or {}), 'pending',
+                 time.time())
+            ).lastrowid
+
+    def claim(self, worker):
+        """Take the next pending job that is due for `worker`, or None."""
+        with self._lock:
+            self._connection.execute('BEGIN IMMEDIATE')
+            try:
+                row = self._connection.execute(
+                    'SELECT id FROM upload_job WHERE state = ? '
+                    'AND not_before <= ? ORDER BY id LIMIT 1',
+                    ('pending', time.time())
+                ).fetchone()
+                if row is not None:
+                    self._connection.execute(
+                        'UPDATE upload_job SET state = ?, '
+                        'attempts = attempts + 1, worker = ?, updated_at = ? '
+                        'WHERE id = ?',
+                        ('running', worker, time.time(), row[0])
+                    )
+            except BaseException:
+                self._connection.execute('ROLLBACK')
+                raise
+            self._connection.execute('COMMIT')
+        return None if row is None else self.get(row[0])
+
+    def complete(self, job_id, uri):
+        """Record that a job went through."""
+        self.__finish(job_id, 'done', uri=uri)
+
+    def fail(self, job_id, error, retry=False, delay=0):
+        """Record that an attempt of a job failed, queueing it again if
+        `retry`, to be claimed no sooner than `delay` seconds from now."""
+        self.__finish(job_id, 'pending' if retry else 'failed',
+                      error=repr(error), not_before=time.time() + delay)
+
+    def next_due(self):
+        """Get the seconds until a pending job is due, or None if there is
+        no pending job."""
+        with self._lock:
+            due, = self._connection.execute(
+                'SELECT MIN(not_before) FROM upload_job WHERE state = ?',
+                ('pending',)
+            ).fetchone()
+        return None if due is None else max(0.0, due - time.time())
+
+    def heartbeat(self, worker):
+        """Record that `worker` is still running its jobs."""
+        with self._lock:
+            self._connection.execute(
+                'UPDATE upload_job SET updated_at = ? '
+                'WHERE state = ? AND worker = ?',
+                (time.time(), 'running', worker))
+
+    def requeue_running(self, stale_after=0):
+        """Queue again the jobs left running by workers that went away.
+
+        Args:
+            stale_after (float): Only requeue the jobs whose worker has not
+                given news for this many seconds.
+        """
+        with self._lock:
+            self._connection.execute(
+                'UPDATE upload_job SET state = ?, worker = NULL '
+                'WHERE state = ? AND updated_at <= ?',
+                ('pending', 'running', time.time() - stale_after))
+
+    def get(self, job_id):
+        """Get a job by id."""
+        with self._lock:
+            row = self._connection.execute(
+                'SELECT id, path, video_uri, data, state, attempts, uri, '
+                'error FROM upload_job WHERE id = ?', (job_id,)
+            ).fetchone()
+        return None if row is None else _job(row)
+
+    def jobs(self):
+        """Get every job, in the order they were added."""
+        with self._lock:
+            rows = self._connection.execute(
+                'SELECT id, path, video_uri, data, state, attempts, uri, '
+                'error FROM upload_job ORDER BY id'
+            ).fetchall()
+        return [_job(row) for row in rows]
+
+    def counts(self):
+        """Get the number of jobs in each state."""
+        with self._lock:
+            return dict(self._connection.execute(
+                'SELECT state, COUNT(*) FROM upload_job GROUP BY state'
+            ).fetchall())
+
+    def close(self):
+        self._connection.close()
+
+    def __finish(self, job_id, state, uri=None, error=None, not_before=0):
+        with self._lock:
+            self._connection.execute(
+                'UPDATE upload_job SET state = ?, uri = ?, error = ?, '
+                'worker = NULL, updated_at = ?, not_before = ? WHERE id = ?',
+                (state, uri, error, time.time(), not_before, job_id)
+            )
+
+
+def _job(row):
+    return JournalJob(row[0], row[1], row[2], json.loads(row[3]), *row[4:])
+
+
+class UploadWorkerPool:
+    """Run the jobs of an `UploadJournal` over several processes.
+
+    Each process builds a `VimeoClient` from `client_options` and runs
+    `threads` uploads at once. Uploads resume from the journal database
+    when a job is retried, and every process paces itself on the shared
+    rate limit budget of the token.
+    """
+
+    # Seconds before the first retry of a job, doubling on each retry.
+    RETRY_DELAY = 5.0
+    # Seconds without a heartbeat after which a running job is taken over.
+    LEASE = 60.0
+
+    def __init__(self, journal_path, client_options, processes=None,
+                 threads=2, retries=2, bandwidth=None, upload_options=None,
+                 client_class=None, retry_delay=RETRY_DELAY, lease=LEASE):
+        """Prep the pool.
+
+        Args:
+            journal_path (string): Path of the `UploadJournal` database.
+            client_options (dict): Keyword arguments of the `VimeoClient` of
+                each process, like `token`, `key` and `secret`. They must be
+                picklable.
+            processes (int): Number of worker processes. Defaults to the
+                number of CPUs.
+            threads (int): Number of uploads run at once by each process.
+            retries (int): Number of times a failed job is attempted again.
+            bandwidth (int): Bytes per second shared by every upload of the
+                pool. Unlimited by default. Change it while the pool runs
+                with `pool.limiter.set_rate`.
+            upload_options (dict): Keyword arguments handed to `upload` and
+                `replace`, like `workers` or `chunk_policy`.
+            client_class (type): Class of the clients. Defaults to
+                `VimeoClient`.
+            retry_delay (float): Seconds before a failed job is attempted
+                again, doubling on each attempt.
+            lease (float): Seconds without news from the worker of a running
+                job before another pool takes it over.
+        """
+        self.journal_path = journal_path
+        self.client_options = dict(client_options)
+        self.processes = processes or os.cpu_count() or 1
+        self.threads = threads
+        self.retries = retries
+        self.limiter = SharedBandwidthLimiter(bandwidth) if bandwidth else None
+        self.upload_options = dict(upload_options or {})
+        self.client_class = client_class
+        self.retry_delay = retry_delay
+        self.lease = lease
+
+    def run(self):
+        """Run the jobs until none is pending.
+
+        Returns:
+            list: Every `JournalJob` of the journal, in the order they were
+                added.
+        """
+        journal = UploadJournal(self.journal_path)
+        try:
+            journal.requeue_running(self.lease)
+            workers = [
+                multiprocessing.Process(
+                    target=_work,
+                    args=(self.journal_path, self.client_class,
+                          self.client_options, self.threads, self.retries,
+                          self.limiter, self.upload_options,
+                          self.retry_delay, self.lease),
+                    daemon=True)
+                for _ in range(self.processes)
+            ]
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join()
+            return journal.jobs()
+        finally:
+            journal.close()
+
+
+def _work(journal_path, client_class, client_options, threads, retries,
+          limiter, upload_options, retry_delay=UploadWorkerPool.RETRY_DELAY,
+          lease=UploadWorkerPool.LEASE):
+    """Entry point of a worker process."""
+    if client_class is None:
+        from .client import VimeoClient as client_class
+
+    options = dict(client_options)
+    options.setdefault(
+        'rate_limit_governor', SQLiteRateLimitGovernor(journal_path))
+    options.setdefault(
+        'upload_state_store', SQLiteUploadStateStore(journal_path))
+    client = client_class(**options)
+    journal = UploadJournal(journal_path)
+    upload_options = dict(upload_options)
+    if limiter is not None:
+        upload_options['limiter'] = limiter
+
+    def retry(job, error):
+        journal.fail(job.id, error, retry=job.attempts <= retries,
+                     delay=retry_delay * 2 ** (job.attempts - 1))
+
+    def run_jobs():
+        while True:
+            job = journal.claim(os.getpid())
+            if job is None:
+                # Wait for the jobs backing off after a failure.
+                wait = journal.next_due()
+                if wait is None:
+                    return
+                time.sleep(min(wait, 1.0))
+                continue
+            try:
+                if job.video_uri is None:
+                    uri = client.upload(
+                        job.path, data=dict(job.data), **upload_options)
+                else:
+                    uri = client.replace(
+                        job.video_uri, job.path, data=dict(job.data),
+                        **upload_options)
+            except (exceptions.BaseVimeoException,
+                    requests.exceptions.RequestException) as e:
+                retry(job, e)
+            except FileNotFoundError as e:
+                journal.fail(job.id, e)
+            except OSError as e:
+                retry(job, e)
+            except Exception as e:
+                journal.fail(job.id, e)
+            else:
+                # With `checksums`, the digests come along with the URI.
+                journal.complete(
+                    job.id, uri[0] if isinstance(uri, tuple) else uri)
+
+    stopped = threading.Event()
+
+    def beat():
+        while not stopped.wait(lease / 4):
+            journal.heartbeat(os.getpid())
+
+    heart = threading.Thread(target=beat, daemon=True)
+    heart.start()
+    try:
+        runners = [threading.Thread(target=run_jobs) for _ in range(threads)]
+        for runner in runners:
+            runner.start()
+        for runner in runners:
+            runner.join()
+    finally:
+        stopped.set()
+        heart.join()
+        journal.close()
+        client.close()